@@ -0,0 +1,147 @@
+"""
+URL 정규화 - 크롤링 큐, 저널, 재시도 큐, DB가 같은 규칙으로 리소스를 식별
+- 정규 URL: https, 소문자 호스트, 로케일(/ko-kr/, /en-us/ 등) 제거, 끝 슬래시/fragment 제거,
+  쓰지 않는 쿼리 파라미터(utm_* 등) 제거 → resources_enhanced.json의 url 형식
+  (대소문자는 상세 페이지의 섹션/slug만 통일 - 이미지, 다운로드 등 다른 경로와 다른 호스트는
+  대소문자를 구분할 수 있어 그대로 유지)
+- 요청 URL: 정규 URL에 /en-us/를 붙인 주소 (실제로 가져오는 페이지)
+- 리소스 키: (section, slug) - 상세 페이지가 아니면 None
+- 같은 리소스를 가리키던 다른 URL은 버리지 않고 리소스의 url_aliases에 남김
+"""
+import re
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+
+import config
+
+FETCH_LOCALE = 'en-us'
+SITE_HOST = urlparse(config.BASE_URL).hostname
+
+# 남기는 쿼리 파라미터 (목록 페이지 번호) - 나머지는 같은 페이지의 변형
+KEEP_PARAMS = ('page',)
+
+SECTIONS = ('lessons', 'worlds', 'challenges')
+LOCALE_RE = re.compile(r'^/[a-z]{2}-[a-z]{2}(?=/|$)', re.IGNORECASE)
+RESOURCE_PATH_RE = re.compile(r'^/(lessons|worlds|challenges)/([^/?#]+)$')
+# 로케일을 뗀 뒤의 상세 페이지 경로 (대소문자/끝 슬래시 무관)
+DETAIL_PATH_RE = re.compile(r'^/(lessons|worlds|challenges)/([^/?#]+)/?$', re.IGNORECASE)
+# 이미 정규형인 상세 페이지 URL (대량 적재 시 urlparse를 건너뛰는 빠른 경로)
+CANONICAL_RESOURCE_RE = re.compile(
+    r'^' + re.escape(f"https://{SITE_HOST}") + r'/(lessons|worlds|challenges)/([a-z0-9][a-z0-9._~%-]*)$'
+)
+
+
+def canonical_url(url, base=config.BASE_URL):
+    """정규 URL (상대 경로는 base 기준, http(s)가 아니면 그대로)"""
+    if url and CANONICAL_RESOURCE_RE.match(url):
+        return url
+    parsed = urlparse(urljoin(base, (url or '').strip()))
+    if parsed.scheme not in ('http', 'https'):
+        return url
+    host = (parsed.hostname or '').lower()
+    if host == 'www.' + SITE_HOST:
+        host = SITE_HOST
+    netloc = host if parsed.port in (None, 80, 443) else f"{host}:{parsed.port}"
+
+    path = parsed.path or '/'
+    scheme = parsed.scheme
+    if host == SITE_HOST:
+        scheme = 'https'
+        path = LOCALE_RE.sub('', path) or '/'
+        detail = DETAIL_PATH_RE.match(path)
+        if detail:
+            path = f"/{detail.group(1).lower()}/{detail.group(2).lower()}"
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parsed.query) if k in KEEP_PARAMS))
+    return urlunparse((scheme, netloc, path, '', query, ''))
+
+
+def fetch_url(url):
+    """실제로 요청하는 URL (사이트 페이지는 /en-us/ 로케일)"""
+    canonical = canonical_url(url)
+    parsed = urlparse(canonical)
+    if parsed.hostname != SITE_HOST:
+        return canonical
+    path = '' if parsed.path == '/' else parsed.path
+    return urlunparse(parsed._replace(path=f"/{FETCH_LOCALE}{path}"))
+
+
+def resource_key(url, base=config.BASE_URL):
+    """리소스 상세 페이지 URL이면 (section, slug), 아니면 None"""
+    match = CANONICAL_RESOURCE_RE.match(url or '')
+    if match:
+        return match.group(1), match.group(2)
+    parsed = urlparse(canonical_url(url, base))
+    if parsed.hostname != SITE_HOST:
+        return None
+    match = RESOURCE_PATH_RE.match(parsed.path)
+    return (match.group(1), match.group(2)) if match else None
+
+
+def resource_url(section, slug):
+    """(section, slug) → 정규 URL"""
+    return f"{config.BASE_URL}/{section}/{slug}"
+
+
+def resource_id(url):
+    """URL → 리소스 id (상세 페이지는 slug, 그 외는 마지막 경로 조각)"""
+    key = resource_key(url)
+    if key:
+        return key[1]
+    return urlparse(canonical_url(url)).path.rstrip('/').rsplit('/', 1)[-1]
+
+
+def add_alias(resource, url):
+    """리소스가 다른 URL로도 불렸다는 기록 (정규 URL 자신은 기록하지 않음)
+
+    Returns:
+        새로 추가했으면 True
+    """
+    if not url or url == resource.get('url'):
+        return False
+    aliases = resource.setdefault('url_aliases', [])
+    if url in aliases:
+        return False
+    aliases.append(url)
+    return True
+
+
+def canonicalize_resources(resources):
+    """리소스 url을 정규 URL로 바꾸고 이전 URL은 별칭으로 보관
+
+    Returns:
+        바뀐 리소스 수
+    """
+    changed = 0
+    for r in resources:
+        url = r.get('url')
+        if not url:
+            continue
+        canonical = canonical_url(url)
+        if canonical != url:
+            r['url'] = canonical
+            add_alias(r, url)
+            changed += 1
+    return changed
+
+
+def dedupe(resources, indices):
+    """같은 정규 URL을 가리키는 작업은 처음 것만 남김 (나머지 URL은 남긴 리소스의 별칭으로)
+
+    Returns:
+        (남긴 인덱스 리스트 - 순서 유지, 제외한 개수)
+    """
+    seen = {}
+    kept = []
+    for i in indices:
+        url = resources[i].get('url', '')
+        key = canonical_url(url)
+        if key in seen:
+            add_alias(resources[seen[key]], url)
+            for alias in resources[i].get('url_aliases', []):
+                add_alias(resources[seen[key]], alias)
+            continue
+        seen[key] = i
+        kept.append(i)
+    return kept, len(indices) - len(kept)
@@ -8,6 +8,7 @@ import sys
 import io
 import os
 from playwright.sync_api import sync_playwright
+from readiness import wait_until_ready
 
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
@@ -23,7 +24,7 @@ def extract_data(page, url, retries=2):
     for attempt in range(retries):
         try:
             page.goto(url, timeout=20000, wait_until='domcontentloaded')
-            time.sleep(1)  # DOM 로딩 대기
+            ready_sec, _ = wait_until_ready(page)  # DOM 신호 대기
             break
         except Exception as e:
             if attempt < retries - 1:
@@ -79,7 +80,7 @@ def extract_data(page, url, retries=2):
         }""")
 
         if data and len(data) > 0:
-            return {'success': True, 'data': data, 'url': url}
+            return {'success': True, 'data': data, 'url': url, 'ready_sec': ready_sec}
         else:
             return {'success': False, 'error': 'No data found', 'url': url}
 
@@ -135,6 +136,7 @@ def main():
 
             if result['success']:
                 data = result['data']
+                print(f"  ⏱️  Ready in {result['ready_sec']:.2f}s")
 
                 # 모든 추출된 정보 저장
                 if data.get('title'):
@@ -24,12 +24,36 @@ RESOURCE_URLS = {
 # Crawler settings
 MAX_CONCURRENT_REQUESTS = 3
 REQUEST_DELAY = 1.0  # seconds between requests
+REQUESTS_PER_SECOND = 1.0 / REQUEST_DELAY  # global limit shared by all workers
 TIMEOUT = 30000  # milliseconds
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"  # HTTP 페처와 브라우저 컨텍스트가 같은 값 사용
+
+# Browser request interception - subresources the extractor never reads
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+BLOCKED_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "clarity.ms",
+    "bat.bing.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "js.monitor.azure.com",
+    "wcpstatic.microsoft.com",
+    "mem.gfx.ms",
+    "youtube.com",
+    "ytimg.com",
+    "vimeo.com",
+]
 
 # Database settings
 DB_SCHEMA_PATH = BASE_DIR / "schema.sql"
 
+# Full-text search tokenizer (search_index.py)
+# 'trigram': 부분 문자열 매칭 - 띄어쓰기/조사가 붙는 한국어 검색에 적합
+# 'unicode61': 단어 단위 + 접두사 매칭 (색인이 더 작음)
+SEARCH_TOKENIZER = "trigram"
+
 # Logging
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -0,0 +1 @@
+"""pytest 설정 - 저장소 루트의 모듈(database.py 등)을 tests/에서 import할 수 있도록 루트에 둠"""
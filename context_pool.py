@@ -0,0 +1,239 @@
+"""
+브라우저 컨텍스트 풀 - 측정값 기반으로 컨텍스트를 교체
+- 워커는 acquire()로 컨텍스트(페이지 1개)를 빌리고 release()로 결과를 보고
+- 교체 기준: 렌더러 JS 힙 메모리, 처리한 페이지 수, 최근 에러율, 최근 이동(goto) 지연
+- 교체할 컨텍스트는 계속 쓰면서 백그라운드에서 새 컨텍스트를 미리 띄우고(warm-up),
+  준비되면 그때 바꿔 끼우므로 교체 때문에 파이프라인이 멈추지 않음
+"""
+import asyncio
+import statistics
+from collections import deque
+from urllib.parse import urlparse
+
+import config
+
+MAX_PAGES = 200               # 컨텍스트당 최대 페이지 수
+MEMORY_LIMIT_MB = 300         # 렌더러 JS 힙 상한
+MEMORY_CHECK_EVERY = 10       # N페이지마다 메모리 측정 (CDP)
+HEALTH_WINDOW = 20            # 에러율/지연 계산에 쓰는 최근 이동 수
+MIN_SAMPLES = 5
+MAX_ERROR_RATE = 0.5
+LATENCY_FACTOR = 2.5          # 풀 전체 중앙값 대비 배수
+MIN_SLOW_LATENCY = 5.0        # 이보다 빠르면 느리다고 보지 않음 (초)
+
+
+class PageTraffic:
+    """페이지별 요청/바이트/차단 집계 (컨텍스트의 응답·라우트 이벤트로 갱신)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.blocked = 0
+
+    def reset(self):
+        self.requests = 0
+        self.bytes = 0
+        self.blocked = 0
+
+    def on_response(self, response):
+        self.requests += 1
+        length = response.headers.get('content-length', '')
+        if length.isdigit():
+            self.bytes += int(length)
+
+
+def is_blocked_request(request):
+    """추출에 필요 없는 하위 리소스인지 (리소스 타입 또는 도메인)"""
+    if request.resource_type in config.BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlparse(request.url).hostname or ''
+    return any(host == d or host.endswith('.' + d) for d in config.BLOCKED_DOMAINS)
+
+
+async def create_context(browser, traffic=None, block=True):
+    """새 브라우저 컨텍스트 생성 (무거운 하위 리소스 차단 + 트래픽 집계)"""
+    ctx = await browser.new_context(user_agent=config.USER_AGENT)
+
+    if block:
+        async def route_handler(route):
+            if is_blocked_request(route.request):
+                if traffic is not None:
+                    traffic.blocked += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await ctx.route('**/*', route_handler)
+
+    if traffic is not None:
+        ctx.on('response', traffic.on_response)
+
+    return ctx, await ctx.new_page()
+
+
+class PooledContext:
+    """풀이 관리하는 컨텍스트 하나와 건강 지표"""
+
+    def __init__(self, cid, context, page, traffic):
+        self.cid = cid
+        self.context = context
+        self.page = page
+        self.traffic = traffic
+        self.pages = 0
+        self.outcomes = deque(maxlen=HEALTH_WINDOW)
+        self.latencies = deque(maxlen=HEALTH_WINDOW)
+        self.memory_mb = None
+        self.replacing = False
+        self.retired = False
+
+    def error_rate(self):
+        if len(self.outcomes) < MIN_SAMPLES:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def median_latency(self):
+        return statistics.median(self.latencies) if len(self.latencies) >= MIN_SAMPLES else None
+
+    async def measure_memory(self):
+        """렌더러 JS 힙 사용량 (MB, CDP Performance.getMetrics - 실패하면 None)"""
+        try:
+            cdp = await self.context.new_cdp_session(self.page)
+            try:
+                await cdp.send('Performance.enable')
+                metrics = await cdp.send('Performance.getMetrics')
+            finally:
+                await cdp.detach()
+        except Exception:
+            return None
+        for metric in metrics.get('metrics', []):
+            if metric.get('name') == 'JSHeapUsedSize':
+                self.memory_mb = metric['value'] / 1048576
+                return self.memory_mb
+        return None
+
+    async def close(self):
+        try:
+            await self.context.close()
+        except Exception:
+            pass
+
+
+class ContextPool:
+    """크기 N의 컨텍스트 풀 (처음 필요할 때 하나씩 생성)
+
+    `lease = await pool.acquire()` → `lease.page` 사용 → `await pool.release(lease, ok, latency)`
+    launch: 브라우저를 반환하는 코루틴 함수 (첫 컨텍스트를 만들 때 호출 - 브라우저를 늦게 띄움)
+    """
+
+    def __init__(self, launch, size, block=True, max_pages=MAX_PAGES, memory_limit_mb=MEMORY_LIMIT_MB):
+        self.launch = launch
+        self.size = max(1, size)
+        self.block = block
+        self.max_pages = max_pages
+        self.memory_limit_mb = memory_limit_mb
+        self._idle = asyncio.Queue()
+        self._live = set()
+        self._slots = 0
+        self._next_id = 0
+        self._tasks = set()
+        self.recycled = {}
+        self.replace_errors = 0
+
+    async def _create(self):
+        self._next_id += 1
+        cid = self._next_id
+        traffic = PageTraffic()
+        browser = await self.launch()
+        context, page = await create_context(browser, traffic, self.block)
+        # 렌더러 프로세스를 미리 띄워 둠
+        await page.goto('about:blank')
+        lease = PooledContext(cid, context, page, traffic)
+        self._live.add(lease)
+        return lease
+
+    async def acquire(self):
+        """쉬고 있는 컨텍스트 빌리기 (없으면 크기 한도 안에서 새로 만들고, 한도면 대기)"""
+        while True:
+            if self._idle.empty() and self._slots < self.size:
+                self._slots += 1
+                try:
+                    lease = await self._create()
+                except Exception:
+                    self._slots -= 1
+                    raise
+            else:
+                lease = await self._idle.get()
+            if lease.retired:
+                # 교체가 끝난 컨텍스트 - 닫고 다음 것
+                await self._retire(lease)
+                continue
+            lease.traffic.reset()
+            return lease
+
+    def health_reason(self, lease):
+        """교체가 필요한 이유 (건강하면 None)"""
+        if lease.pages >= self.max_pages:
+            return 'pages'
+        if lease.memory_mb is not None and lease.memory_mb >= self.memory_limit_mb:
+            return 'memory'
+        if lease.error_rate() >= MAX_ERROR_RATE:
+            return 'errors'
+        median = lease.median_latency()
+        if median is not None and median >= MIN_SLOW_LATENCY:
+            others = [x for other in self._live if other is not lease for x in other.latencies]
+            if len(others) >= MIN_SAMPLES and median >= LATENCY_FACTOR * statistics.median(others):
+                return 'latency'
+        return None
+
+    async def release(self, lease, ok, latency=None):
+        """사용 결과 보고 후 반납
+
+        Returns:
+            교체를 시작했으면 그 이유 ('pages', 'memory', 'errors', 'latency'), 아니면 None
+        """
+        lease.pages += 1
+        lease.outcomes.append(1 if ok else 0)
+        if latency is not None:
+            lease.latencies.append(latency)
+        if lease.pages % MEMORY_CHECK_EVERY == 0:
+            await lease.measure_memory()
+
+        if lease.retired:
+            await self._retire(lease)
+            return None
+
+        reason = None
+        if not lease.replacing:
+            reason = self.health_reason(lease)
+            if reason:
+                lease.replacing = True
+                task = asyncio.create_task(self._replace(lease, reason))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        # 교체가 준비될 때까지는 기존 컨텍스트를 계속 사용
+        self._idle.put_nowait(lease)
+        return reason
+
+    async def _replace(self, old, reason):
+        """새 컨텍스트를 먼저 띄운 뒤 기존 컨텍스트를 은퇴 처리"""
+        try:
+            new = await self._create()
+        except Exception:
+            self.replace_errors += 1
+            old.replacing = False
+            return
+        self.recycled[reason] = self.recycled.get(reason, 0) + 1
+        old.retired = True
+        self._idle.put_nowait(new)
+
+    async def _retire(self, lease):
+        self._live.discard(lease)
+        await lease.close()
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for lease in list(self._live):
+            await self._retire(lease)
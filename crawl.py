@@ -1,14 +1,19 @@
 """
 통합 크롤러 - 모든 리소스 데이터를 한 번에 수집
 usage:
-    python crawl.py              # 누락된 데이터만 크롤링 (기본)
+    python crawl.py              # 누락/오래된 데이터를 우선순위 순으로 크롤링 (기본)
     python crawl.py --full       # 전체 새로 크롤링
     python crawl.py --retry      # 실패한 리소스만 재시도
     python crawl.py --batch 100  # 배치 크기 조정
+    python crawl.py --concurrency 4 --rps 2  # 동시 4페이지, 초당 2요청
+    python crawl.py --full --shard 2/4     # 4개 조각 중 2번째만 크롤링
+    python crawl.py --full --time-budget 150  # 150분 안에서 처리, 남은 작업은 다음 실행이 이어받음
+    python crawl.py --merge-shards 4       # 샤드 결과 병합
     python crawl.py --help       # 도움말
 """
 import json
 import time
+import asyncio
 import sys
 import io
 import os
@@ -17,6 +22,20 @@ import argparse
 from datetime import datetime
 from pathlib import Path
 
+import config
+from rate_limit import RateLimiter, AdaptiveRateController, classify_error
+from http_fetcher import create_fetcher
+from validator_cache import ValidatorCache
+from readiness import wait_until_ready_async
+from journal import CrawlJournal
+import shards
+from scheduler import CrawlScheduler, FLUSH_MARGIN
+from crawl_cursor import CrawlCursor, CURSOR_PATH
+from canonical_url import canonicalize_resources, dedupe, fetch_url
+from retry_queue import RetryQueue, classify_failure, EMPTY_EXTRACTION_ERROR
+from context_pool import ContextPool
+from crawl_metrics import CrawlMetrics, REPORT_PATH, PROMETHEUS_PATH
+
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -32,6 +51,9 @@ BACKUP_PATH = DATA_DIR / "resources_enhanced.backup.json"
 FAILED_PATH = DATA_DIR / "crawl_failed.json"
 LOG_PATH = BASE_DIR / "crawl.log"
 
+# 실행 중 결과 파일/커서를 저장하는 간격 (초) - 작업이 강제 종료돼도 여기까지는 남음
+CHECKPOINT_INTERVAL = 600
+
 # 크롤링 대상 URL (en-us)
 BASE_URL = "https://education.minecraft.net"
 RESOURCE_LIST_URL = f"{BASE_URL}/en-us/resources"
@@ -185,7 +207,7 @@ def load_resources():
 
 
 def save_resources(resources):
-    """안전한 저장 (백업 후 저장)"""
+    """안전한 저장 (백업 후 임시 파일에 쓰고 rename → 중간에 죽어도 파일이 깨지지 않음)"""
     # 백업
     if ENHANCED_PATH.exists():
         try:
@@ -193,61 +215,125 @@ def save_resources(resources):
         except:
             pass
 
-    with open(ENHANCED_PATH, 'w', encoding='utf-8') as f:
+    tmp_path = ENHANCED_PATH.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(resources, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, ENHANCED_PATH)
 
 
-def save_failed(failed_list):
+def save_failed(failed_list, path=FAILED_PATH):
     """실패 리소스 저장"""
-    with open(FAILED_PATH, 'w', encoding='utf-8') as f:
+    with open(path, 'w', encoding='utf-8') as f:
         json.dump(failed_list, f, ensure_ascii=False, indent=2)
 
 
-def find_missing(resources, mode='default'):
-    """크롤링이 필요한 리소스 인덱스 찾기"""
-    missing = []
-    for i, r in enumerate(resources):
-        if mode == 'full':
-            # 전체 재크롤링
-            missing.append(i)
-        elif mode == 'retry':
-            # 실패한 리소스만
-            if r.get('_crawl_failed'):
-                missing.append(i)
-        else:
-            # 기본: thumbnail_url이 없거나 tags가 한번도 수집 안 된 리소스
-            needs_crawl = (
-                not r.get('thumbnail_url')
-                or r.get('_crawl_status') is None  # 한번도 크롤링 안 됨
-            )
-            if needs_crawl:
-                missing.append(i)
-    return missing
-
+async def extract_data(page, url, retries=3, timings=None):
+    """페이지에서 12개 필드 추출
 
-def extract_data(page, url, retries=3):
-    """페이지에서 12개 필드 추출"""
+    timings(dict)를 넘기면 이동 시간('nav'), 준비 대기 시간('ready')과 준비 여부('ready_ok'),
+    EXTRACT_JS 실행 시간('evaluate'), 재시도 횟수('retries')를 기록
+    """
     for attempt in range(retries):
+        if timings is not None:
+            timings['retries'] = attempt
         try:
-            page.goto(url, timeout=30000, wait_until='domcontentloaded')
-            time.sleep(2)  # JS 렌더링 대기
+            nav_start = time.monotonic()
+            await page.goto(url, timeout=30000, wait_until='domcontentloaded')
+            if timings is not None:
+                timings['nav'] = time.monotonic() - nav_start
+            # JS 렌더링 대기 (DOM 신호가 나타나는 즉시 진행)
+            ready_sec, ready_ok = await wait_until_ready_async(page)
+            if timings is not None:
+                timings['ready'] = ready_sec
+                timings['ready_ok'] = ready_ok
             break
         except Exception as e:
             if attempt < retries - 1:
                 wait_time = 5 * (attempt + 1)  # 5초, 10초 점진적 대기
                 log(f"     ⟳ 재시도 ({attempt + 1}/{retries})... {wait_time}초 대기")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 continue
             else:
                 return None, str(e)[:120]
 
     try:
-        data = page.evaluate(EXTRACT_JS)
+        evaluate_start = time.monotonic()
+        data = await page.evaluate(EXTRACT_JS)
+        if timings is not None:
+            timings['evaluate'] = time.monotonic() - evaluate_start
         return data, None
     except Exception as e:
         return None, str(e)[:120]
 
 
+async def fetch_and_extract(fetcher, get_page, url, resource, cache=None, timings=None, archive=None):
+    """HTTP 우선 추출, 필요한 필드가 비어있을 때만 브라우저로 폴백
+
+    get_page가 None이면 브라우저 없이 HTTP 결과만 사용합니다.
+    cache가 있으면 조건부 요청을 보내고, 304 또는 이전과 같은 추출 결과면
+    'unchanged'를 반환합니다 (이미 크롤링된 리소스만 해당).
+    archive가 있으면 가져온 HTML(브라우저는 렌더링된 DOM)을 아카이브에 저장합니다.
+
+    Returns:
+        (data, error, path) - path는 'http', 'browser', 'unchanged' 중 하나
+    """
+    http_data = None
+    http_error = None
+    if fetcher is not None:
+        from extractor import extract_from_html, missing_fields
+        from validator_cache import content_hash
+
+        crawled = resource.get('_crawl_status') == 'done'
+        headers = cache.conditional_headers(url) if cache is not None and crawled else None
+        http_start = time.monotonic()
+        status, html, resp_headers, http_error = await fetcher.fetch(url, headers)
+        if timings is not None:
+            timings['http'] = time.monotonic() - http_start
+            if http_error:
+                timings['http_error'] = http_error
+            if html:
+                timings['http_bytes'] = len(html.encode('utf-8'))
+
+        if status == 304 and cache is not None:
+            cache.update(url, resp_headers)
+            return None, None, 'unchanged'
+
+        if html:
+            if archive is not None:
+                archive.put(url, html, status=status, source='http')
+            parse_start = time.monotonic()
+            http_data = extract_from_html(html, url)
+            if timings is not None:
+                timings['parse'] = time.monotonic() - parse_start
+            if cache is not None:
+                digest = content_hash(http_data)
+                unchanged = crawled and cache.is_unchanged(url, digest)
+                cache.update(url, resp_headers, digest)
+                if unchanged:
+                    return None, None, 'unchanged'
+            if not missing_fields(http_data, resource.get('type')):
+                return http_data, None, 'http'
+
+    if get_page is None:
+        if http_data:
+            return http_data, None, 'http'
+        return None, http_error or "HTTP 추출 실패", 'http'
+
+    page = await get_page()
+    data, error = await extract_data(page, url, timings=timings)
+    if data is not None and archive is not None:
+        try:
+            archive.put(url, await page.content(), source='browser')
+        except Exception:
+            pass
+    if data is None and http_data:
+        # 브라우저도 실패하면 HTTP로 얻은 일부 필드라도 사용
+        return http_data, None, 'http'
+    return data, error, 'browser'
+
+
 def apply_data(resource, data):
     """추출된 데이터를 리소스에 적용"""
     fields_updated = []
@@ -301,20 +387,28 @@ def apply_data(resource, data):
         resource['full_description'] = data['full_description']
         fields_updated.append('desc')
 
-    # 11. download_url
+    # 11. download_url (링크가 바뀌면 link_probe.py의 점검 결과는 버림)
     if data.get('download_url'):
+        if data['download_url'] != resource.get('download_url'):
+            resource.pop('download_info', None)
         resource['download_url'] = data['download_url']
         fields_updated.append('download')
 
-    # 12. supporting_files
+    # 12. supporting_files (같은 URL의 link_probe.py 점검 결과 info는 유지)
     if data.get('supporting_files'):
-        resource['supporting_files'] = data['supporting_files']
+        probed = {f.get('url'): f['info'] for f in resource.get('supporting_files') or [] if f.get('info')}
+        files = [dict(f) for f in data['supporting_files']]
+        for f in files:
+            if f.get('url') in probed:
+                f['info'] = probed[f['url']]
+        resource['supporting_files'] = files
         fields_updated.append('files')
 
     # 크롤링 상태 표시
     resource['_crawl_status'] = 'done'
     resource['_crawl_at'] = datetime.now().isoformat()
     resource.pop('_crawl_failed', None)
+    resource.pop('_crawl_error', None)
 
     return fields_updated
 
@@ -342,17 +436,350 @@ def progress_bar(current, total, width=30):
     return f"{bar} {pct * 100:.1f}%"
 
 
-def crawl(resources, indices, batch_size=0, delay=3.0, rest_interval=20, rest_duration=30, headless=False):
+async def crawl_worker(wid, session):
+    """워커 하나 - HTTP 우선, 필요할 때만 풀에서 브라우저 컨텍스트를 빌려 크롤링
+
+    session: 모든 워커가 공유하는 객체와 옵션 (resources, state, scheduler, retry_queue, limiter,
+             controller, pool, fetcher, cache, journal, archive, cursor, checkpoint,
+             delay, rest_interval, rest_duration)
+    """
+    resources = session['resources']
+    state = session['state']
+    scheduler = session['scheduler']
+    retry_queue = session['retry_queue']
+    limiter = session['limiter']
+    controller = session['controller']
+    fetcher = session['fetcher']
+    cache = session['cache']
+    journal = session['journal']
+    archive = session['archive']
+    cursor = session['cursor']
+    checkpoint = session['checkpoint']
+    pool = session['pool']
+    metrics = state['metrics']
+    rest_interval = session['rest_interval']
+    rest_duration = session['rest_duration']
+
+    total = state['total']
+    lease = None
+    consecutive_failures = 0
+
+    async def get_page():
+        """브라우저 페이지 (HTTP 추출이 부족할 때만 풀에서 빌림)"""
+        nonlocal lease
+        lease = await pool.acquire()
+        return lease.page
+
+    if pool is None:
+        get_page = None
+
+    while True:
+        # 우선순위 순서로 다음 작업 (시간 예산이 끝나면 None)
+        idx = scheduler.next()
+        if idx is None:
+            break
+
+        resource = resources[idx]
+        url = fetch_url(resource['url'])
+        title = resource.get('title', 'Unknown')[:45]
+
+        # 크롤링 (전역 속도 제한)
+        timings = {}
+        traffic = None
+        data = error = None
+        path = 'browser'
+        task_start = time.monotonic()
+        try:
+            async with limiter:
+                fetch_start = time.monotonic()
+                data, error, path = await fetch_and_extract(fetcher, get_page, url, resource, cache, timings, archive)
+                latency = time.monotonic() - fetch_start
+        finally:
+            if lease is not None:
+                # 컨텍스트 반납 (건강 지표가 나쁘면 미리 띄운 새 컨텍스트로 교체 시작)
+                traffic = lease.traffic
+                reason = await pool.release(lease, ok=data is not None, latency=timings.get('nav'))
+                if reason:
+                    log(f"  🔄 [w{wid}] 컨텍스트 #{lease.cid} 교체 준비 ({reason})")
+                lease = None
+
+        timings['resource'] = latency
+        metrics.record_timings(timings)
+        # 대기 시간까지 포함한 작업 시간 - 시간 예산 끝에 새 작업을 멈출 시점 계산
+        scheduler.observe(time.monotonic() - task_start)
+        metrics.count('paths', path)
+
+        state['done'] += 1
+        state['paths'][path] = state['paths'].get(path, 0) + 1
+        done = state['done']
+        elapsed = time.time() - state['start_time']
+        eta = format_eta(total - done, elapsed / done)
+        log(f"[{done}/{total}] {progress_bar(done, total)} ETA: {eta}")
+        log(f"  📄 [w{wid}] {title}")
+        if traffic is not None:
+            state['browser_requests'] += traffic.requests
+            state['browser_bytes'] += traffic.bytes
+            state['browser_blocked'] += traffic.blocked
+            metrics.observe_bytes('browser', traffic.bytes)
+            log(f"  📦 요청 {traffic.requests}개, {traffic.bytes / 1024:.0f}KB, 차단 {traffic.blocked}개")
+        if 'ready' in timings:
+            if not timings['ready_ok']:
+                state['ready_timeouts'] += 1
+            log(f"  ⏱️  준비 {timings['ready']:.2f}초{'' if timings['ready_ok'] else ' (타임아웃)'}")
+
+        # 속도 피드백 (HTTP 단계의 429/503은 브라우저 폴백이 성공해도 반영)
+        if controller is not None:
+            if data or path == 'unchanged':
+                if classify_error(timings.get('http_error')) == 'throttle':
+                    await controller.on_error(timings['http_error'])
+                else:
+                    await controller.on_success(latency)
+            else:
+                kind = await controller.on_error(error)
+                log(f"  🐢 속도 조절 ({kind}): {limiter.rate_label()}, 동시 {limiter.max_in_flight}개")
+
+        # 아무 필드도 없으면 실패로 처리 (HTTP 단계가 404/410이면 사라진 페이지)
+        if path != 'unchanged' and not (data and any(data.values())):
+            http_error = timings.get('http_error')
+            if classify_failure(http_error) == 'gone':
+                error = http_error
+            elif data is not None:
+                error = EMPTY_EXTRACTION_ERROR
+            data = None
+
+        scheduler.record(resource, ok=bool(data) or path == 'unchanged')
+
+        if path == 'unchanged':
+            resource['_crawl_at'] = datetime.now().isoformat()
+            resource.pop('_crawl_failed', None)
+            resource.pop('_crawl_error', None)
+            retry_queue.resolve(resource.get('id'))
+            log(f"  ♻️  변경 없음 (재검증)")
+            state['success'] += 1
+            metrics.count('results', 'success')
+            consecutive_failures = 0
+        elif data:
+            with metrics.timer('apply'):
+                fields = apply_data(resource, data)
+            resource['_crawl_path'] = path
+            retry_queue.resolve(resource.get('id'))
+            log(f"  ✅ ({path}) {', '.join(fields)}")
+            state['success'] += 1
+            metrics.count('results', 'success')
+            consecutive_failures = 0
+        else:
+            log(f"  ❌ {error}")
+            resource['_crawl_failed'] = True
+            resource['_crawl_error'] = error
+            entry = retry_queue.record_failure(resource, url, error)
+            if entry['parked']:
+                log(f"  🅿️  보류 ({entry['kind']}, {entry['attempts']}회 실패) - 자동 재시도 안 함")
+            else:
+                log(f"  🔁 재시도 예약 ({entry['kind']}, {entry['attempts']}회째): {entry['next_attempt'][:16]}")
+            state['failed'] += 1
+            metrics.count('results', 'failed')
+            metrics.count('errors', entry['kind'])
+            state['failed_list'].append({
+                'index': idx,
+                'url': url,
+                'title': title,
+                'error': error,
+                'kind': entry['kind'],
+            })
+            consecutive_failures += 1
+
+            # 적응형 제어가 꺼져 있으면 5회 연속 실패 시 전체 워커 60초 정지
+            # (컨텍스트 교체는 풀이 컨텍스트별 에러율로 판단)
+            if consecutive_failures >= 5 and controller is None:
+                log(f"  ⚠️ [w{wid}] {consecutive_failures}회 연속 실패 - 60초 대기")
+                limiter.pause(60)
+                consecutive_failures = 0
+
+        # 저널 기록 (리소스마다 한 줄, 전체 JSON은 실행 종료 시 한 번만 저장)
+        if journal is not None:
+            with metrics.timer('journal'):
+                journal.record(resource)
+        if cursor is not None:
+            cursor.mark_done(resource.get('id'))
+
+        # 체크포인트 (결과 파일 + 커서) - 실행이 강제 종료돼도 다음 실행이 여기서부터 이어받음
+        if checkpoint is not None and time.monotonic() - state['last_checkpoint'] >= CHECKPOINT_INTERVAL:
+            state['last_checkpoint'] = time.monotonic()
+            checkpoint()
+            log(f"  📍 체크포인트 저장 (남은 작업 {scheduler.remaining()}개)")
+
+        # 보조 상태 자동 저장 (10개마다)
+        if done % 10 == 0:
+            scheduler.save()
+            retry_queue.save()
+            if cache is not None:
+                cache.save()
+            if controller is not None:
+                controller.save()
+
+        # 휴식 (rest_interval마다 전체 워커 정지)
+        if done % rest_interval == 0 and done < total:
+            log(f"  ☕ {rest_duration}초 휴식...")
+            limiter.pause(rest_duration)
+
+        await asyncio.sleep(session['delay'])
+
+
+async def crawl_async(resources, targets, state, delay, rest_interval, rest_duration,
+                      headless, concurrency, rps, use_http=True, cache=None, block=True, adaptive=False,
+                      journal=None, archive=None, scheduler=None, retry_queue=None, time_budget=None,
+                      use_browser=True, rate_state_path=None, cursor=None, checkpoint=None,
+                      flush_margin=FLUSH_MARGIN, ordered=False):
+    """비동기 크롤링 엔진 - N개 워커가 전역 속도 제한을 공유
+
+    브라우저는 첫 폴백이 필요할 때 띄웁니다 (HTTP 추출만으로 끝나면 Chromium을 띄우지 않음).
+    use_browser=False면 HTTP 결과만 사용합니다.
+    time_budget이 있으면 flush_margin초를 저장용으로 남기고, 그때까지 끝나지 않은 작업은 취소합니다
+    (취소된 리소스는 커서에 남아 다음 실행이 처리).
+    """
+    # 점수 순서(커서에서 이어받았으면 계획 순서)로 작업 분배 (time_budget: 초)
+    scheduler.start(targets, time_budget, flush_margin, ordered)
+
+    limiter = RateLimiter(rps, concurrency)
+    controller = None
+    if adaptive:
+        # rps/concurrency는 상한, 시작점은 지난 실행에서 학습한 속도
+        controller = AdaptiveRateController(limiter, max_rps=rps, max_concurrency=concurrency,
+                                            **({'state_path': rate_state_path} if rate_state_path else {}))
+        if controller.load():
+            log(f"📈 학습된 속도로 시작: {limiter.rate_label()}, 동시 {limiter.max_in_flight}개")
+        state['controller'] = controller
+
+    playwright = browser = None
+    launch_lock = asyncio.Lock()
+
+    async def launch_browser():
+        nonlocal playwright, browser
+        async with launch_lock:
+            if browser is None:
+                from playwright.async_api import async_playwright
+
+                # CI 환경 자동 감지
+                is_headless = headless or os.getenv('CI') == 'true'
+                browser_args = ['--disable-http2']
+                if is_headless:
+                    browser_args.append('--no-sandbox')
+
+                log(f"🌐 브라우저 모드: {'headless' if is_headless else 'headed'}")
+                playwright = await async_playwright().start()
+                browser = await playwright.chromium.launch(
+                    headless=is_headless,
+                    args=browser_args
+                )
+        return browser
+
+    # 워커 수만큼의 컨텍스트 풀 (브라우저 폴백이 처음 필요할 때 생성)
+    pool = ContextPool(launch_browser, concurrency, block=block) if use_browser else None
+    state['pool'] = pool
+
+    fetcher = create_fetcher(concurrency) if use_http else None
+    if use_http and fetcher is None:
+        if not use_browser:
+            raise RuntimeError("httpx/beautifulsoup4가 없으면 브라우저 없이 크롤링할 수 없습니다.")
+        log("⚠️  httpx/beautifulsoup4가 없어 브라우저로만 크롤링합니다.")
+
+    session = {
+        'resources': resources,
+        'state': state,
+        'scheduler': scheduler,
+        'retry_queue': retry_queue,
+        'limiter': limiter,
+        'controller': controller,
+        'pool': pool,
+        'fetcher': fetcher,
+        'cache': cache,
+        'journal': journal,
+        'archive': archive,
+        'cursor': cursor,
+        'checkpoint': checkpoint,
+        'delay': delay,
+        'rest_interval': rest_interval,
+        'rest_duration': rest_duration,
+    }
+
+    try:
+        workers = [
+            asyncio.create_task(crawl_worker(wid, session))
+            for wid in range(1, concurrency + 1)
+        ]
+        time_left = scheduler.time_left()
+        if time_left is None:
+            await asyncio.gather(*workers)
+        else:
+            finished, unfinished = await asyncio.wait(workers, timeout=max(0.0, time_left))
+            if unfinished:
+                # 저장 여유 시간 확보 - 진행 중인 작업은 기록되지 않고 다음 실행으로
+                log(f"  ⏰ 시간 예산 종료 - 진행 중인 작업 {len(unfinished)}개 취소")
+                for task in unfinished:
+                    task.cancel()
+                await asyncio.gather(*unfinished, return_exceptions=True)
+            for task in finished:
+                task.result()
+    finally:
+        if fetcher is not None:
+            await fetcher.aclose()
+        if pool is not None:
+            await pool.close()
+        if browser is not None:
+            await browser.close()
+        if playwright is not None:
+            await playwright.stop()
+
+def new_run_state(total):
+    """실행 상태 (워커들이 공유하는 진행 카운터와 계측값)"""
+    return {
+        'total': total,
+        'done': 0,
+        'success': 0,
+        'failed': 0,
+        'failed_list': [],
+        'paths': {},
+        'browser_requests': 0,
+        'browser_bytes': 0,
+        'browser_blocked': 0,
+        'metrics': CrawlMetrics(),
+        'ready_timeouts': 0,
+        'start_time': time.time(),
+        'last_checkpoint': time.monotonic(),
+    }
+
+
+def crawl(resources, indices, batch_size=0, delay=3.0, rest_interval=20, rest_duration=30, headless=False,
+          concurrency=config.MAX_CONCURRENT_REQUESTS, rps=config.REQUESTS_PER_SECOND, use_http=True,
+          revalidate=True, block=True, adaptive=False, journal=None, shard=None, archive=False,
+          scheduler=None, retry_queue=None, time_budget=None, use_browser=True, cursor=None,
+          flush_margin=FLUSH_MARGIN, ordered=False):
     """메인 크롤링 루프
 
     Args:
         resources: 전체 리소스 리스트
         indices: 크롤링할 인덱스 리스트
         batch_size: 0이면 전체, 양수면 해당 개수만
-        delay: 요청 간 딜레이 (초)
+        delay: 워커별 요청 간 딜레이 (초)
         rest_interval: N개마다 휴식
         rest_duration: 휴식 시간 (초)
         headless: headless 모드 (CI용)
+        concurrency: 동시에 크롤링할 페이지 수 (워커 수)
+        rps: 전체 워커 합산 초당 요청 수 (0이면 제한 없음)
+        use_http: HTTP 우선 추출 사용 (False면 항상 브라우저)
+        revalidate: ETag/Last-Modified/콘텐츠 해시로 변경 없는 페이지 건너뛰기
+        block: 브라우저에서 이미지/폰트/미디어/분석 스크립트 요청 차단
+        adaptive: 에러/지연에 따라 rps와 동시 요청 수를 자동 조절 (rps/concurrency는 상한, 기본 꺼짐)
+        journal: CrawlJournal - 리소스별 결과를 추가 기록, 결과 파일 저장(체크포인트/종료)에 성공하면 삭제
+        shard: (i, N) - 주어지면 결과를 resources_enhanced.json 대신 샤드 결과 파일에 저장
+        archive: 가져온 HTML을 data/archive/에 압축 보관 (오프라인 재추출용)
+        scheduler: CrawlScheduler - 점수 순서로 작업 분배 (없으면 새로 생성)
+        retry_queue: RetryQueue - 실패를 에러 종류별 백오프로 예약 (없으면 data/retry_queue.json)
+        time_budget: 초 - 저장까지 포함한 실행 시간 예산 (None이면 무제한)
+        use_browser: False면 브라우저 폴백 없이 HTTP 추출 결과만 사용
+        cursor: CrawlCursor - 처리한 리소스를 지워 나가며 주기적으로 저장 (다음 실행이 이어받음)
+        flush_margin: time_budget 끝에 저장용으로 남겨 둘 시간 (초)
+        ordered: True면 indices 순서대로 처리 (커서에서 이어받은 계획)
     """
     if batch_size > 0:
         targets = indices[:batch_size]
@@ -364,114 +791,79 @@ def crawl(resources, indices, batch_size=0, delay=3.0, rest_interval=20, rest_du
         log("🎉 크롤링할 리소스가 없습니다. 모두 완료!")
         return
 
+    concurrency = max(1, min(concurrency, total))
+
     log(f"🕷️  크롤링 시작: {total}개 리소스")
+    log(f"   동시 페이지: {concurrency}개, 전역 제한: {rps}요청/초")
     log(f"   딜레이: {delay}초, {rest_interval}개마다 {rest_duration}초 휴식")
+    if time_budget:
+        log(f"   시간 예산: {time_budget / 60:.0f}분 (저장용 {min(flush_margin, time_budget / 2):.0f}초 포함)")
     log("")
 
-    success_count = 0
-    failed_count = 0
-    failed_list = []
-    start_time = time.time()
+    if scheduler is None:
+        scheduler = CrawlScheduler(resources)
+    if retry_queue is None:
+        retry_queue = RetryQueue()
 
-    try:
-        from playwright.sync_api import sync_playwright
+    state = new_run_state(total)
 
-        def create_context(browser):
-            """새 브라우저 컨텍스트 생성"""
-            ctx = browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
-            )
-            return ctx, ctx.new_page()
-
-        with sync_playwright() as p:
-            # CI 환경 자동 감지
-            is_headless = headless or os.getenv('CI') == 'true'
-            browser_args = ['--disable-http2']
-            if is_headless:
-                browser_args.append('--no-sandbox')
-            
-            log(f"🌐 브라우저 모드: {'headless' if is_headless else 'headed'}")
-            browser = p.chromium.launch(
-                headless=is_headless,
-                args=browser_args
-            )
-            context, page = create_context(browser)
-            consecutive_failures = 0
+    cache = ValidatorCache() if revalidate and use_http else None
+    if cache is not None:
+        log(f"   재검증 캐시: {len(cache)}개 URL")
 
-            for seq, idx in enumerate(targets, 1):
-                resource = resources[idx]
-                url = resource['url']
-                # en-us URL 확인 (ko-kr → en-us 변환)
-                if '/ko-kr/' in url:
-                    url = url.replace('/ko-kr/', '/en-us/')
-                elif '/en-us/' not in url:
-                    # education.minecraft.net/worlds/xxx → /en-us/worlds/xxx
-                    url = url.replace('education.minecraft.net/', 'education.minecraft.net/en-us/')
-
-                title = resource.get('title', 'Unknown')[:45]
-                elapsed = time.time() - start_time
-                avg_time = elapsed / seq if seq > 1 else delay + 2
-                eta = format_eta(total - seq, avg_time)
-
-                log(f"[{seq}/{total}] {progress_bar(seq, total)} ETA: {eta}")
-                log(f"  📄 {title}")
-
-                # 50개마다 컨텍스트 재생성 (연결 갱신)
-                if seq > 1 and seq % 50 == 0:
-                    log(f"  🔄 브라우저 컨텍스트 갱신...")
-                    try:
-                        context.close()
-                    except:
-                        pass
-                    context, page = create_context(browser)
-                    time.sleep(3)
-
-                # 크롤링
-                data, error = extract_data(page, url)
-
-                if data:
-                    fields = apply_data(resource, data)
-                    log(f"  ✅ {', '.join(fields)}")
-                    success_count += 1
-                    consecutive_failures = 0
-                else:
-                    log(f"  ❌ {error}")
-                    resource['_crawl_failed'] = True
-                    resource['_crawl_error'] = error
-                    failed_count += 1
-                    failed_list.append({
-                        'index': idx,
-                        'url': url,
-                        'title': title,
-                        'error': error
-                    })
-                    consecutive_failures += 1
-
-                    # 5회 연속 실패 시 컨텍스트 재생성 + 장시간 대기
-                    if consecutive_failures >= 5:
-                        log(f"  ⚠️ {consecutive_failures}회 연속 실패 - 60초 대기 후 컨텍스트 재생성")
-                        time.sleep(60)
-                        try:
-                            context.close()
-                        except:
-                            pass
-                        context, page = create_context(browser)
-                        consecutive_failures = 0
-                        time.sleep(5)
-
-                # 자동 저장 (10개마다)
-                if seq % 10 == 0:
-                    save_resources(resources)
-                    log(f"  💾 자동 저장 완료 ({seq}/{total})")
-
-                # 휴식 (rest_interval마다)
-                if seq % rest_interval == 0 and seq < total:
-                    log(f"  ☕ {rest_duration}초 휴식...")
-                    time.sleep(rest_duration)
-                else:
-                    time.sleep(delay)
+    page_archive = None
+    if archive:
+        from page_archive import PageArchive
+        page_archive = PageArchive()
+        log(f"   HTML 아카이브: {page_archive.root} ({page_archive.codec})")
+
+    if cursor is not None:
+        cursor.begin_run()
+
+    def save_outputs():
+        """결과 파일 저장 (resources_enhanced.json 또는 샤드 결과 파일)"""
+        if shard:
+            return shards.save_shard(resources, *shard), shards.shard_failed_path(*shard)
+        save_resources(resources)
+        return ENHANCED_PATH, FAILED_PATH
+
+    def checkpoint():
+        """실행 중 체크포인트 - 결과 파일, 보조 상태, 커서"""
+        save_outputs()
+        if journal is not None:
+            # 여기까지의 결과는 결과 파일에 압축됨
+            journal.discard()
+        scheduler.save()
+        retry_queue.save()
+        if cache is not None:
+            cache.save()
+        if cursor is not None:
+            cursor.save()
 
-            browser.close()
+    try:
+        asyncio.run(crawl_async(
+            resources, targets, state,
+            delay=delay,
+            rest_interval=rest_interval,
+            rest_duration=rest_duration,
+            headless=headless,
+            concurrency=concurrency,
+            rps=rps,
+            use_http=use_http,
+            cache=cache,
+            block=block,
+            adaptive=adaptive,
+            journal=journal,
+            archive=page_archive,
+            scheduler=scheduler,
+            retry_queue=retry_queue,
+            time_budget=time_budget,
+            use_browser=use_browser,
+            cursor=cursor,
+            checkpoint=checkpoint,
+            flush_margin=flush_margin,
+            ordered=ordered,
+        ))
 
     except KeyboardInterrupt:
         log("")
@@ -479,12 +871,40 @@ def crawl(resources, indices, batch_size=0, delay=3.0, rest_interval=20, rest_du
     except Exception as e:
         log(f"❌ 예상치 못한 에러: {e}")
     finally:
-        # 항상 저장
-        save_resources(resources)
+        # 항상 저장 (저널 → resources_enhanced.json 또는 샤드 결과 파일로 압축)
+        metrics = state['metrics']
+        try:
+            with metrics.timer('save'):
+                output_path, failed_path = save_outputs()
+        except BaseException:
+            if journal is not None:
+                # 압축하지 못함 - 다음 실행이 저널로 복구
+                journal.close()
+                log(f"  📓 저널 유지: {journal.path} (결과 저장 실패, 다음 실행에서 복구)")
+            raise
+        if journal is not None:
+            # 결과 파일에 압축됨 (중단된 실행의 남은 작업은 커서/스케줄러가 이어감)
+            journal.discard()
+        if cache is not None:
+            cache.save()
+        scheduler.save()
+        retry_queue.save()
+        if cursor is not None:
+            cursor.save()
+        controller = state.get('controller')
+        if controller is not None:
+            controller.save()
+        archive_stats = None
+        if page_archive is not None:
+            archive_stats = page_archive.stats()
+            page_archive.close()
+        failed_list = state['failed_list']
         if failed_list:
-            save_failed(failed_list)
+            save_failed(failed_list, failed_path)
 
-        elapsed = time.time() - start_time
+        success_count = state['success']
+        failed_count = state['failed']
+        elapsed = time.time() - state['start_time']
         processed = success_count + failed_count
 
         log("")
@@ -493,27 +913,144 @@ def crawl(resources, indices, batch_size=0, delay=3.0, rest_interval=20, rest_du
         log("=" * 60)
         log(f"  성공: {success_count}")
         log(f"  실패: {failed_count}")
+        errors = metrics.counters.get('errors')
+        if errors:
+            log(f"  실패 종류: {', '.join(f'{k} {v}개' for k, v in sorted(errors.items()))}")
+        parked = len(retry_queue.parked_ids())
+        if len(retry_queue):
+            log(f"  🔁 재시도 큐: {len(retry_queue)}개 (보류 {parked}개) - {retry_queue.path}")
+        if cursor is not None and len(cursor):
+            log(f"  📍 커서: 남은 {len(cursor)}개는 다음 실행이 이어서 처리 ({cursor.path.name})")
+        elif scheduler.out_of_time() and scheduler.remaining():
+            log(f"  ⏰ 시간 예산 종료 - 남은 {scheduler.remaining()}개는 다음 실행에서 처리")
         log(f"  소요 시간: {elapsed:.1f}초 ({elapsed / 60:.1f}분)")
         if processed > 0:
-            log(f"  속도: {processed / elapsed:.2f} 리소스/초")
+            log(f"  처리량: {processed / elapsed:.2f} 리소스/초 (동시 {concurrency}개)")
+            http_hits = state['paths'].get('http', 0)
+            log(f"  추출 경로: HTTP {http_hits}개 ({http_hits * 100 // processed}%), "
+                f"브라우저 {state['paths'].get('browser', 0)}개")
+            unchanged = state['paths'].get('unchanged', 0)
+            log(f"  재검증(변경 없음): {unchanged}개, 재추출: {success_count - unchanged}개")
+            browser_pages = state['paths'].get('browser', 0)
+            if browser_pages:
+                log(f"  브라우저 트래픽: 페이지당 요청 {state['browser_requests'] / browser_pages:.1f}개, "
+                    f"{state['browser_bytes'] / browser_pages / 1024:.0f}KB, "
+                    f"차단 {state['browser_blocked'] / browser_pages:.1f}개")
+            stage_summary = ', '.join(
+                f"{name} {metrics.percentile(name, 50):.2f}/{metrics.percentile(name, 95):.2f}초"
+                for name in ('http', 'nav', 'ready', 'evaluate', 'resource') if name in metrics.stages
+            )
+            if stage_summary:
+                log(f"  단계별 p50/p95: {stage_summary}")
+            if 'ready' in metrics.stages:
+                log(f"  페이지 준비 타임아웃: {state['ready_timeouts']}개")
+            pool = state.get('pool')
+            if pool is not None and (pool.recycled or pool.replace_errors):
+                log(f"  컨텍스트 교체: {pool.recycled or '없음'} (교체 실패 {pool.replace_errors}개)")
+            if controller is not None:
+                log(f"  학습된 속도: {controller.limiter.rate_label()}, "
+                    f"동시 {controller.limiter.max_in_flight}개 (에러: {controller.events or '없음'})")
         log(f"  전체 진행률: {len(resources) - len(indices) + success_count}/{len(resources)}")
-        log(f"  💾 저장: {ENHANCED_PATH}")
+        if archive_stats is not None:
+            log(f"  🗄️  아카이브: 캡처 {archive_stats['captures']}개, 고유 페이지 {archive_stats['blobs']}개, "
+                f"{archive_stats['raw_bytes'] / 1048576:.1f}MB → {archive_stats['packed_bytes'] / 1048576:.1f}MB")
+        log(f"  💾 저장: {output_path}")
         if failed_list:
-            log(f"  ❌ 실패 목록: {FAILED_PATH}")
+            log(f"  ❌ 실패 목록: {failed_path}")
+
+        # 기계가 읽는 실행 리포트 (JSON + Prometheus)
+        extra = {'concurrency': concurrency, 'rps_limit': rps, 'targets': total,
+                 'ready_timeouts': state['ready_timeouts'],
+                 'out_of_time': scheduler.out_of_time() and scheduler.remaining() > 0}
+        if cursor is not None:
+            extra['cursor_remaining'] = len(cursor)
+        if controller is not None:
+            extra['learned_rps'] = round(controller.limiter.rps, 4)
+        pool = state.get('pool')
+        if pool is not None:
+            extra['context_recycles'] = pool.recycled
+        report_path, prometheus_path = REPORT_PATH, PROMETHEUS_PATH
+        if shard:
+            name = shards.shard_name(*shard)
+            report_path = shards.SHARD_DIR / f"crawl_report.{name}.json"
+            prometheus_path = shards.SHARD_DIR / f"crawl_metrics.{name}.prom"
+        metrics.write(extra, report_path, prometheus_path)
+        log(f"  📈 리포트: {report_path}, {prometheus_path.name}")
         log("")
 
 
+def merge_shard_results(count):
+    """샤드 결과를 resources_enhanced.json으로 병합 (모든 샤드가 채워졌는지 검증)
+
+    Returns:
+        성공 여부
+    """
+    resources = load_resources()
+    if resources is None:
+        log("❌ resources_enhanced.json을 불러올 수 없습니다.")
+        return False
+
+    merged, report = shards.merge_shards(resources, count)
+
+    log(f"🧩 샤드 병합 ({count}개)")
+    log(f"   갱신: {report['updated']}개, 추가: {report['added']}개")
+    if report['misplaced']:
+        log(f"   ⚠️  다른 샤드 소속 리소스 {len(report['misplaced'])}개: {report['misplaced'][:5]}")
+    if report['missing_shards']:
+        log(f"   ❌ 결과 파일이 없는 샤드: {report['missing_shards']}")
+    if report['uncovered']:
+        log(f"   ❌ 샤드 결과에 빠진 리소스 {len(report['uncovered'])}개: {report['uncovered'][:5]}")
+    if report['missing_shards'] or report['uncovered']:
+        log("   병합을 중단합니다 (resources_enhanced.json 변경 없음).")
+        return False
+
+    save_resources(merged)
+
+    failed_list = []
+    for index in range(1, count + 1):
+        path = shards.shard_failed_path(index, count)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                failed_list.extend(json.load(f))
+    if failed_list:
+        failed_list.sort(key=lambda x: x.get('url', ''))
+        save_failed(failed_list)
+
+    # 재시도 큐: 샤드 소속 항목은 그 샤드의 큐로 교체
+    retry_queue = RetryQueue()
+    for index in range(1, count + 1):
+        path = shards.shard_retry_queue_path(index, count)
+        if not path.exists():
+            continue
+        shard_entries = RetryQueue(path).entries
+        retry_queue.entries = {
+            rid: e for rid, e in retry_queue.entries.items() if shards.shard_of(rid, count) != index
+        }
+        retry_queue.entries.update(
+            (rid, e) for rid, e in shard_entries.items() if shards.shard_of(rid, count) == index
+        )
+    retry_queue.save()
+
+    log(f"   💾 저장: {ENHANCED_PATH} ({len(merged)}개)")
+    return True
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="🕷️ Minecraft Education 통합 크롤러",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 사용 예시:
-  python crawl.py              누락된 데이터만 크롤링
+  python crawl.py              누락/오래된 데이터를 우선순위 순으로 크롤링
+  python crawl.py --time-budget 150
+                               150분(저장 포함) 동안 가장 가치 있는 리소스부터 크롤링,
+                               남은 작업은 커서에 저장되어 다음 실행이 이어받음
   python crawl.py --full       전체 리소스 재크롤링
   python crawl.py --retry      실패한 리소스만 재시도
   python crawl.py --batch 50   50개만 크롤링
   python crawl.py --delay 5    5초 간격으로 크롤링
+  python crawl.py --concurrency 4 --rps 2
+                               4개 페이지 동시 크롤링, 전체 초당 2요청
         """
     )
     parser.add_argument('--full', action='store_true',
@@ -523,15 +1060,53 @@ def main():
     parser.add_argument('--batch', type=int, default=0,
                         help='크롤링할 개수 (0=전체)')
     parser.add_argument('--delay', type=float, default=3.0,
-                        help='요청 간 딜레이 초 (기본: 3)')
+                        help='워커별 요청 간 딜레이 초 (기본: 3)')
     parser.add_argument('--rest-interval', type=int, default=20,
                         help='N개마다 휴식 (기본: 20)')
     parser.add_argument('--rest-duration', type=int, default=30,
                         help='휴식 시간 초 (기본: 30)')
     parser.add_argument('--headless', action='store_true',
                         help='headless 모드 (CI/서버용)')
+    parser.add_argument('--concurrency', type=int, default=config.MAX_CONCURRENT_REQUESTS,
+                        help=f'동시 크롤링 페이지 수 (기본: {config.MAX_CONCURRENT_REQUESTS})')
+    parser.add_argument('--no-http', action='store_true',
+                        help='HTTP 우선 추출을 끄고 항상 브라우저로 크롤링')
+    parser.add_argument('--no-revalidate', action='store_true',
+                        help='조건부 재검증을 끄고 변경 없는 페이지도 다시 추출')
+    parser.add_argument('--no-browser', action='store_true',
+                        help='브라우저 폴백 없이 HTTP 추출만 사용 (Chromium 불필요)')
+    parser.add_argument('--no-block', action='store_true',
+                        help='브라우저 하위 리소스(이미지/폰트/분석 스크립트) 차단 끄기')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='적응형 속도 제어 켜기 (--rps/--concurrency를 상한으로 자동 조절)')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='중단된 실행의 저널과 커서를 버리고 새로 계획해서 크롤링')
+    parser.add_argument('--shard', type=str, default=None,
+                        help='i/N - 리소스 id 해시로 나눈 N개 조각 중 i번째(1..N)만 크롤링')
+    parser.add_argument('--merge-shards', type=int, default=0, metavar='N',
+                        help='N개 샤드 결과를 resources_enhanced.json으로 병합')
+    parser.add_argument('--archive', action='store_true',
+                        help='가져온 HTML을 data/archive/에 압축 보관')
+    parser.add_argument('--time-budget', type=float, default=0, metavar='MINUTES',
+                        help='저장까지 포함해 N분 안에 끝냄 (우선순위 높은 것부터, 남은 작업은 다음 실행으로)')
+    parser.add_argument('--flush-margin', type=float, default=FLUSH_MARGIN, metavar='SECONDS',
+                        help=f'시간 예산 끝에 저장용으로 남겨 둘 시간 (기본: {FLUSH_MARGIN}초)')
+    parser.add_argument('--rps', type=float, default=config.REQUESTS_PER_SECOND,
+                        help=f'전체 초당 요청 수 제한, 0=제한 없음 (기본: {config.REQUESTS_PER_SECOND})')
 
     args = parser.parse_args()
+    if args.no_http and args.no_browser:
+        parser.error("--no-http와 --no-browser는 함께 쓸 수 없습니다")
+
+    shard = None
+    if args.shard:
+        try:
+            shard = shards.parse_shard_spec(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.merge_shards:
+        sys.exit(0 if merge_shard_results(args.merge_shards) else 1)
 
     print("=" * 60)
     print("🕷️  Minecraft Education 통합 크롤러")
@@ -551,9 +1126,83 @@ def main():
 
     log(f"📊 전체 리소스: {len(resources)}개")
 
+    # URL 정규화 (로케일/끝 슬래시/대소문자/쿼리 차이 제거, 이전 URL은 url_aliases에 보관)
+    renamed = canonicalize_resources(resources)
+    if renamed:
+        log(f"🔗 URL 정규화: {renamed}개 (이전 URL은 url_aliases에 보관)")
+
+    # 중단된 실행의 저널 복구 (이미 처리한 리소스는 다시 크롤링하지 않음)
+    if shard:
+        shards.SHARD_DIR.mkdir(parents=True, exist_ok=True)
+        journal = CrawlJournal(shards.shard_journal_path(*shard))
+    else:
+        journal = CrawlJournal()
+    if args.no_resume:
+        journal.discard()
+    journaled = journal.replay(resources)
+    if journaled:
+        log(f"📓 저널 복구: {len(journaled)}개 리소스는 이전 실행에서 처리됨 (건너뜀)")
+
     # 크롤링 대상 찾기
     mode = 'full' if args.full else ('retry' if args.retry else 'default')
-    missing = find_missing(resources, mode)
+    retry_queue = RetryQueue()
+    if mode == 'retry' and not len(retry_queue):
+        # 처음 --retry를 쓰는 경우 - 기존 실패 기록을 큐로 옮김 (재시도 시각은 첫 백오프 구간에 지터로 분산)
+        counts = retry_queue.import_failures(resources)
+        log(f"📥 재시도 큐로 가져옴: {sum(counts.values())}개 (python retry_queue.py로 현황 확인)")
+        retry_queue.save()
+    if shard:
+        # 샤드별로 따로 저장하고 --merge-shards가 합침
+        retry_queue.path = shards.shard_retry_queue_path(*shard)
+
+    # retry: 백오프가 끝난 항목만, 그 외: 백오프 대기/보류 중인 리소스 제외 (full은 모두 포함)
+    scheduler = CrawlScheduler(resources)
+    if mode == 'retry':
+        missing = scheduler.plan(mode, retry_ids=retry_queue.due_ids())
+        waiting = len(retry_queue) - len(retry_queue.due_ids())
+        if waiting:
+            log(f"🔁 재시도 큐: {waiting}개는 백오프 대기 또는 보류 중 (건너뜀)")
+    elif mode == 'default':
+        missing = scheduler.plan(mode, skip_ids=retry_queue.waiting_ids())
+    else:
+        missing = scheduler.plan(mode)
+    if journaled:
+        missing = [i for i in missing if resources[i].get('id') not in journaled]
+    if shard:
+        missing = [i for i in missing if shards.in_shard(resources[i], *shard)]
+        log(f"🧩 샤드 {shard[0]}/{shard[1]}: 이 조각의 리소스만 크롤링")
+
+    # 같은 페이지를 가리키는 리소스는 한 번만 가져옴
+    missing, duplicates = dedupe(resources, missing)
+    if duplicates:
+        log(f"🔗 중복 URL {duplicates}개 제외 (같은 정규 URL)")
+
+    # 커서: 이전 실행이 시간 예산으로 끊겼으면 남은 계획부터 (retry 모드는 매번 새로 계획)
+    cursor = CrawlCursor(shards.shard_cursor_path(*shard) if shard else CURSOR_PATH)
+    if args.no_resume:
+        cursor.reset()
+    ordered = False
+    if mode != 'retry' and cursor.can_resume(mode):
+        resumed = cursor.resume(resources)
+        if journaled:
+            # 저널로 복구한 리소스는 이미 처리됨
+            for rid in journaled:
+                cursor.mark_done(rid)
+            resumed = [i for i in resumed if resources[i].get('id') not in journaled]
+        log(f"📍 커서에서 이어받음: {len(resumed)}개 남음 "
+            f"({cursor.state.get('planned_at', '')[:16]}에 계획, {cursor.state.get('runs', 0)}회 실행)")
+        if mode == 'default':
+            # 그 사이 새로 대상이 된 리소스는 남은 계획 뒤에
+            resumed_set = set(resumed)
+            extra = [i for i in missing if i not in resumed_set]
+            cursor.extend(resources, extra)
+            resumed += extra
+        missing = resumed
+        ordered = True
+    elif mode != 'retry':
+        cursor.start(mode, resources, missing)
+    else:
+        cursor = None
 
     # 현재 상태 표시
     has_thumbnail = sum(1 for r in resources if r.get('thumbnail_url'))
@@ -574,6 +1223,15 @@ def main():
     log("")
 
     if not missing:
+        if cursor is not None:
+            cursor.save()
+        if shard:
+            # 병합 검증을 위해 크롤링할 것이 없어도 샤드 결과 파일은 남김
+            shards.save_shard(resources, *shard)
+        elif journaled:
+            # 저널만 남아 있던 경우 - 압축 후 정리
+            save_resources(resources)
+        journal.discard()
         log("🎉 크롤링할 리소스가 없습니다!")
         return
 
@@ -586,6 +1244,22 @@ def main():
         rest_interval=args.rest_interval,
         rest_duration=args.rest_duration,
         headless=args.headless,
+        concurrency=args.concurrency,
+        rps=args.rps,
+        use_http=not args.no_http,
+        use_browser=not args.no_browser,
+        revalidate=not args.no_revalidate,
+        block=not args.no_block,
+        adaptive=args.adaptive,
+        journal=journal,
+        shard=shard,
+        archive=args.archive,
+        scheduler=scheduler,
+        retry_queue=retry_queue,
+        time_budget=args.time_budget * 60 if args.time_budget else None,
+        flush_margin=args.flush_margin,
+        cursor=cursor,
+        ordered=ordered,
     )
 
 
@@ -0,0 +1,126 @@
+"""
+크롤링 커서 - 시간 예산으로 끊긴 실행을 다음 실행이 정확히 이어받도록 남은 작업을 기록
+- 실행을 시작할 때 계획한 리소스 id 순서를 저장하고, 처리할 때마다 pending에서 제거
+- 주기적 체크포인트와 실행 종료 시 저장 (원자적) → 작업이 강제 종료돼도 마지막 체크포인트부터 재개
+- 다음 실행은 같은 모드의 커서가 남아 있으면 새로 계획하지 않고 pending부터 처리
+  (예: 매주 150분씩 --full을 돌려도 몇 번에 걸쳐 전체를 한 바퀴 갱신)
+- 모두 처리하면 pending이 빈 완료 상태로 남음 (워크플로우가 항상 같은 파일을 커밋하도록)
+usage:
+    python crawl_cursor.py               # 커서 현황
+    python crawl_cursor.py --reset       # 커서 초기화 (다음 실행은 새로 계획)
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+
+import config
+
+CURSOR_PATH = config.DATA_DIR / "crawl_cursor.json"
+
+
+class CrawlCursor:
+    """모드별 남은 작업 목록"""
+
+    def __init__(self, path=CURSOR_PATH):
+        self.path = path
+        self.state = {}
+        if path.exists():
+            try:
+                self.state = json.loads(path.read_text(encoding='utf-8') or '{}')
+            except json.JSONDecodeError:
+                self.state = {}
+        self._pending = set(self.state.get('pending', []))
+
+    def __len__(self):
+        return len(self._pending)
+
+    def can_resume(self, mode):
+        """같은 모드의 끝나지 않은 커서가 있는지"""
+        return self.state.get('mode') == mode and bool(self._pending)
+
+    def resume(self, resources):
+        """남은 작업 → 리소스 인덱스 (계획했던 순서, 그 사이 사라진 리소스는 커서에서도 제거)"""
+        position = {rid: i for i, rid in enumerate(self.state.get('pending', []))}
+        indices = [i for i, r in enumerate(resources)
+                   if r.get('id') in position and r.get('is_active', 1) != 0]
+        self._pending = {resources[i].get('id') for i in indices}
+        return sorted(indices, key=lambda i: position[resources[i].get('id')])
+
+    def start(self, mode, resources, indices):
+        """새 계획 기록"""
+        now = datetime.now().isoformat()
+        pending = [resources[i].get('id') for i in indices]
+        self.state = {
+            'mode': mode,
+            'planned_at': now,
+            'updated_at': now,
+            'planned': len(pending),
+            'runs': 0,
+            'pending': pending,
+        }
+        self._pending = set(pending)
+
+    def extend(self, resources, indices):
+        """남은 계획 뒤에 새 대상 추가"""
+        for i in indices:
+            rid = resources[i].get('id')
+            if rid not in self._pending:
+                self.state['pending'].append(rid)
+                self._pending.add(rid)
+        self.state['planned'] = self.state.get('planned', 0) + len(indices)
+
+    def begin_run(self):
+        self.state['runs'] = self.state.get('runs', 0) + 1
+
+    def mark_done(self, resource_id):
+        """처리 완료 (성공/실패 모두 - 실패는 재시도 큐가 맡음)"""
+        self._pending.discard(resource_id)
+
+    def remaining(self):
+        return len(self._pending)
+
+    def save(self):
+        """원자적 저장 (pending은 계획 순서 유지)"""
+        if not self.state:
+            return
+        self.state['pending'] = [rid for rid in self.state.get('pending', []) if rid in self._pending]
+        self.state['updated_at'] = datetime.now().isoformat()
+        if not self._pending:
+            self.state.setdefault('completed_at', self.state['updated_at'])
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+    def reset(self):
+        self.state = {}
+        self._pending = set()
+        if self.path.exists():
+            self.path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="📍 크롤링 커서 (시간 예산 실행 이어받기)")
+    parser.add_argument('--reset', action='store_true', help='커서 초기화')
+    args = parser.parse_args()
+
+    cursor = CrawlCursor()
+    if args.reset:
+        cursor.reset()
+        print(f"🗑️  커서 초기화: {CURSOR_PATH}")
+        return
+    if not cursor.state:
+        print("커서 없음 (다음 실행은 새로 계획)")
+        return
+
+    state = cursor.state
+    done = state.get('planned', 0) - len(cursor)
+    print(f"📍 모드: {state.get('mode')}, 계획: {state.get('planned_at', '')[:16]}, 실행 {state.get('runs', 0)}회")
+    print(f"   진행: {done}/{state.get('planned', 0)}, 남음 {len(cursor)}개")
+    if state.get('completed_at'):
+        print(f"   완료: {state['completed_at'][:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+크롤링 계측 - 단계별 시간/바이트 히스토그램과 카운터, 실행 끝에 기계가 읽는 리포트 출력
+- 단계: http(요청), parse(HTML 추출), nav(page.goto), ready(렌더 대기), evaluate(EXTRACT_JS),
+  apply(apply_data), journal(저널 기록), resource(리소스 하나 전체), save(최종 저장)
+- data/crawl_report.json: 요약 통계 (p50/p95, 처리량, 에러 종류별 개수)
+- data/crawl_metrics.prom: Prometheus 텍스트 형식 (node_exporter textfile collector 등)
+usage:
+    python crawl_metrics.py              # 마지막 리포트를 표로 출력
+    python crawl_metrics.py --markdown   # GitHub Actions 요약용 마크다운
+"""
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import config
+
+REPORT_PATH = config.DATA_DIR / "crawl_report.json"
+PROMETHEUS_PATH = config.DATA_DIR / "crawl_metrics.prom"
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTES_BUCKETS = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+STAGES = ('http', 'parse', 'nav', 'ready', 'evaluate', 'apply', 'journal', 'resource', 'save')
+
+# 카운터 이름 → Prometheus 레이블 이름
+COUNTER_LABELS = {'results': 'result', 'paths': 'path', 'errors': 'kind', 'retries': 'stage'}
+
+
+def percentile(values, pct):
+    """최근접 순위 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Histogram:
+    """누적 버킷 + 원본 값 (실행당 수천 개 수준이라 원본도 보관)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.values = []
+
+    def observe(self, value):
+        self.values.append(value)
+
+    def summary(self):
+        values = self.values
+        if not values:
+            return {'count': 0}
+        return {
+            'count': len(values),
+            'sum': round(sum(values), 4),
+            'mean': round(sum(values) / len(values), 4),
+            'p50': round(percentile(values, 50), 4),
+            'p95': round(percentile(values, 95), 4),
+            'max': round(max(values), 4),
+        }
+
+    def bucket_counts(self):
+        """[(le, 누적 개수)] - 마지막은 +Inf"""
+        counts = [(le, sum(1 for v in self.values if v <= le)) for le in self.buckets]
+        return counts + [('+Inf', len(self.values))]
+
+
+class CrawlMetrics:
+    """크롤링 한 번의 계측값"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._start = time.monotonic()
+        self.stages = {}
+        self.bytes = {}
+        self.counters = {}
+
+    # ─── 수집 ────────────────────────────────────────────────
+    def observe(self, stage, seconds):
+        self.stages.setdefault(stage, Histogram(SECONDS_BUCKETS)).observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe_bytes(self, source, size):
+        self.bytes.setdefault(source, Histogram(BYTES_BUCKETS)).observe(size)
+
+    def count(self, name, label, n=1):
+        """카운터 증가 (예: count('errors', 'http2'), count('paths', 'http'))"""
+        group = self.counters.setdefault(name, {})
+        group[label] = group.get(label, 0) + n
+
+    def record_timings(self, timings):
+        """fetch_and_extract/extract_data가 채운 timings dict 반영"""
+        for stage in STAGES:
+            if stage in timings:
+                self.observe(stage, timings[stage])
+        if timings.get('http_bytes'):
+            self.observe_bytes('http', timings['http_bytes'])
+        if timings.get('retries'):
+            self.count('retries', 'navigation', timings['retries'])
+
+    def percentile(self, stage, pct):
+        hist = self.stages.get(stage)
+        return percentile(hist.values, pct) if hist else None
+
+    # ─── 출력 ────────────────────────────────────────────────
+    def report(self, extra=None):
+        """JSON 리포트 dict"""
+        elapsed = time.monotonic() - self._start
+        results = self.counters.get('results', {})
+        processed = sum(results.values())
+        report = {
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'elapsed_sec': round(elapsed, 2),
+            'processed': processed,
+            'throughput_per_sec': round(processed / elapsed, 4) if elapsed > 0 else 0,
+            'counters': self.counters,
+            'stages': {name: hist.summary() for name, hist in sorted(self.stages.items())},
+            'bytes': {name: hist.summary() for name, hist in sorted(self.bytes.items())},
+        }
+        if extra:
+            report.update(extra)
+        return report
+
+    def prometheus(self, report):
+        """Prometheus 텍스트 형식"""
+        lines = []
+
+        def histogram(name, help_text, label, hists):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(hists.items()):
+                for le, count in hist.bucket_counts():
+                    lines.append(f'{name}_bucket{{{label}="{key}",le="{le}"}} {count}')
+                lines.append(f'{name}_sum{{{label}="{key}"}} {sum(hist.values):.6f}')
+                lines.append(f'{name}_count{{{label}="{key}"}} {len(hist.values)}')
+
+        histogram('crawl_stage_seconds', 'Time spent per crawl stage.', 'stage', self.stages)
+        histogram('crawl_page_bytes', 'Page size per fetch source.', 'source', self.bytes)
+
+        for name, group in sorted(self.counters.items()):
+            metric = f"crawl_{name}_total"
+            label = COUNTER_LABELS.get(name, 'label')
+            lines.append(f"# TYPE {metric} counter")
+            for key, value in sorted(group.items()):
+                lines.append(f'{metric}{{{label}="{key}"}} {value}')
+
+        lines.append("# TYPE crawl_throughput_per_second gauge")
+        lines.append(f"crawl_throughput_per_second {report['throughput_per_sec']}")
+        lines.append("# TYPE crawl_elapsed_seconds gauge")
+        lines.append(f"crawl_elapsed_seconds {report['elapsed_sec']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, extra=None, report_path=REPORT_PATH, prometheus_path=PROMETHEUS_PATH):
+        """JSON 리포트와 Prometheus 파일 저장 (원자적)
+
+        Returns:
+            리포트 dict
+        """
+        report = self.report(extra)
+        for path, text in ((report_path, json.dumps(report, ensure_ascii=False, indent=2)),
+                           (prometheus_path, self.prometheus(report))):
+            tmp = path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp, path)
+        return report
+
+
+def _fmt_sec(value):
+    return '-' if value is None else f"{value:.2f}s"
+
+
+def format_markdown(report):
+    """리포트 → GitHub Actions 요약용 마크다운"""
+    results = report.get('counters', {}).get('results', {})
+    lines = [
+        "| Metric | Value |",
+        "|--------|-------|",
+        f"| Processed | {report['processed']} (success {results.get('success', 0)}, "
+        f"failed {results.get('failed', 0)}) |",
+        f"| Elapsed | {report['elapsed_sec'] / 60:.1f} min |",
+        f"| Throughput | {report['throughput_per_sec']:.3f} resources/s |",
+    ]
+    paths = report.get('counters', {}).get('paths', {})
+    if paths:
+        lines.append(f"| Paths | {', '.join(f'{k} {v}' for k, v in sorted(paths.items()))} |")
+    errors = report.get('counters', {}).get('errors', {})
+    if errors:
+        lines.append(f"| Errors | {', '.join(f'{k} {v}' for k, v in sorted(errors.items()))} |")
+
+    lines += ["", "| Stage | Count | p50 | p95 | Max |", "|-------|-------|-----|-----|-----|"]
+    for name, s in report.get('stages', {}).items():
+        if s.get('count'):
+            lines.append(f"| {name} | {s['count']} | {_fmt_sec(s['p50'])} | {_fmt_sec(s['p95'])} | "
+                         f"{_fmt_sec(s['max'])} |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="📈 크롤링 실행 리포트")
+    parser.add_argument('--markdown', action='store_true', help='마크다운 표로 출력')
+    args = parser.parse_args()
+
+    if not REPORT_PATH.exists():
+        print(f"리포트가 없습니다: {REPORT_PATH}")
+        return
+    report = json.loads(REPORT_PATH.read_text(encoding='utf-8'))
+    if args.markdown:
+        print(format_markdown(report))
+        return
+
+    print(f"📈 {report['started_at']} ~ {report['finished_at']} ({report['elapsed_sec'] / 60:.1f}분)")
+    print(f"   처리: {report['processed']}개, {report['throughput_per_sec']:.3f}개/초")
+    for name, group in sorted(report.get('counters', {}).items()):
+        print(f"   {name}: {group}")
+    for name, s in report.get('stages', {}).items():
+        if s.get('count'):
+            print(f"   {name:9s} {s['count']:5d}회  p50 {_fmt_sec(s['p50'])}  p95 {_fmt_sec(s['p95'])}")
+
+
+if __name__ == "__main__":
+    main()
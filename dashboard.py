@@ -7,6 +7,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from database import MinecraftEducationDB
+from facets import FacetIndex
+from thumbnails import local_thumbnail
 import json
 from pathlib import Path
 import google.generativeai as genai
@@ -79,30 +81,71 @@ def load_data():
         return pd.DataFrame(data)
 
     # DB에서 로드
-    with MinecraftEducationDB() as db:
+    with MinecraftEducationDB(read_only=True) as db:
         resources = db.get_all_resources()
         return pd.DataFrame(resources)
 
 
 @st.cache_data
-def get_statistics(df):
-    """통계 계산"""
-    stats = {
-        'total': len(df),
-        'by_type': df['type'].value_counts().to_dict(),
-        'by_subject': {}
-    }
+def load_thumbnail_index():
+    """로컬 썸네일 미러 인덱스 (thumbnails.py로 생성, 없으면 빈 dict)"""
+    index_path = Path('data/thumbnails.json')
+    if not index_path.exists():
+        return {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def thumbnail_img(thumbnail_url):
+    """썸네일 <img> - 로컬 WebP/JPEG 변형이 있으면 사용, 없으면 원본 URL"""
+    style = "width: 100%; height: 150px; object-fit: cover; border-radius: 8px; margin-bottom: 0.5rem;"
+    entry = load_thumbnail_index().get(thumbnail_url)
+    local = local_thumbnail(entry) if entry else None
+    if local and all(Path('static/thumbnails', u.rsplit('/', 1)[-1]).exists() for u in local.values()):
+        return (f'<picture><source srcset="{local["webp"]}" type="image/webp" />'
+                f'<img src="{local["jpg"]}" loading="lazy" style="{style}" /></picture>')
+    return f'<img src="{thumbnail_url}" loading="lazy" style="{style}" />'
+
+
+def format_size(size):
+    """바이트 → 읽기 쉬운 크기"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def download_link_html(resource):
+    """다운로드 링크 - link_probe.py 결과가 있으면 크기/끊김 표시"""
+    download_url = resource.get('download_url')
+    if not isinstance(download_url, str) or not download_url:
+        return ''
+    info = resource.get('download_info')
+    info = info if isinstance(info, dict) else {}
+    if info.get('dead'):
+        return (f'<span style="color: #C62828; display: inline-block; margin: 0.5rem 0 0 1rem;">'
+                f'⚠️ 다운로드 링크 끊김 (HTTP {info.get("status")})</span>')
+    size = f" ({format_size(info['size'])})" if info.get('size') else ''
+    return (f'<a href="{download_url}" target="_blank" style="color: #2E7D32; text-decoration: none; '
+            f'display: inline-block; margin: 0.5rem 0 0 1rem;">⬇️ Download{size}</a>')
+
+
+@st.cache_resource
+def load_facets(df):
+    """패싯 색인 (색인 위치 = df 행 순서)"""
+    return FacetIndex.from_resources(df.to_dict('records'))
 
-    # 과목별 통계 (subjects는 쉼표로 구분된 문자열)
-    all_subjects = []
-    for subjects_str in df['subjects'].dropna():
-        if subjects_str:
-            all_subjects.extend(subjects_str.split(','))
 
-    subject_counts = pd.Series(all_subjects).value_counts()
-    stats['by_subject'] = subject_counts.to_dict()
-
-    return stats
+def get_statistics(df):
+    """통계 계산 (패싯 색인에서 타입/과목/태그 개수를 한 번에)"""
+    counts = load_facets(df).counts()
+    return {
+        'total': counts['total'],
+        'by_type': counts['type'],
+        'by_subject': counts['subject'],
+        'by_tag': counts['tag'],
+    }
 
 
 def create_type_chart(stats):
@@ -177,7 +220,7 @@ def display_resource_card(resource):
     thumbnail_url = resource.get('thumbnail_url', '')
     thumbnail_html = ""
     if thumbnail_url and thumbnail_url != 'None':
-        thumbnail_html = f'<img src="{thumbnail_url}" style="width: 100%; height: 150px; object-fit: cover; border-radius: 8px; margin-bottom: 0.5rem;" />'
+        thumbnail_html = thumbnail_img(thumbnail_url)
 
     # 업데이트 날짜
     updated = resource.get('updated', '')
@@ -199,6 +242,7 @@ def display_resource_card(resource):
         <a href="{resource['url']}" target="_blank" style="color: #1976D2; text-decoration: none; display: inline-block; margin-top: 0.5rem;">
             🔗 View Resource
         </a>
+        {download_link_html(resource)}
     </div>
     """
 
@@ -416,12 +460,7 @@ def main():
         )
 
         # 태그 필터
-        all_tags = set()
-        for tags_str in df['tags'].dropna():
-            if tags_str:
-                all_tags.update([tag.strip() for tag in str(tags_str).split(',')])
-        all_tags = sorted(list(all_tags))
-
+        all_tags = sorted(stats['by_tag'].keys())
         tag_filter = st.sidebar.multiselect(
             "태그 선택",
             options=all_tags,
@@ -434,26 +473,13 @@ def main():
             options=["최신순", "제목순", "타입순", "업데이트 날짜순"]
         )
 
-        # 데이터 필터링
-        filtered_df = df.copy()
-
-        # 타입 필터 적용
-        if type_filter:
-            filtered_df = filtered_df[filtered_df['type'].isin(type_filter)]
-
-        # 과목 필터 적용
-        if subject_filter:
-            mask = filtered_df['subjects'].apply(
-                lambda x: any(subj in str(x) for subj in subject_filter) if pd.notna(x) else False
-            )
-            filtered_df = filtered_df[mask]
-
-        # 태그 필터 적용
-        if tag_filter:
-            mask = filtered_df['tags'].apply(
-                lambda x: any(tag in str(x) for tag in tag_filter) if pd.notna(x) else False
-            )
-            filtered_df = filtered_df[mask]
+        # 타입/과목/태그 필터 적용 (패싯 색인 - 같은 패싯 안에서는 OR, 패싯끼리는 AND)
+        positions = load_facets(df).positions({
+            'type': type_filter,
+            'subject': subject_filter,
+            'tag': tag_filter,
+        })
+        filtered_df = df.iloc[positions]
 
         # 검색 필터 적용
         if search_query:
@@ -1,29 +1,114 @@
 """
 Database operations for Minecraft Education resources
 """
-import sqlite3
+import hashlib
 import json
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from itertools import islice
+from typing import List, Dict, Optional, Any, Iterable, Tuple
 from pathlib import Path
 import config
+from canonical_url import canonical_url, resource_id as url_resource_id
+from db_pool import get_manager
+import search_index
+
+# 리소스 필드 → (이름 테이블, 연결 테이블, 연결 컬럼)
+LINK_TABLES = {
+    'subjects': ('subjects', 'resource_subjects', 'subject_id'),
+    'tags': ('tags', 'resource_tags', 'tag_id'),
+    'ages': ('grade_levels', 'resource_grades', 'grade_id'),
+    'skills': ('skills', 'resource_skills', 'skill_id'),
+    'languages': ('languages', 'resource_languages', 'language_id'),
+}
+
+# 패싯 이름 → 리소스 필드 ('type'은 resources 컬럼, 나머지는 LINK_TABLES)
+FACETS = {
+    'type': 'type',
+    'subject': 'subjects',
+    'tag': 'tags',
+    'age': 'ages',
+    'skill': 'skills',
+    'language': 'languages',
+}
+# 연결 테이블로 저장되는 패싯 → (이름 테이블, 연결 테이블, 연결 컬럼)
+LINK_FACETS = {facet: LINK_TABLES[field] for facet, field in FACETS.items() if field in LINK_TABLES}
+
+
+def split_names(value) -> List[str]:
+    """리스트 또는 쉼표로 구분된 문자열(resources_enhanced.json 형식) → 이름 리스트"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return list(dict.fromkeys(name.strip() for name in value if name and name.strip()))
+
+
+# DB에 저장되는 필드 (content_hash 계산 대상)
+HASHED_FIELDS = ('title', 'type', 'description', 'short_description', 'full_description', 'thumbnail_url',
+                 'details', 'is_active')
+
+# 예전 스키마로 만든 DB에 추가할 컬럼
+MIGRATION_COLUMNS = {'resources': {'content_hash': 'TEXT', 'full_description': 'TEXT', 'doc_id': 'INTEGER'}}
+
+
+def content_hash(resource: Dict[str, Any]) -> str:
+    """DB에 저장되는 내용의 해시 (바뀌지 않은 리소스는 동기화에서 건너뜀)"""
+    url = canonical_url(resource.get('url', ''))
+    payload = {field: resource.get(field) for field in HASHED_FIELDS}
+    payload['is_active'] = int(payload['is_active'] if payload['is_active'] is not None else 1)
+    payload['url'] = url
+    payload['links'] = {field: split_names(resource.get(field)) for field in LINK_TABLES}
+    payload['aliases'] = sorted({*resource.get('url_aliases', []), resource.get('url')} - {url, None})
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
 
 
 class MinecraftEducationDB:
-    def __init__(self, db_path: Path = config.DB_PATH):
+    def __init__(self, db_path: Path = config.DB_PATH, read_only: bool = False):
         self.db_path = db_path
+        self.read_only = read_only
         self.connection = None
+        self._manager = None
+        self._name_ids = None
 
     def connect(self):
-        """데이터베이스 연결"""
-        self.connection = sqlite3.connect(self.db_path)
-        self.connection.row_factory = sqlite3.Row
+        """데이터베이스 연결 (db_pool의 공유 연결)
+
+        read_only=True면 이 스레드의 읽기 전용 연결을 쓰고 (쓰기 중에도 막히지 않음),
+        아니면 하나뿐인 쓰기 연결을 씁니다. 쓰기 락은 쓰기 메서드가 트랜잭션마다 잡으므로
+        (transaction()) 열어 둔 객체나 다른 스레드의 close()가 다른 쓰기를 막지 않습니다.
+        """
+        manager = get_manager(self.db_path)
+        if self.read_only:
+            self.connection = manager.reader()
+        else:
+            self._manager = manager
+            self.connection = manager.writer_connection()
         return self.connection
 
     def close(self):
-        """데이터베이스 연결 종료"""
-        if self.connection:
-            self.connection.close()
+        """데이터베이스 연결 반납 (연결은 풀에 남아 재사용)"""
+        if self.connection is None:
+            return
+        if self._manager is not None:
+            # transaction() 밖에서 직접 쓰고 커밋하지 않은 작업은 롤백
+            # (다른 스레드의 트랜잭션은 끝날 때까지 기다리고, 이 스레드의 바깥 블록 안이면 그대로 둠)
+            self._manager.acquire_writer()
+            self._manager.release_writer(rollback=True)
+            self._manager = None
+        self.connection = None
+
+    @contextmanager
+    def transaction(self):
+        """쓰기 트랜잭션 - 이 블록 동안만 풀의 쓰기 락을 잡음 (끝나면 커밋, 예외면 롤백)"""
+        if self._manager is None:
+            # 풀을 거치지 않고 붙인 연결 (db_bench의 기존 방식 비교)
+            with self.connection:
+                yield self.connection
+            return
+        with self._manager.writer() as conn:
+            yield conn
 
     def __enter__(self):
         self.connect()
@@ -40,87 +125,315 @@ class MinecraftEducationDB:
         with open(config.DB_SCHEMA_PATH, 'r', encoding='utf-8') as f:
             schema_sql = f.read()
 
-        self.connection.executescript(schema_sql)
-        self.connection.commit()
+        with self.transaction() as conn:
+            conn.executescript(schema_sql)
+            self._migrate()
+            self._install_facet_triggers()
+            if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM facet_counts)").fetchone()[0]:
+                # 패싯 집계가 생기기 전에 적재한 DB
+                self.rebuild_facet_counts()
+            if search_index.ensure_index(conn):
+                # 새 색인 - 이미 있는 리소스를 채움
+                search_index.rebuild(conn)
         print(f"✅ Database initialized at {self.db_path}")
 
-    def insert_resource(self, resource: Dict[str, Any]) -> str:
-        """리소스 삽입"""
-        cursor = self.connection.cursor()
-
-        # Generate ID from URL
-        resource_id = self._generate_id(resource['url'])
-
-        cursor.execute("""
-            INSERT OR REPLACE INTO resources
-            (id, title, type, description, short_description, url, thumbnail_url, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            resource_id,
-            resource['title'],
-            resource['type'],
-            resource.get('description', ''),
-            resource.get('short_description', ''),
-            resource['url'],
-            resource.get('thumbnail_url'),
-            datetime.now().isoformat()
-        ))
-
-        # Insert subjects
-        if 'subjects' in resource:
-            self._insert_subjects(cursor, resource_id, resource['subjects'])
-
-        # Insert tags
-        if 'tags' in resource:
-            self._insert_tags(cursor, resource_id, resource['tags'])
-
-        # Insert details
-        if 'details' in resource:
-            self._insert_details(cursor, resource_id, resource['details'])
-
-        self.connection.commit()
-        return resource_id
-
-    def _generate_id(self, url: str) -> str:
-        """URL에서 고유 ID 생성"""
-        # Extract the last part of URL as ID
-        parts = url.rstrip('/').split('/')
-        return parts[-1]
-
-    def _insert_subjects(self, cursor, resource_id: str, subjects: List[str]):
-        """과목 삽입"""
-        for subject in subjects:
-            # Insert subject if not exists
-            cursor.execute(
-                "INSERT OR IGNORE INTO subjects (name) VALUES (?)",
-                (subject,)
-            )
-
-            # Get subject ID
-            cursor.execute("SELECT id FROM subjects WHERE name = ?", (subject,))
-            subject_id = cursor.fetchone()[0]
+    def _migrate(self):
+        """예전 스키마로 만든 DB에 빠진 컬럼 추가, 삭제된 리소스에 남은 행 정리"""
+        for table, columns in MIGRATION_COLUMNS.items():
+            existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in columns.items():
+                if column not in existing:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        # doc_id가 없던 DB는 지금 rowid로 채움 (검색 색인 행 번호가 rowid였으므로 다시 색인할 필요 없음)
+        offset = self.connection.execute("SELECT COALESCE(MAX(doc_id), 0) FROM resources").fetchone()[0]
+        self.connection.execute("UPDATE resources SET doc_id = rowid + ? WHERE doc_id IS NULL", (offset,))
+        self.connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_resources_doc_id ON resources(doc_id)")
+        # 정리 트리거(resources_cleanup_ad)가 생기기 전에 URL이 바뀌어 지워진 id의 상세/별칭/연결
+        for table in ('resource_details', 'resource_aliases', *(link for _, link, _ in LINK_TABLES.values())):
+            self.connection.execute(f"DELETE FROM {table} WHERE resource_id NOT IN (SELECT id FROM resources)")
+
+    def _install_facet_triggers(self):
+        """facet_counts/facet_state를 증분 갱신하는 트리거 (활성 리소스만 집계)
+
+        - 연결 테이블 INSERT/DELETE: 리소스가 활성이면 해당 값 ±1
+        - resources INSERT/UPDATE(is_active, type): 타입 ±1, 활성 여부가 바뀌면 연결된 값 모두 ±1
+        - resources DELETE: 연결 행을 먼저 지우고(위 트리거로 -1) 타입 -1
+        - 모두 facet_state.version을 올리고 바뀐 리소스를 facet_changes에 그 세대로 기록
+        """
+        def bump(resource_id):
+            return f"""
+                UPDATE facet_state SET version = version + 1 WHERE id = 1;
+                INSERT INTO facet_changes (resource_id, version)
+                SELECT {resource_id}, version FROM facet_state WHERE id = 1
+                ON CONFLICT(resource_id) DO UPDATE SET version = excluded.version;"""
+
+        upsert = "ON CONFLICT(facet, value) DO UPDATE SET count = count + excluded.count;"
+        statements = []
+
+        for facet, (name_table, link_table, link_column) in LINK_FACETS.items():
+            for event, row, delta in (('INSERT', 'new', 1), ('DELETE', 'old', -1)):
+                statements.append(f"""
+                    CREATE TRIGGER facet_{link_table}_{event[0].lower()}
+                    AFTER {event} ON {link_table}
+                    WHEN (SELECT is_active FROM resources WHERE id = {row}.resource_id)
+                    BEGIN
+                        INSERT INTO facet_counts (facet, value, count)
+                        SELECT '{facet}', name, {delta} FROM {name_table} WHERE id = {row}.{link_column}
+                        {upsert}
+                        {bump(f'{row}.resource_id')}
+                    END
+                """)
+
+        relinks = '\n'.join(f"""
+                        INSERT INTO facet_counts (facet, value, count)
+                        SELECT '{facet}', n.name, CASE WHEN new.is_active THEN 1 ELSE -1 END
+                        FROM {link_table} l JOIN {name_table} n ON n.id = l.{link_column}
+                        WHERE l.resource_id = new.id AND (old.is_active != 0) IS NOT (new.is_active != 0)
+                        {upsert}""" for facet, (name_table, link_table, link_column) in LINK_FACETS.items())
+        statements.append(f"""
+            CREATE TRIGGER facet_resources_i AFTER INSERT ON resources
+            WHEN new.is_active
+            BEGIN
+                INSERT INTO facet_counts (facet, value, count) VALUES ('type', new.type, 1)
+                {upsert}
+                {bump('new.id')}
+            END
+        """)
+        statements.append(f"""
+            CREATE TRIGGER facet_resources_u AFTER UPDATE OF is_active, type ON resources
+            WHEN (old.is_active != 0) IS NOT (new.is_active != 0) OR old.type IS NOT new.type
+            BEGIN
+                INSERT INTO facet_counts (facet, value, count) SELECT 'type', old.type, -1 WHERE old.is_active
+                {upsert}
+                INSERT INTO facet_counts (facet, value, count) SELECT 'type', new.type, 1 WHERE new.is_active
+                {upsert}
+                {relinks}
+                {bump('new.id')}
+            END
+        """)
+        statements.append(f"""
+            CREATE TRIGGER facet_resources_d BEFORE DELETE ON resources
+            BEGIN
+                {' '.join(f"DELETE FROM {link_table} WHERE resource_id = old.id;" for _, link_table, _ in LINK_FACETS.values())}
+                INSERT INTO facet_counts (facet, value, count) SELECT 'type', old.type, -1 WHERE old.is_active
+                {upsert}
+                {bump('old.id')}
+            END
+        """)
+        # 트리거 본문이 바뀐 DB도 있으니 매번 지우고 다시 만듦
+        for (name,) in self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name GLOB 'facet_*'").fetchall():
+            self.connection.execute(f"DROP TRIGGER {name}")
+        for statement in statements:
+            self.connection.execute(statement)
+
+    def rebuild_facet_counts(self):
+        """facet_counts를 처음부터 다시 집계 (트리거가 없던 DB용)"""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM facet_counts")
+            conn.execute("""
+                INSERT INTO facet_counts (facet, value, count)
+                SELECT 'type', type, COUNT(*) FROM resources WHERE is_active GROUP BY type
+            """)
+            for facet, (name_table, link_table, link_column) in LINK_FACETS.items():
+                conn.execute(f"""
+                    INSERT INTO facet_counts (facet, value, count)
+                    SELECT '{facet}', n.name, COUNT(*)
+                    FROM {link_table} l
+                    JOIN resources r ON r.id = l.resource_id
+                    JOIN {name_table} n ON n.id = l.{link_column}
+                    WHERE r.is_active
+                    GROUP BY n.name
+                """)
+            conn.execute("UPDATE facet_state SET version = version + 1 WHERE id = 1")
 
-            # Link resource to subject
-            cursor.execute(
-                "INSERT OR IGNORE INTO resource_subjects (resource_id, subject_id) VALUES (?, ?)",
-                (resource_id, subject_id)
+    def insert_resource(self, resource: Dict[str, Any]) -> str:
+        """리소스 삽입 (한 개 - 바로 커밋)"""
+        return self.insert_resources([resource])[0]
+
+    def insert_resources(self, resources: Iterable[Dict[str, Any]], batch_size: int = 5000) -> List[str]:
+        """리소스 대량 삽입 - 전체를 트랜잭션 하나로, 배치마다 executemany
+
+        resources는 리스트가 아니어도 됩니다 (제너레이터를 batch_size개씩 읽어 처리).
+        과목/태그/연령/스킬은 이름→id 캐시로 찾고, 처음 보는 이름만 INSERT합니다.
+        이미 있는 리소스는 교체되고 연결(과목/태그/...)도 새로 씁니다.
+
+        Returns:
+            삽입한 리소스 id 리스트 (입력 순서)
+        """
+        ids = []
+        iterator = iter(resources)
+        try:
+            with self.transaction() as conn:
+                if self._name_ids is None:
+                    self._load_name_ids(conn)
+                cursor = conn.cursor()
+                while True:
+                    batch = list(islice(iterator, batch_size))
+                    if not batch:
+                        break
+                    ids.extend(self._insert_batch(cursor, batch))
+        except BaseException:
+            # 롤백된 새 이름의 id가 캐시에 남지 않도록
+            self._name_ids = None
+            raise
+        return ids
+
+    def _load_name_ids(self, conn):
+        """이름 → id 캐시 (테이블마다 한 번만 읽음)"""
+        self._name_ids = {}
+        for name_table, _, _ in LINK_TABLES.values():
+            rows = conn.execute(f"SELECT name, id FROM {name_table}")
+            self._name_ids[name_table] = {name: name_id for name, name_id in rows}
+
+    def _name_id(self, cursor, name_table: str, name: str) -> int:
+        cache = self._name_ids[name_table]
+        name_id = cache.get(name)
+        if name_id is None:
+            cursor.execute(f"INSERT OR IGNORE INTO {name_table} (name) VALUES (?)", (name,))
+            if cursor.rowcount:
+                name_id = cursor.lastrowid
+            else:
+                # 캐시를 읽은 뒤 다른 연결이 추가한 이름
+                name_id = cursor.execute(f"SELECT id FROM {name_table} WHERE name = ?", (name,)).fetchone()[0]
+            cache[name] = name_id
+        return name_id
+
+    def _insert_batch(self, cursor, batch: List[Dict[str, Any]]) -> List[str]:
+        """배치 하나 쓰기 (insert_resources의 트랜잭션 안에서 - 커밋도 거기서)"""
+        now = datetime.now().isoformat()
+        rows, ids, aliases, details = [], [], [], []
+        links = {field: [] for field in LINK_TABLES}
+        for resource in batch:
+            # 크롤러/저널과 같은 규칙의 id와 정규 URL
+            url = canonical_url(resource['url'])
+            resource_id = resource.get('id') or url_resource_id(url)
+            ids.append(resource_id)
+            rows.append((
+                resource_id,
+                resource['title'],
+                resource['type'],
+                resource.get('description', ''),
+                resource.get('short_description', ''),
+                resource.get('full_description'),
+                url,
+                resource.get('thumbnail_url'),
+                resource.get('crawled_at') or now,
+                now,
+                resource.get('is_active', 1),
+                content_hash(resource),
+            ))
+            for field, (name_table, _, _) in LINK_TABLES.items():
+                for name in split_names(resource.get(field)):
+                    links[field].append((resource_id, self._name_id(cursor, name_table, name)))
+
+            # URL aliases (원래 URL이 정규 URL과 다르면 함께 보관)
+            for alias in {*resource.get('url_aliases', []), resource['url']} - {url}:
+                aliases.append((alias, resource_id))
+            if 'details' in resource:
+                details.append((resource_id, resource['details']))
+
+        # 같은 URL을 쓰던 다른 id의 행은 정리 (url은 UNIQUE)
+        cursor.executemany("DELETE FROM resources WHERE url = ? AND id != ?", [(row[6], row[0]) for row in rows])
+        # UPSERT - 새 행만 다음 doc_id를 받고, 기존 행은 doc_id를 유지한 채 UPDATE (검색 색인 행도 그대로)
+        next_doc_id = cursor.execute("SELECT COALESCE(MAX(doc_id), 0) + 1 FROM resources").fetchone()[0]
+        rows = [row + (next_doc_id + i,) for i, row in enumerate(rows)]
+        cursor.executemany("""
+            INSERT INTO resources
+            (id, title, type, description, short_description, full_description, url, thumbnail_url,
+             crawled_at, last_updated, is_active, content_hash, doc_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                type = excluded.type,
+                description = excluded.description,
+                short_description = excluded.short_description,
+                full_description = excluded.full_description,
+                url = excluded.url,
+                thumbnail_url = excluded.thumbnail_url,
+                last_updated = excluded.last_updated,
+                is_active = excluded.is_active,
+                content_hash = excluded.content_hash
+        """, rows)
+
+        id_rows = [(resource_id,) for resource_id in ids]
+        cursor.executemany("DELETE FROM resource_aliases WHERE resource_id = ?", id_rows)
+        for field, (_, link_table, link_column) in LINK_TABLES.items():
+            cursor.executemany(f"DELETE FROM {link_table} WHERE resource_id = ?", id_rows)
+            cursor.executemany(
+                f"INSERT OR IGNORE INTO {link_table} (resource_id, {link_column}) VALUES (?, ?)",
+                links[field]
             )
-
-    def _insert_tags(self, cursor, resource_id: str, tags: List[str]):
-        """태그 삽입"""
-        for tag in tags:
-            cursor.execute(
-                "INSERT OR IGNORE INTO tags (name) VALUES (?)",
-                (tag,)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO resource_aliases (alias_url, resource_id) VALUES (?, ?)", aliases
+        )
+        for resource_id, resource_details in details:
+            self._insert_details(cursor, resource_id, resource_details)
+        # 과목/태그/상세까지 쓴 뒤에 검색 색인 (트리거로는 이 순서를 맞출 수 없음)
+        search_index.index_resources(cursor, ids)
+        return ids
+
+    def sync_resources(self, resources: Iterable[Dict[str, Any]], dry_run: bool = False) -> Dict[str, int]:
+        """JSON 스냅샷과 DB 동기화 - 바뀐 리소스만 UPSERT, 스냅샷에서 사라진 리소스는 is_active = 0
+
+        id와 content_hash로 비교하므로 바뀐 것이 없으면 아무것도 쓰지 않습니다
+        (FTS도 UPSERT/비활성화된 행의 트리거로만 갱신).
+        비교부터 비활성화까지 트랜잭션 하나 (dry_run이면 쓰기 락을 잡지 않음).
+
+        Returns:
+            {'inserted', 'updated', 'unchanged', 'deactivated'}
+        """
+        with nullcontext(self.connection) if dry_run else self.transaction() as conn:
+            return self._sync(conn, resources, dry_run)
+
+    def _sync(self, conn, resources: Iterable[Dict[str, Any]], dry_run: bool) -> Dict[str, int]:
+        existing = {
+            row[0]: (row[1], row[2])
+            for row in conn.execute("SELECT id, content_hash, is_active FROM resources")
+        }
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deactivated': 0}
+        seen = set()
+
+        def changed():
+            for resource in resources:
+                url = canonical_url(resource['url'])
+                resource_id = resource.get('id') or url_resource_id(url)
+                seen.add(resource_id)
+                current = existing.get(resource_id)
+                if current is None:
+                    stats['inserted'] += 1
+                elif current[0] != content_hash(resource):
+                    stats['updated'] += 1
+                else:
+                    stats['unchanged'] += 1
+                    continue
+                yield resource
+
+        if dry_run:
+            for _ in changed():
+                pass
+        else:
+            self.insert_resources(changed())
+
+        vanished = [(rid,) for rid, (_, active) in existing.items() if rid not in seen and active]
+        stats['deactivated'] = len(vanished)
+        if vanished and not dry_run:
+            # content_hash도 비움 - 스냅샷에 다시 나타나면 해시가 달라 다시 쓰고 활성화됨
+            conn.executemany(
+                "UPDATE resources SET is_active = 0, content_hash = NULL, last_updated = ? WHERE id = ?",
+                [(datetime.now().isoformat(), rid) for (rid,) in vanished]
             )
+        return stats
 
-            cursor.execute("SELECT id FROM tags WHERE name = ?", (tag,))
-            tag_id = cursor.fetchone()[0]
-
-            cursor.execute(
-                "INSERT OR IGNORE INTO resource_tags (resource_id, tag_id) VALUES (?, ?)",
-                (resource_id, tag_id)
-            )
+    def find_resource_id(self, url: str) -> Optional[str]:
+        """URL(별칭 포함)로 리소스 id 찾기"""
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT id FROM resources WHERE url = ?", (canonical_url(url),))
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute("SELECT resource_id FROM resource_aliases WHERE alias_url = ?", (url,))
+            row = cursor.fetchone()
+        return row[0] if row else None
 
     def _insert_details(self, cursor, resource_id: str, details: Dict[str, Any]):
         """상세 정보 삽입"""
@@ -156,54 +469,54 @@ class MinecraftEducationDB:
 
         return [dict(row) for row in cursor.fetchall()]
 
-    def search_resources(self, query: str) -> List[Dict]:
-        """전체 텍스트 검색"""
-        cursor = self.connection.cursor()
-        cursor.execute("""
-            SELECT r.*,
-                   GROUP_CONCAT(DISTINCT s.name) as subjects
-            FROM resources r
-            JOIN resources_fts fts ON r.rowid = fts.rowid
-            LEFT JOIN resource_subjects rs ON r.id = rs.resource_id
-            LEFT JOIN subjects s ON rs.subject_id = s.id
-            WHERE resources_fts MATCH ?
-            GROUP BY r.id
-            ORDER BY rank
-        """, (query,))
-
-        return [dict(row) for row in cursor.fetchall()]
-
-    def get_statistics(self) -> Dict[str, Any]:
-        """통계 정보"""
-        cursor = self.connection.cursor()
-
-        stats = {}
-
-        # Total resources
-        cursor.execute("SELECT COUNT(*) FROM resources WHERE is_active = 1")
-        stats['total_resources'] = cursor.fetchone()[0]
-
-        # By type
-        cursor.execute("""
-            SELECT type, COUNT(*) as count
-            FROM resources
-            WHERE is_active = 1
-            GROUP BY type
+    def search_resources(self, query: str, limit: int = 20) -> List[Dict]:
+        """전체 텍스트 검색 (search_index - bm25 순, title_highlight/snippet 포함)"""
+        return search_index.search(self.connection, query, limit)
+
+    def rebuild_search_index(self, tokenizer: Optional[str] = None, full: bool = False) -> Dict[str, Any]:
+        """검색 색인 재구성 (기본: 바뀐 행만)"""
+        with self.transaction() as conn:
+            return search_index.rebuild(conn, tokenizer, full)
+
+    def optimize_search_index(self):
+        """검색 색인 세그먼트 병합"""
+        with self.transaction() as conn:
+            search_index.optimize(conn)
+
+    def facet_totals(self) -> Dict[str, Dict[str, int]]:
+        """활성 리소스의 패싯별 개수 (facet_counts 집계 테이블 - 개수 많은 순)"""
+        totals = {facet: {} for facet in FACETS}
+        rows = self.connection.execute("""
+            SELECT facet, value, count FROM facet_counts
+            WHERE count > 0
+            ORDER BY facet, count DESC, value
         """)
-        stats['by_type'] = {row['type']: row['count'] for row in cursor.fetchall()}
-
-        # By subject
-        cursor.execute("""
-            SELECT s.name, COUNT(*) as count
-            FROM subjects s
-            JOIN resource_subjects rs ON s.id = rs.subject_id
-            JOIN resources r ON rs.resource_id = r.id
-            WHERE r.is_active = 1
-            GROUP BY s.name
-            ORDER BY count DESC
-        """)
-        stats['by_subject'] = {row['name']: row['count'] for row in cursor.fetchall()}
+        for facet, value, count in rows:
+            totals.setdefault(facet, {})[value] = count
+        return totals
+
+    def facet_version(self) -> int:
+        """패싯이 바뀔 때마다 커지는 세대 번호"""
+        return self.connection.execute("SELECT version FROM facet_state WHERE id = 1").fetchone()[0]
+
+    def facet_changes(self, since: int, limit: int = -1) -> Tuple[int, List[str]]:
+        """(지금 세대, since 세대 이후 패싯이 바뀐 리소스 id - 지워졌거나 비활성이 된 리소스 포함, 최대 limit개)
+
+        쿼리 하나라 세대와 id가 같은 시점 기준 (바뀐 것이 없으면 facet_version()과 비용이 같음)
+        """
+        rows = self.connection.execute("""
+            SELECT s.version, c.resource_id FROM facet_state s
+            LEFT JOIN (SELECT resource_id FROM facet_changes WHERE version > ? LIMIT ?) c
+            WHERE s.id = 1
+        """, (since, limit)).fetchall()
+        return rows[0][0], [row[1] for row in rows if row[1] is not None]
 
+    def get_statistics(self) -> Dict[str, Any]:
+        """통계 정보 (facet_counts 집계 테이블 한 번 조회)"""
+        totals = self.facet_totals()
+        stats = {'total_resources': sum(totals['type'].values())}
+        for facet in FACETS:
+            stats[f"by_{facet}"] = totals[facet]
         return stats
 
     def export_to_json(self, output_path: Path):
@@ -217,8 +530,50 @@ class MinecraftEducationDB:
 
 
 if __name__ == "__main__":
-    # Test database initialization
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="🗄️ Minecraft Education DB")
+    parser.add_argument('--load', type=Path, metavar='JSON',
+                        help='리소스 JSON(예: data/resources_enhanced.json)을 한 번에 적재')
+    parser.add_argument('--sync', type=Path, metavar='JSON',
+                        help='리소스 JSON과 동기화 (바뀐 리소스만 갱신, 사라진 리소스는 비활성화)')
+    parser.add_argument('--dry-run', action='store_true', help='--sync에서 바뀔 개수만 출력')
+    parser.add_argument('--reindex', action='store_true',
+                        help='검색 색인 재구성 (바뀌거나 빠진 리소스만)')
+    parser.add_argument('--tokenizer', choices=sorted(search_index.TOKENIZERS),
+                        help='검색 색인 토크나이저 변경 (전체 재색인)')
+    parser.add_argument('--optimize', action='store_true', help='검색 색인 세그먼트 병합')
+    parser.add_argument('--search', metavar='QUERY', help='검색해서 상위 10개 출력')
+    args = parser.parse_args()
+
     with MinecraftEducationDB() as db:
         db.initialize_schema()
+        if args.load:
+            with open(args.load, 'r', encoding='utf-8') as f:
+                resources = json.load(f)
+            start = time.perf_counter()
+            count = len(db.insert_resources(resources))
+            print(f"✅ Loaded {count} resources in {time.perf_counter() - start:.2f}s")
+        if args.sync:
+            with open(args.sync, 'r', encoding='utf-8') as f:
+                resources = json.load(f)
+            start = time.perf_counter()
+            stats = db.sync_resources(resources, dry_run=args.dry_run)
+            print(f"{'🔍' if args.dry_run else '✅'} Synced in {(time.perf_counter() - start) * 1000:.0f}ms: "
+                  f"{stats['inserted']} inserted, {stats['updated']} updated, "
+                  f"{stats['unchanged']} unchanged, {stats['deactivated']} deactivated")
+        if args.reindex or args.tokenizer:
+            start = time.perf_counter()
+            stats = db.rebuild_search_index(args.tokenizer)
+            print(f"🔎 Search index ({stats['tokenizer']}) in {time.perf_counter() - start:.2f}s: "
+                  f"{stats['indexed']} indexed, {stats['removed']} removed, {stats['unchanged']} unchanged")
+        if args.optimize:
+            db.optimize_search_index()
+            print("🔎 Search index optimized")
+        if args.search:
+            for r in db.search_resources(args.search, limit=10):
+                print(f"  [{r['type']}] {r['title_highlight']}  ({r['score']:.2f})")
+                print(f"      {r['snippet']}")
         print("\n📊 Database Statistics:")
         print(json.dumps(db.get_statistics(), indent=2, ensure_ascii=False))
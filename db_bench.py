@@ -0,0 +1,317 @@
+"""
+DB 적재 벤치마크 - 합성 리소스로 insert_resources(대량) 처리량 측정
+- 크기별(기본 1천/10만/100만) 새 DB 파일에 스트리밍으로 적재하고 초당 행 수 출력
+- 비교용으로 리소스마다 커밋하는 경로(insert_resource)도 --per-row-limit개까지 측정
+- 입력은 제너레이터라 100만 개도 메모리에 올리지 않음
+- --concurrent: 대량 쓰기 도중 읽기 QPS/지연/실패 수 측정
+  (legacy = 롤백 저널 + 조회마다 새 연결, pooled = db_pool의 WAL + 스레드별 읽기 연결)
+- --facets: 패싯 개수 조회 시간 (전체 카탈로그 / 필터 조합 - 처음 계산, 캐시 재사용,
+  리소스 하나를 쓴 직후 첫 조회 - 캐시에 있던 필터 / 처음 보는 필터)
+usage:
+    python db_bench.py                       # 1000,100000,1000000
+    python db_bench.py --sizes 1000,10000 --json
+    python db_bench.py --concurrent --readers 4
+    python db_bench.py --facets --sizes 100000
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from canonical_url import resource_url
+from database import MinecraftEducationDB
+from db_pool import get_manager
+from facets import facet_counts, facet_index, normalize_filters
+
+SECTIONS = (('lessons', 'Lesson'), ('worlds', 'World'), ('challenges', 'Challenge'))
+SUBJECTS = [f"Subject {i}" for i in range(24)]
+TAGS = [f"tag-{i}" for i in range(200)]
+AGES = ['5-7', '8-10', '11-13', '14-18', '18+', 'Educator']
+SKILLS = [f"Skill {i}" for i in range(16)]
+LANGUAGES = ['English', 'Korean', 'Japanese', 'Spanish', 'French', 'German', 'Portuguese', 'Chinese']
+WORDS = "build explore redstone biome craft village ocean code agent math history art science".split()
+
+
+def synthetic_resources(count, seed=0, start=0):
+    """resources_enhanced.json 형식의 합성 리소스 (제너레이터, id는 synthetic-{start}부터)"""
+    rng = random.Random(seed)
+    for n in range(start, start + count):
+        section, rtype = SECTIONS[n % len(SECTIONS)]
+        slug = f"synthetic-{n}"
+        yield {
+            'id': slug,
+            'title': ' '.join(rng.choices(WORDS, k=4)).title(),
+            'type': rtype,
+            'description': ' '.join(rng.choices(WORDS, k=30)),
+            'short_description': ' '.join(rng.choices(WORDS, k=8)),
+            'url': resource_url(section, slug),
+            'thumbnail_url': None,
+            'subjects': ', '.join(rng.sample(SUBJECTS, rng.randint(1, 3))),
+            'tags': ', '.join(rng.sample(TAGS, rng.randint(0, 4))),
+            'ages': ', '.join(rng.sample(AGES, rng.randint(1, 2))),
+            'skills': ', '.join(rng.sample(SKILLS, rng.randint(0, 3))),
+            'languages': ', '.join(rng.sample(LANGUAGES, rng.randint(1, 3))),
+            'is_active': 1,
+        }
+
+
+def bench_bulk(size, workdir):
+    path = Path(workdir) / f"bulk_{size}.db"
+    with MinecraftEducationDB(path) as db:
+        db.initialize_schema()
+        start = time.perf_counter()
+        count = len(db.insert_resources(synthetic_resources(size)))
+        elapsed = time.perf_counter() - start
+    get_manager(path).close()
+    return {'mode': 'bulk', 'size': count, 'seconds': round(elapsed, 3),
+            'rows_per_sec': round(count / elapsed), 'db_mb': round(path.stat().st_size / 1048576, 1)}
+
+
+def bench_per_row(size, workdir):
+    path = Path(workdir) / f"per_row_{size}.db"
+    with MinecraftEducationDB(path) as db:
+        db.initialize_schema()
+        start = time.perf_counter()
+        for resource in synthetic_resources(size):
+            db.insert_resource(resource)
+        elapsed = time.perf_counter() - start
+    get_manager(path).close()
+    return {'mode': 'per-row', 'size': size, 'seconds': round(elapsed, 3),
+            'rows_per_sec': round(size / elapsed), 'db_mb': round(path.stat().st_size / 1048576, 1)}
+
+
+# 대시보드/추천기가 보내는 종류의 조회
+READ_QUERIES = (
+    ("SELECT id, title, url FROM resources WHERE is_active = 1 AND type = ? "
+     "ORDER BY crawled_at DESC LIMIT 10", ('Lesson',)),
+    ("SELECT COUNT(*) FROM resources WHERE is_active = 1", ()),
+    ("SELECT r.id, r.title FROM resources r JOIN resource_subjects rs ON r.id = rs.resource_id "
+     "JOIN subjects s ON rs.subject_id = s.id WHERE s.name = ? LIMIT 10", ('Subject 3',)),
+)
+
+
+def _legacy_connect(path):
+    """db_pool 이전 방식 - 기본 설정(롤백 저널)의 새 연결"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _read_loop(path, mode, writing, results):
+    """읽기 프로세스 - writing이 켜져 있는 동안 READ_QUERIES를 반복 (대시보드 프로세스 역할)"""
+    latencies, failed = [], 0
+    while writing.is_set():
+        sql, params = READ_QUERIES[len(latencies) % len(READ_QUERIES)]
+        start = time.perf_counter()
+        try:
+            if mode == 'legacy':
+                conn = _legacy_connect(path)
+                try:
+                    conn.execute(sql, params).fetchall()
+                finally:
+                    conn.close()
+            else:
+                get_manager(path).reader().execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            failed += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    results.put((latencies, failed))
+
+
+def bench_concurrent(base_size, write_size, readers, workdir, mode):
+    """write_size개를 한 트랜잭션으로 쓰는 동안 readers개 프로세스가 조회를 반복"""
+    path = Path(workdir) / f"concurrent_{mode}.db"
+    if mode == 'legacy':
+        db = MinecraftEducationDB(path)
+        db.connection = _legacy_connect(path)
+    else:
+        db = MinecraftEducationDB(path).__enter__()
+    db.initialize_schema()
+    db.insert_resources(synthetic_resources(base_size))
+
+    ctx = multiprocessing.get_context('spawn')
+    writing = ctx.Event()
+    writing.set()
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_read_loop, args=(path, mode, writing, results)) for _ in range(readers)]
+    for proc in procs:
+        proc.start()
+    time.sleep(1)   # 읽기 프로세스 기동 대기
+
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    try:
+        # 기존 행 절반 갱신 + 나머지는 새 행 (크롤링 후 동기화와 비슷한 쓰기)
+        db.insert_resources(synthetic_resources(write_size, seed=1, start=base_size // 2))
+    finally:
+        elapsed = time.perf_counter() - start
+        writing.clear()
+        for _ in procs:
+            proc_latencies, proc_failed = results.get()
+            latencies.extend(proc_latencies)
+            errors += proc_failed
+        for proc in procs:
+            proc.join()
+        if mode == 'legacy':
+            db.connection.close()
+        else:
+            db.close()
+            get_manager(path).close()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    return {'mode': mode, 'readers': readers, 'write_rows': write_size,
+            'write_seconds': round(elapsed, 3), 'reads': len(latencies),
+            'read_qps': round(len(latencies) / elapsed), 'read_p95_ms': round(p95 * 1000, 2),
+            'read_errors': errors}
+
+
+# 대시보드 사이드바에서 나올 만한 필터 조합
+FACET_FILTERS = (
+    {'type': 'Lesson'},
+    {'subject': 'Subject 3'},
+    {'tag': 'tag-7'},
+    {'language': ['English', 'Korean']},
+    {'type': 'Lesson', 'subject': 'Subject 3'},
+    {'subject': ['Subject 1', 'Subject 2'], 'age': '8-10'},
+    {'type': 'World', 'tag': 'tag-7', 'language': 'Korean'},
+    {'age': ['5-7', '8-10', '11-13', '14-18']},
+)
+
+# 집계 테이블 이전의 get_statistics (쿼리 3번)
+LEGACY_STATISTICS = (
+    "SELECT COUNT(*) FROM resources WHERE is_active = 1",
+    "SELECT type, COUNT(*) FROM resources WHERE is_active = 1 GROUP BY type",
+    "SELECT s.name, COUNT(*) AS count FROM subjects s JOIN resource_subjects rs ON s.id = rs.subject_id "
+    "JOIN resources r ON rs.resource_id = r.id WHERE r.is_active = 1 GROUP BY s.name ORDER BY count DESC",
+)
+
+
+def _median_ms(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(times), 3)
+
+
+def _after_write_ms(db, path, filters, repeat=20):
+    """리소스 하나를 고쳐 쓴 직후 첫 조회 시간 (색인 증분 갱신 포함)
+
+    Returns:
+        (캐시에 있던 필터 - 바뀐 리소스만 반영, 처음 보는 필터 - 처음부터 셈)
+    """
+    cached, uncached = [], []
+    with MinecraftEducationDB(path) as writer:
+        for n in range(repeat):
+            for times in (cached, uncached):
+                if times is uncached:
+                    facet_index(db)._cache.clear()
+                writer.insert_resources(synthetic_resources(1, seed=n + 1, start=n * 7))
+                start = time.perf_counter()
+                facet_counts(db, filters)
+                times.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(cached), 3), round(statistics.median(uncached), 3)
+
+
+def bench_facets(size, workdir):
+    path = Path(workdir) / f"facets_{size}.db"
+    with MinecraftEducationDB(path) as db:
+        db.initialize_schema()
+        db.insert_resources(synthetic_resources(size))
+
+    results = []
+    with MinecraftEducationDB(path, read_only=True) as db:
+        legacy = _median_ms(lambda: [db.connection.execute(sql).fetchall() for sql in LEGACY_STATISTICS])
+        results.append({'size': size, 'query': 'get_statistics (3 queries)', 'cold_ms': legacy, 'warm_ms': legacy})
+        catalogue = _median_ms(lambda: facet_counts(db))
+        results.append({'size': size, 'query': 'catalogue (facet_counts)', 'cold_ms': catalogue, 'warm_ms': catalogue})
+
+        start = time.perf_counter()
+        index = facet_index(db)
+        results.append({'size': size, 'query': 'index build', 'cold_ms': round((time.perf_counter() - start) * 1000),
+                        'warm_ms': _median_ms(lambda: facet_index(db))})
+        for filters in FACET_FILTERS:
+            normalized = normalize_filters(filters)
+            results.append({
+                'size': size,
+                'query': json.dumps(filters, ensure_ascii=False),
+                'matches': index.counts(filters)['total'],
+                'cold_ms': _median_ms(lambda: index._counts(normalized)),
+                'warm_ms': _median_ms(lambda: facet_counts(db, filters)),
+            })
+            results[-1]['after_write_ms'], results[-1]['after_write_cold_ms'] = _after_write_ms(db, path, filters)
+    get_manager(path).close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🗄️ DB 대량 적재 벤치마크")
+    parser.add_argument('--sizes', default='1000,100000,1000000', help='리소스 수 (쉼표로 구분)')
+    parser.add_argument('--per-row-limit', type=int, default=10000,
+                        help='리소스마다 커밋하는 경로는 이 크기까지만 측정 (기본: 10000)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    parser.add_argument('--concurrent', action='store_true',
+                        help='대량 쓰기 도중 읽기 QPS 측정 (legacy vs pooled)')
+    parser.add_argument('--readers', type=int, default=4, help='--concurrent 읽기 프로세스 수 (기본: 4)')
+    parser.add_argument('--base-size', type=int, default=20000,
+                        help='--concurrent 시작 시 DB에 있는 리소스 수 (기본: 20000)')
+    parser.add_argument('--write-size', type=int, default=50000,
+                        help='--concurrent 쓰기 트랜잭션 크기 (기본: 50000)')
+    parser.add_argument('--facets', action='store_true', help='패싯 개수 조회 시간 측정 (--sizes 크기별)')
+    args = parser.parse_args()
+
+    if args.facets:
+        results = []
+        with tempfile.TemporaryDirectory() as workdir:
+            for size in (int(s) for s in args.sizes.split(',') if s.strip()):
+                for r in bench_facets(size, workdir):
+                    results.append(r)
+                    if not args.json:
+                        after = (f"  쓰기 뒤 {r['after_write_ms']:>6.3f}ms (처음 {r['after_write_cold_ms']:.3f}ms)"
+                                 if 'after_write_ms' in r else '')
+                        print(f"  {r['size']:>9,}개  {r['query']:58s} "
+                              f"처음 {r['cold_ms']:>9.3f}ms  재사용 {r['warm_ms']:>7.3f}ms{after}")
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    if args.concurrent:
+        results = []
+        with tempfile.TemporaryDirectory() as workdir:
+            for mode in ('legacy', 'pooled'):
+                r = bench_concurrent(args.base_size, args.write_size, args.readers, workdir, mode)
+                results.append(r)
+                if not args.json:
+                    print(f"  {r['mode']:7s} 쓰기 {r['write_rows']:,}개 {r['write_seconds']:.2f}초 동안  "
+                          f"읽기 {r['read_qps']:>7,}QPS  p95 {r['read_p95_ms']:7.2f}ms  "
+                          f"실패 {r['read_errors']}")
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            if size <= args.per_row_limit:
+                results.append(bench_per_row(size, workdir))
+            results.append(bench_bulk(size, workdir))
+            if not args.json:
+                for r in results[-2:] if size <= args.per_row_limit else results[-1:]:
+                    print(f"  {r['mode']:8s} {r['size']:>9,}개  {r['seconds']:8.2f}초  "
+                          f"{r['rows_per_sec']:>9,}행/초  {r['db_mb']:6.1f}MB")
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+SQLite 연결 관리 - 크롤러가 쓰는 동안에도 대시보드/추천기가 막히지 않도록
+- WAL 모드: 읽기는 쓰기 트랜잭션과 동시에 진행 (database is locked 없음)
+- 연결마다 synchronous/cache_size/mmap_size/temp_store/busy_timeout 설정
+- 읽기: 스레드마다 읽기 전용 연결 하나를 만들어 재사용 (Streamlit 스크립트 스레드 등),
+  스레드가 끝나면 그 스레드의 연결도 닫음
+- 쓰기: 프로세스당 쓰기 연결 하나, 쓰기 트랜잭션 동안만 락을 잡음 (같은 스레드는 중첩 가능)
+usage:
+    manager = get_manager()
+    rows = manager.reader().execute("SELECT ...").fetchall()
+    with manager.writer() as conn:
+        conn.execute("UPDATE ...")      # 가장 바깥 블록이 끝나면 커밋 (예외면 롤백)
+"""
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+import config
+
+PRAGMAS = {
+    'synchronous': 'NORMAL',     # WAL에서는 NORMAL로도 커밋 내구성 유지 (체크포인트 때만 fsync)
+    'cache_size': -65536,        # 64MB (음수 = KiB)
+    'mmap_size': 268435456,      # 256MB
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,        # 체크포인트 등으로 잠깐 막히면 5초까지 대기
+}
+
+
+def apply_pragmas(conn, read_only=False):
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    if read_only:
+        conn.execute("PRAGMA query_only = 1")
+
+
+class _ReaderSlot:
+    """스레드 로컬에 두는 읽기 연결 보관함 - 스레드가 끝나 사라지면 연결을 닫는 finalizer의 기준"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionManager:
+    """DB 파일 하나에 대한 연결 풀 (읽기: 스레드별, 쓰기: 하나)"""
+
+    def __init__(self, db_path=config.DB_PATH):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._readers = set()
+        # finalizer가 GC 중에 같은 스레드에서 불릴 수 있어 재진입 가능한 락
+        self._readers_lock = threading.RLock()
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._writer_depth = 0
+
+    # ─── 읽기 ────────────────────────────────────────────────
+    def reader(self):
+        """이 스레드의 읽기 전용 연결 (처음 호출할 때 생성, 이후 재사용, 스레드가 끝나면 닫힘)"""
+        slot = getattr(self._local, 'slot', None)
+        if slot is None:
+            if not self.db_path.exists():
+                # 읽기 전용으로는 새 파일을 만들 수 없음 - 쓰기 연결로 만들고 WAL 설정
+                with self.writer():
+                    pass
+            # 이 스레드만 쓰지만, 스레드가 끝난 뒤 닫는 곳(finalizer, close)은 다른 스레드일 수 있음
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            apply_pragmas(conn, read_only=True)
+            slot = self._local.slot = _ReaderSlot(conn)
+            with self._readers_lock:
+                self._readers.add(conn)
+            weakref.finalize(slot, self._close_reader, conn)
+        return slot.conn
+
+    def _close_reader(self, conn):
+        with self._readers_lock:
+            self._readers.discard(conn)
+        conn.close()
+
+    def reader_count(self):
+        """열려 있는 읽기 연결 수"""
+        with self._readers_lock:
+            return len(self._readers)
+
+    # ─── 쓰기 ────────────────────────────────────────────────
+    def _writer_connection(self):
+        if self._writer is None:
+            # 쓰기 연결은 락을 잡은 스레드만 쓰므로 스레드 검사는 끔
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            apply_pragmas(conn)
+            self._writer = conn
+        return self._writer
+
+    def writer_connection(self):
+        """쓰기 연결 (락은 잡지 않음 - 읽기는 바로 써도 되고, 쓰기는 writer() 블록 안에서)"""
+        with self._write_lock:
+            return self._writer_connection()
+
+    def acquire_writer(self):
+        """쓰기 연결 빌리기 (release_writer까지 다른 스레드의 쓰기는 대기, 같은 스레드는 중첩 가능)"""
+        self._write_lock.acquire()
+        try:
+            conn = self._writer_connection()
+        except BaseException:
+            self._write_lock.release()
+            raise
+        self._writer_depth += 1
+        return conn
+
+    def release_writer(self, rollback=False):
+        """쓰기 연결 반납
+
+        rollback=True면 가장 바깥 반납일 때만 커밋하지 않은 트랜잭션을 롤백합니다
+        (안쪽 반납이 바깥 블록의 작업을 버리지 않도록).
+        """
+        try:
+            self._writer_depth -= 1
+            if rollback and self._writer_depth == 0 and self._writer is not None and self._writer.in_transaction:
+                self._writer.rollback()
+        finally:
+            self._write_lock.release()
+
+    @contextmanager
+    def writer(self):
+        """쓰기 트랜잭션 (블록이 끝나면 커밋, 예외면 롤백)
+
+        같은 스레드에서 중첩된 블록은 바깥 트랜잭션에 합류하고, 커밋/롤백은 가장 바깥 블록에서만 합니다.
+        """
+        conn = self.acquire_writer()
+        outermost = self._writer_depth == 1
+        try:
+            yield conn
+            if outermost:
+                conn.commit()
+        except BaseException:
+            if outermost:
+                conn.rollback()
+            raise
+        finally:
+            self.release_writer()
+
+    def close(self):
+        """모든 연결 닫기 (다른 스레드의 읽기 연결 포함)"""
+        with self._readers_lock:
+            readers = list(self._readers)
+            self._readers.clear()
+        for conn in readers:
+            conn.close()
+        self._local = threading.local()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_path=config.DB_PATH):
+    """DB 파일별 공유 ConnectionManager"""
+    key = Path(db_path).resolve()
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = ConnectionManager(key)
+        return _managers[key]
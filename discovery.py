@@ -0,0 +1,243 @@
+"""
+카탈로그 증분 탐색 - 새로 생기거나 사라지거나 옮겨진 리소스만 찾아냄
+- 사이트맵(sitemap.xml, sitemap index 포함)이 있으면 사이트맵 사용 (lastmod 포함)
+- 없으면 RESOURCE_LIST_URL과 config.RESOURCE_URLS 목록 페이지를 동시에 페이지 순회
+  (목록이 최신순이라고 보고, 페이지 전체가 이미 아는 URL이면 거기서 멈춤)
+전체 크롤링 없이 몇 초 안에 끝납니다.
+usage:
+    python discovery.py            # 변경 사항만 출력
+    python discovery.py --apply    # resources_enhanced.json에 반영
+"""
+import argparse
+import asyncio
+import re
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import config
+from canonical_url import add_alias, fetch_url, resource_key, resource_url
+from http_fetcher import HttpFetcher
+
+SITEMAP_URL = f"{config.BASE_URL}/sitemap.xml"
+RESOURCE_LIST_URL = f"{config.BASE_URL}/en-us/resources"
+# config.RESOURCE_URLS는 ko-kr 목록 - 요청 URL로 바꾸면 같은 목록은 한 번만 순회
+LISTING_URLS = list(dict.fromkeys(fetch_url(u) for u in [RESOURCE_LIST_URL, *config.RESOURCE_URLS.values()]))
+MAX_LISTING_PAGES = 50
+# 사이트맵 기준 삭제가 이 비율(사이트맵이 다루는 섹션의 활성 리소스 대비)을 넘으면
+# 잘리거나 일부만 담긴 사이트맵으로 보고 적용하지 않음 (--allow-mass-removal로 강제)
+MAX_REMOVED_FRACTION = 0.05
+
+SECTION_TYPES = {'lessons': 'Lesson', 'worlds': 'World', 'challenges': 'Challenge'}
+HREF_RE = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+async def fetch_sitemap(fetcher):
+    """사이트맵에서 리소스 URL 수집
+
+    Returns:
+        {(section, slug): lastmod 또는 None}, 사이트맵이 없으면 None
+    """
+    found = {}
+
+    async def walk(url, depth=0):
+        status, body, _, _ = await fetcher.fetch(url)
+        if status != 200 or not body:
+            return False
+        try:
+            root = ET.fromstring(body.encode('utf-8'))
+        except ET.ParseError:
+            return False
+
+        if root.tag == f'{SITEMAP_NS}sitemapindex' and depth < 2:
+            children = [loc.text.strip() for loc in root.iter(f'{SITEMAP_NS}loc') if loc.text]
+            await asyncio.gather(*(walk(child, depth + 1) for child in children))
+            return True
+
+        for entry in root.iter(f'{SITEMAP_NS}url'):
+            loc = entry.find(f'{SITEMAP_NS}loc')
+            lastmod = entry.find(f'{SITEMAP_NS}lastmod')
+            key = resource_key(loc.text.strip()) if loc is not None and loc.text else None
+            if key:
+                found[key] = lastmod.text.strip() if lastmod is not None and lastmod.text else None
+        return True
+
+    if not await walk(SITEMAP_URL) or not found:
+        return None
+    return found
+
+
+async def walk_listing(fetcher, base_url, known):
+    """목록 페이지 하나를 ?page=N으로 순회
+
+    새 URL이 하나도 없는 페이지(이미 아는 URL만 있거나 같은 페이지 반복)에서 멈춥니다.
+
+    Returns:
+        {(section, slug): None} (목록 페이지에는 lastmod가 없음)
+    """
+    found = {}
+    for page in range(1, MAX_LISTING_PAGES + 1):
+        url = base_url if page == 1 else f"{base_url}?page={page}"
+        status, html, _, _ = await fetcher.fetch(url)
+        if status != 200 or not html:
+            break
+
+        page_keys = set()
+        for href in HREF_RE.findall(html):
+            key = resource_key(href, url)
+            if key:
+                page_keys.add(key)
+
+        # 빈 페이지 또는 이미 본 페이지 반복 → 목록 끝
+        if not page_keys or page_keys <= set(found):
+            break
+        for key in page_keys:
+            found.setdefault(key, None)
+
+        # 페이지 전체가 이미 아는 URL → 그 뒤는 모두 기존 리소스
+        if not page_keys - known:
+            break
+    return found
+
+
+async def discover(resources, use_sitemap=True, max_connections=config.MAX_CONCURRENT_REQUESTS,
+                   allow_mass_removal=False):
+    """알고 있는 리소스와 사이트를 비교해 변경 사항 찾기
+
+    Returns:
+        {'source', 'new', 'removed', 'held_removals', 'moved', 'restored', 'lastmod'}
+        - new: [(section, slug)], removed: [id] (사이트맵일 때만 판단 가능)
+        - held_removals: 삭제로 보이지만 MAX_REMOVED_FRACTION을 넘어 보류한 id
+          (allow_mass_removal=True면 removed로)
+        - moved: [(id, old_url, new_url)], restored: [id] (비활성 → 다시 나타남)
+        - lastmod: {id: lastmod} (사이트맵 제공 시)
+    """
+    known_by_id = {r.get('id'): r for r in resources}
+    known_keys = set()
+    for r in resources:
+        key = resource_key(r.get('url', ''))
+        if key:
+            known_keys.add(key)
+
+    async with HttpFetcher(max_connections=max_connections) as fetcher:
+        found = await fetch_sitemap(fetcher) if use_sitemap else None
+        source = 'sitemap'
+        if found is None:
+            source = 'listing'
+            results = await asyncio.gather(*(walk_listing(fetcher, u, known_keys) for u in LISTING_URLS))
+            found = {}
+            for result in results:
+                found.update(result)
+
+    changes = {'source': source, 'new': [], 'removed': [], 'held_removals': [], 'moved': [], 'restored': [],
+               'lastmod': {}}
+    found_slugs = set()
+    for section, slug in sorted(found):
+        found_slugs.add(slug)
+        existing = known_by_id.get(slug)
+        if source == 'sitemap' and found[(section, slug)]:
+            changes['lastmod'][slug] = found[(section, slug)]
+        if existing is None:
+            changes['new'].append((section, slug))
+            continue
+        new_url = resource_url(section, slug)
+        if resource_key(existing.get('url', '')) != (section, slug):
+            changes['moved'].append((slug, existing.get('url'), new_url))
+        if existing.get('is_active') == 0:
+            changes['restored'].append(slug)
+
+    # 사이트맵에 나온 섹션 안에서 빠진 리소스 = 삭제됨 (사이트맵에 없는 섹션은 판단하지 않음)
+    if source == 'sitemap':
+        sections = {section for section, _ in found}
+        active = []
+        for rid, r in known_by_id.items():
+            key = resource_key(r.get('url', ''))
+            if key and key[0] in sections and r.get('is_active', 1) != 0:
+                active.append(rid)
+        removed = sorted(rid for rid in active if rid not in found_slugs)
+        if allow_mass_removal or len(removed) <= len(active) * MAX_REMOVED_FRACTION:
+            changes['removed'] = removed
+        else:
+            changes['held_removals'] = removed
+    return changes
+
+
+def apply_discovery(resources, changes):
+    """탐색 결과를 리소스 리스트에 반영 (새 리소스 추가, 삭제 비활성화, 이동 URL 갱신)"""
+    now = datetime.now().isoformat()
+
+    for section, slug in changes['new']:
+        resources.append({
+            'id': slug,
+            'title': slug.replace('-', ' ').title(),
+            'type': SECTION_TYPES[section],
+            'description': '',
+            'short_description': '',
+            'url': resource_url(section, slug),
+            'thumbnail_url': None,
+            'crawled_at': now,
+            'last_updated': now,
+            'is_active': 1,
+        })
+
+    by_id = {r.get('id'): r for r in resources}
+    for rid in changes['removed']:
+        by_id[rid]['is_active'] = 0
+        by_id[rid]['last_updated'] = now
+    for rid, old_url, new_url in changes['moved']:
+        by_id[rid]['url'] = new_url
+        add_alias(by_id[rid], old_url)
+        by_id[rid]['type'] = SECTION_TYPES[resource_key(new_url)[0]]
+        by_id[rid]['last_updated'] = now
+    for rid in changes['restored']:
+        by_id[rid]['is_active'] = 1
+        by_id[rid]['last_updated'] = now
+    for rid, lastmod in changes['lastmod'].items():
+        by_id[rid]['_lastmod'] = lastmod
+
+    return {k: len(changes[k]) for k in ('new', 'removed', 'moved', 'restored')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🔎 Minecraft Education 카탈로그 증분 탐색")
+    parser.add_argument('--apply', action='store_true',
+                        help='변경 사항을 resources_enhanced.json에 반영')
+    parser.add_argument('--no-sitemap', action='store_true',
+                        help='사이트맵을 건너뛰고 목록 페이지만 사용')
+    parser.add_argument('--allow-mass-removal', action='store_true',
+                        help=f'사이트맵 기준 삭제가 {MAX_REMOVED_FRACTION:.0%}를 넘어도 적용')
+    args = parser.parse_args()
+
+    from crawl import load_resources, save_resources, log
+
+    resources = load_resources()
+    if resources is None:
+        log("❌ resources_enhanced.json을 불러올 수 없습니다.")
+        sys.exit(1)
+
+    start = datetime.now()
+    changes = asyncio.run(discover(resources, use_sitemap=not args.no_sitemap,
+                                   allow_mass_removal=args.allow_mass_removal))
+    elapsed = (datetime.now() - start).total_seconds()
+
+    log(f"🔎 탐색 완료 ({changes['source']}, {elapsed:.1f}초)")
+    log(f"   새 리소스: {len(changes['new'])}개")
+    for section, slug in changes['new'][:20]:
+        log(f"     + {resource_url(section, slug)}")
+    log(f"   삭제: {len(changes['removed'])}개, 이동: {len(changes['moved'])}개, 복구: {len(changes['restored'])}개")
+    for rid, old_url, new_url in changes['moved'][:20]:
+        log(f"     ~ {rid}: {old_url} → {new_url}")
+    if changes['held_removals']:
+        log(f"   ⚠️ 삭제 보류: {len(changes['held_removals'])}개 - 사이트맵이 잘렸거나 일부만 담긴 것으로 보임 "
+            f"(확인 후 --allow-mass-removal)")
+
+    if args.apply:
+        summary = apply_discovery(resources, changes)
+        if any(summary.values()):
+            save_resources(resources)
+            log("   💾 resources_enhanced.json 저장")
+
+
+if __name__ == "__main__":
+    main()
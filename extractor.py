@@ -0,0 +1,149 @@
+"""
+HTML 추출기 - crawl.EXTRACT_JS의 12개 필드 추출을 Python으로 구현
+서버 렌더링된 HTML만으로 추출하므로 브라우저 없이 동작합니다.
+"""
+import re
+from urllib.parse import urljoin
+
+BASE_URL = "https://education.minecraft.net"
+
+SUBMITTED_RE = re.compile(r'Submitted by[:\s]*([^\n]+)', re.IGNORECASE)
+UPDATED_RE = re.compile(r'Updated[:\s]*([^\n]+)', re.IGNORECASE)
+
+# 타입별로 페이지에 항상 있어야 하는 필드 (없으면 브라우저로 재시도)
+# resources_enhanced.json 기준 거의 모든 리소스가 가진 필드만 포함
+REQUIRED_FIELDS = {
+    'Lesson': ('thumbnail_url', 'full_description', 'subjects_list', 'submitted_by', 'updated',
+               'ages', 'languages'),
+    'Challenge': ('thumbnail_url', 'full_description', 'subjects_list', 'submitted_by', 'updated',
+                  'ages', 'languages'),
+    'World': ('thumbnail_url', 'full_description', 'subjects_list', 'submitted_by', 'updated',
+              'tags'),
+}
+DEFAULT_REQUIRED_FIELDS = ('thumbnail_url', 'full_description')
+
+
+def parse_html(html):
+    """HTML 파싱 (lxml 우선, 없으면 내장 파서)"""
+    from bs4 import BeautifulSoup
+
+    try:
+        return BeautifulSoup(html, 'lxml')
+    except Exception:
+        return BeautifulSoup(html, 'html.parser')
+
+
+def _text(el):
+    return el.get_text(' ', strip=True)
+
+
+def _link_texts(soup, needle):
+    return [t for t in (_text(a) for a in soup.select(f'a[href*="{needle}"]')) if t]
+
+
+def _meta_content(soup, selector):
+    el = soup.select_one(selector)
+    return el.get('content') if el else None
+
+
+def _body_text(soup):
+    """document.body.innerText 근사값 (블록 단위 줄바꿈)"""
+    body = soup.body or soup
+    for el in body(['script', 'style', 'noscript', 'template']):
+        el.decompose()
+    return body.get_text('\n')
+
+
+def extract_from_soup(soup, url=BASE_URL):
+    """파싱된 페이지에서 12개 필드 추출 (EXTRACT_JS와 동일한 결과 형식)"""
+    result = {}
+
+    # 1. thumbnail_url - og:image 메타태그
+    meta_image = (_meta_content(soup, 'meta[property="og:image"]')
+                  or _meta_content(soup, 'meta[name="twitter:image"]'))
+    if meta_image:
+        if meta_image.startswith('/'):
+            result['thumbnail_url'] = BASE_URL + meta_image
+        elif meta_image.startswith('http'):
+            result['thumbnail_url'] = meta_image
+        else:
+            result['thumbnail_url'] = BASE_URL + '/' + meta_image
+
+    # 2. tags - category-box-list
+    tag_ul = soup.select_one('ul.category-box-list')
+    result['tags'] = [t for t in (_text(li) for li in tag_ul.select('li.item')) if t] if tag_ul else []
+
+    # 3. subjects / 4. ages
+    result['subjects_list'] = _link_texts(soup, 'subjects=')
+    result['ages'] = _link_texts(soup, 'ages=')
+
+    # 5. skills / 6. estimated_time
+    headings = soup.find_all(['h2', 'h3'])
+    for h in headings:
+        if _text(h).lower() == 'skills':
+            container = h.find_parent('div') or h.parent
+            ul = container.find('ul') if container else None
+            if ul:
+                result['skills'] = [t for t in (_text(li) for li in ul.find_all('li')) if t]
+            break
+    if not result.get('skills'):
+        result['skills'] = []
+
+    for h in headings:
+        text = _text(h).lower()
+        if 'estimated time' in text or 'time to complete' in text:
+            nxt = h.find_next_sibling()
+            if nxt:
+                result['estimated_time'] = _text(nxt)
+            else:
+                container = h.find_parent('div') or h.parent
+                p = container.find('p') if container else None
+                if p:
+                    result['estimated_time'] = _text(p)
+            break
+
+    # 7. languages
+    result['languages'] = _link_texts(soup, 'languages=')
+
+    # 10. full_description (본문 텍스트 추출 전에 메타 먼저 읽기)
+    og_desc = _meta_content(soup, 'meta[property="og:description"]')
+    if og_desc:
+        result['full_description'] = og_desc
+
+    # 11. download_url / 12. supporting_files (절대 URL로 변환, a.href와 동일)
+    for a in soup.select('a[href]'):
+        href = urljoin(url, a['href'])
+        if '.mcworld' in href or '.zip' in href or '/world/' in href:
+            text = _text(a).lower()
+            if ('open in minecraft' in text or 'download' in text
+                    or '.mcworld' in href or '.zip' in href):
+                result['download_url'] = href
+                break
+
+    files = soup.select('a[href*="lessonsupportfiles"], a[href*="LessonZipFiles"]')
+    result['supporting_files'] = [
+        f for f in ({'name': _text(a), 'url': urljoin(url, a['href'])} for a in files)
+        if f['name'] and f['url']
+    ]
+
+    # 8. submitted_by / 9. updated (body 텍스트 정규식)
+    body_text = _body_text(soup)
+    submitted = SUBMITTED_RE.search(body_text)
+    if submitted:
+        result['submitted_by'] = submitted.group(1).strip()
+    updated = UPDATED_RE.search(body_text)
+    if updated:
+        result['updated'] = updated.group(1).strip()
+
+    return result
+
+
+def extract_from_html(html, url=BASE_URL):
+    """HTML 문자열에서 12개 필드 추출"""
+    return extract_from_soup(parse_html(html), url)
+
+
+def missing_fields(data, resource_type=None):
+    """리소스 타입에 필요한 필드 중 비어있는 필드 목록"""
+    required = REQUIRED_FIELDS.get(resource_type, DEFAULT_REQUIRED_FIELDS)
+    return [f for f in required if not data.get(f)]
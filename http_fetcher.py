@@ -0,0 +1,109 @@
+"""
+HTTP 페처 - 브라우저 없이 서버 렌더링 HTML을 가져오는 경량 경로
+httpx 연결 풀 하나를 모든 워커가 공유합니다.
+"""
+import config
+
+
+class HttpFetcher:
+    """pooled httpx.AsyncClient 래퍼"""
+
+    def __init__(self, max_connections=config.MAX_CONCURRENT_REQUESTS, timeout=config.TIMEOUT / 1000):
+        import httpx
+
+        self._httpx = httpx
+        self.client = httpx.AsyncClient(
+            headers={
+                'User-Agent': config.USER_AGENT,
+                'Accept': 'text/html,application/xhtml+xml',
+                'Accept-Language': 'en-US,en;q=0.9',
+            },
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def fetch(self, url, headers=None):
+        """페이지 HTML 가져오기 (조건부 요청 헤더 지원)
+
+        Returns:
+            (status, html, headers, error) - 304면 html은 None, 실패 시 status는 None
+        """
+        try:
+            response = await self.client.get(url, headers=headers)
+        except self._httpx.HTTPError as e:
+            return None, None, {}, f"{type(e).__name__}: {e}"[:120]
+
+        if response.status_code == 304:
+            return 304, None, response.headers, None
+        if response.status_code != 200:
+            return response.status_code, None, response.headers, self._fetch_error(response)
+        return 200, response.text, response.headers, None
+
+    async def fetch_bytes(self, url, headers=None):
+        """바이너리(이미지 등) 가져오기 (조건부 요청 헤더 지원)
+
+        Returns:
+            (status, content, headers, error) - 304면 content는 None, 실패 시 status는 None
+        """
+        try:
+            response = await self.client.get(url, headers={'Accept': '*/*', **(headers or {})})
+        except self._httpx.HTTPError as e:
+            return None, None, {}, f"{type(e).__name__}: {e}"[:120]
+
+        if response.status_code == 304:
+            return 304, None, response.headers, None
+        if response.status_code != 200:
+            return response.status_code, None, response.headers, f"HTTP {response.status_code}"
+        return 200, response.content, response.headers, None
+
+    async def probe(self, url, headers=None):
+        """본문 없이 메타데이터만 확인 (HEAD, 거부되면 1바이트 Range GET)
+
+        Range를 무시하는 서버도 있으므로 GET은 스트리밍으로 열고 본문을 읽지 않고 닫습니다.
+
+        Returns:
+            (status, headers, error) - 실패 시 status는 None
+        """
+        try:
+            response = await self.client.head(url, headers=headers)
+            if response.status_code not in (403, 405, 501) and (
+                    response.status_code != 200 or 'content-length' in response.headers):
+                return response.status_code, response.headers, self._status_error(response.status_code)
+            async with self.client.stream('GET', url, headers={'Range': 'bytes=0-0', **(headers or {})}) as response:
+                return response.status_code, response.headers, self._status_error(response.status_code)
+        except self._httpx.HTTPError as e:
+            return None, {}, f"{type(e).__name__}: {e}"[:120]
+
+    @staticmethod
+    def _fetch_error(response):
+        """실패 응답의 에러 문자열 (Retry-After가 있으면 함께 기록 - 속도 제어가 그만큼 쉼)"""
+        retry_after = response.headers.get('retry-after')
+        if retry_after:
+            return f"HTTP {response.status_code} (Retry-After: {retry_after.strip()[:40]})"
+        return f"HTTP {response.status_code}"
+
+    @staticmethod
+    def _status_error(status):
+        return None if status in (200, 206, 304) else f"HTTP {status}"
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
+def create_fetcher(max_connections=config.MAX_CONCURRENT_REQUESTS):
+    """HTTP 페처 생성 (httpx/bs4가 없으면 None → 브라우저 전용)"""
+    try:
+        import bs4  # noqa: F401 - extractor가 사용
+        return HttpFetcher(max_connections=max_connections)
+    except ImportError:
+        return None
@@ -0,0 +1,88 @@
+"""
+크롤링 저널 - 리소스별 결과를 JSONL로 추가 기록 (append-only)
+- 리소스 하나 처리할 때마다 한 줄 추가 + fsync → 크래시에도 안전
+- 결과 파일 저장(체크포인트/실행 종료)에 성공하면 저널 삭제 - 저장된 결과가 기준
+- 저널이 남아 있으면 저장 전에 죽은 실행: 재시작 시 다시 적용하고 해당 리소스는 건너뜀
+"""
+import json
+import os
+from datetime import datetime
+
+import config
+from canonical_url import add_alias, canonical_url
+
+JOURNAL_PATH = config.DATA_DIR / "crawl_journal.jsonl"
+
+
+class CrawlJournal:
+    """리소스 id 기준 append-only 저널"""
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self._file = None
+
+    def exists(self):
+        return self.path.exists() and self.path.stat().st_size > 0
+
+    def replay(self, resources):
+        """저널을 리소스 리스트에 다시 적용
+
+        Returns:
+            저널에 기록된 리소스 id 집합 (이번 실행에서 건너뛸 대상)
+        """
+        if not self.exists():
+            return set()
+
+        by_id = {r.get('id'): r for r in resources}
+        by_url = {canonical_url(r.get('url', '')): r for r in resources}
+        journaled = set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 크래시로 잘린 마지막 줄
+                    continue
+                target = by_id.get(entry.get('id'))
+                if target is None and entry.get('url'):
+                    # id가 바뀐 경우 - 정규 URL로 찾음
+                    target = by_url.get(entry['url'])
+                if target is None:
+                    continue
+                # 지금의 id/URL은 유지 (URL로 찾았으면 기록된 옛 URL은 별칭으로)
+                current = {'id': target.get('id'), 'url': target.get('url')}
+                target.clear()
+                target.update(entry['resource'])
+                old_url = target.get('url')
+                target.update(current)
+                add_alias(target, old_url)
+                journaled.add(target.get('id'))
+        return journaled
+
+    def record(self, resource):
+        """리소스 처리 결과 한 줄 추가 (flush + fsync)"""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        entry = {
+            'id': resource.get('id'),
+            'url': canonical_url(resource.get('url', '')),
+            'at': datetime.now().isoformat(),
+            'resource': resource,
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """저널 삭제 (결과 파일 저장 후 또는 --no-resume)"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,224 @@
+"""
+첨부 링크 점검 - download_url과 supporting_files의 크기/형식/수정일/생존 여부 확인
+- 본문은 받지 않음: HEAD, 서버가 거부하면 1바이트 Range GET (http_fetcher.HttpFetcher.probe)
+- 동시 요청 수와 초당 요청 수 제한 (rate_limit.RateLimiter)
+- 결과는 URL별로 data/link_probes.json에 검증자(ETag/Last-Modified)와 함께 캐시
+  다시 실행하면 최근에 확인한 링크는 건너뛰고, 오래된 링크는 조건부 요청(304)으로 확인
+usage:
+    python link_probe.py                 # 점검 후 요약만 출력
+    python link_probe.py --apply         # 결과를 resources_enhanced.json에 반영
+    python link_probe.py --force         # 캐시 무시하고 모두 다시 확인
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+import config
+from http_fetcher import HttpFetcher
+from rate_limit import RateLimiter
+
+PROBES_PATH = config.DATA_DIR / "link_probes.json"
+
+# 이 기간 안에 확인한 정상 링크는 다시 요청하지 않음
+RECHECK_DAYS = 7
+DEAD_STATUSES = (404, 410)
+CONTENT_RANGE_RE = re.compile(r'bytes \d+-\d+/(\d+)')
+
+
+def collect_links(resources):
+    """점검할 URL 목록 (중복 제거, 비활성 리소스 제외)"""
+    urls = set()
+    for r in resources:
+        if r.get('is_active', 1) == 0:
+            continue
+        if r.get('download_url'):
+            urls.add(r['download_url'])
+        for f in r.get('supporting_files') or []:
+            if f.get('url'):
+                urls.add(f['url'])
+    return sorted(urls)
+
+
+def parse_probe(status, headers, error):
+    """응답 헤더 → 캐시 항목"""
+    size = None
+    content_range = headers.get('content-range', '')
+    match = CONTENT_RANGE_RE.match(content_range)
+    if match:
+        size = int(match.group(1))
+    elif status == 200 and headers.get('content-length', '').isdigit():
+        size = int(headers['content-length'])
+    return {
+        'status': status,
+        'ok': status in (200, 206),
+        'dead': status in DEAD_STATUSES,
+        'size': size,
+        'content_type': (headers.get('content-type') or '').split(';')[0].strip() or None,
+        'last_modified': headers.get('last-modified'),
+        'etag': headers.get('etag'),
+        'error': error,
+    }
+
+
+class LinkProbeCache:
+    """URL → 점검 결과 영속 저장소"""
+
+    def __init__(self, path=PROBES_PATH):
+        self.path = path
+        self.entries = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding='utf-8') or '{}')
+            except json.JSONDecodeError:
+                self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_fresh(self, url, now=None):
+        """최근에 정상으로 확인한 링크인지"""
+        entry = self.entries.get(url)
+        if not entry or not entry.get('ok') or not entry.get('checked_at'):
+            return False
+        now = now or datetime.now()
+        return entry['checked_at'] >= (now - timedelta(days=RECHECK_DAYS)).isoformat()
+
+    def conditional_headers(self, url):
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get('ok'):
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def update(self, url, status, headers, error):
+        """점검 결과 반영 (304면 이전 메타데이터 유지)"""
+        now = datetime.now().isoformat()
+        if status == 304 and url in self.entries:
+            self.entries[url]['checked_at'] = now
+            return self.entries[url]
+        entry = parse_probe(status, headers, error)
+        entry['checked_at'] = now
+        self.entries[url] = entry
+        return entry
+
+    def save(self):
+        """원자적 저장"""
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+async def probe_all(urls, cache, concurrency=8, rps=5.0, force=False):
+    """URL 목록 점검 (캐시가 신선한 링크는 건너뜀)
+
+    Returns:
+        {'checked', 'unchanged', 'skipped', 'dead', 'failed'}
+    """
+    stats = {'checked': 0, 'unchanged': 0, 'skipped': 0, 'dead': 0, 'failed': 0}
+    limiter = RateLimiter(rps, concurrency)
+    todo = [u for u in urls if force or not cache.is_fresh(u)]
+    stats['skipped'] = len(urls) - len(todo)
+
+    async with HttpFetcher(max_connections=concurrency) as fetcher:
+        async def run(url):
+            headers = None if force else cache.conditional_headers(url)
+            async with limiter:
+                status, resp_headers, error = await fetcher.probe(url, headers)
+            entry = cache.update(url, status, resp_headers, error)
+            if status == 304:
+                stats['unchanged'] += 1
+            elif entry['dead']:
+                stats['dead'] += 1
+            elif not entry['ok']:
+                stats['failed'] += 1
+            else:
+                stats['checked'] += 1
+
+        await asyncio.gather(*(run(url) for url in todo))
+    cache.save()
+    return stats
+
+
+def link_info(entry):
+    """캐시 항목 → 리소스에 저장하는 요약"""
+    return {
+        'ok': bool(entry.get('ok')),
+        'dead': bool(entry.get('dead')),
+        'status': entry.get('status'),
+        'size': entry.get('size'),
+        'content_type': entry.get('content_type'),
+        'last_modified': entry.get('last_modified'),
+        'checked_at': entry.get('checked_at'),
+    }
+
+
+def apply_probes(resources, cache):
+    """점검 결과를 리소스에 반영 (download_info, supporting_files[*].info)
+
+    Returns:
+        갱신된 리소스 수
+    """
+    changed = 0
+    for r in resources:
+        before = json.dumps([r.get('download_info'), r.get('supporting_files')], sort_keys=True)
+        entry = cache.entries.get(r.get('download_url'))
+        if entry:
+            r['download_info'] = link_info(entry)
+        for f in r.get('supporting_files') or []:
+            entry = cache.entries.get(f.get('url'))
+            if entry:
+                f['info'] = link_info(entry)
+        if json.dumps([r.get('download_info'), r.get('supporting_files')], sort_keys=True) != before:
+            changed += 1
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🔗 첨부 링크 점검 (크기/형식/생존 여부)")
+    parser.add_argument('--apply', action='store_true', help='결과를 resources_enhanced.json에 반영')
+    parser.add_argument('--force', action='store_true', help='캐시 무시하고 모두 다시 확인')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수 (기본: 8)')
+    parser.add_argument('--rps', type=float, default=5.0, help='초당 요청 수 (기본: 5, 0=제한 없음)')
+    args = parser.parse_args()
+
+    from crawl import load_resources, save_resources, log
+
+    resources = load_resources()
+    if resources is None:
+        log("❌ resources_enhanced.json을 불러올 수 없습니다.")
+        sys.exit(1)
+
+    urls = collect_links(resources)
+    cache = LinkProbeCache()
+    log(f"🔗 링크 {len(urls)}개 점검 (동시 {args.concurrency}개, {args.rps}요청/초)")
+
+    start = time.perf_counter()
+    stats = asyncio.run(probe_all(urls, cache, args.concurrency, args.rps, args.force))
+    elapsed = time.perf_counter() - start
+    log(f"   확인 {stats['checked']}개, 변경 없음(304) {stats['unchanged']}개, 최근 확인됨 {stats['skipped']}개, "
+        f"끊김 {stats['dead']}개, 실패 {stats['failed']}개 ({elapsed:.1f}초)")
+
+    sizes = [cache.entries[u]['size'] for u in urls if cache.entries.get(u, {}).get('size')]
+    if sizes:
+        log(f"   크기 확인 {len(sizes)}개, 합계 {sum(sizes) / 1073741824:.2f}GB")
+    for url in [u for u in urls if cache.entries.get(u, {}).get('dead')][:20]:
+        log(f"     ✗ {url}")
+
+    if args.apply:
+        changed = apply_probes(resources, cache)
+        if changed:
+            save_resources(resources)
+            log(f"   💾 resources_enhanced.json 저장 ({changed}개 리소스 갱신)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+원본 HTML 아카이브 - 크롤링한 페이지를 압축해서 보관 (WARC 유사)
+- pages.pack: 페이지별로 독립 압축된 레코드를 이어 붙인 팩 파일 (append-only)
+- index.db: URL·수집 시각 → 콘텐츠 해시, 해시 → 팩 파일 오프셋 (SQLite)
+- 같은 내용은 한 번만 저장 (content-addressed, sha256)
+- 레코드 단위 압축이라 페이지 하나만 골라 읽을 수 있음 (random access)
+선택자를 바꾸거나 필드를 추가할 때 네트워크 없이 다시 추출할 수 있습니다.
+"""
+import gzip
+import hashlib
+import sqlite3
+from datetime import datetime
+
+import config
+
+ARCHIVE_DIR = config.DATA_DIR / "archive"
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    codec TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS captures (
+    url TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES blobs(sha256),
+    status INTEGER,
+    source TEXT,
+    PRIMARY KEY (url, fetched_at)
+);
+
+CREATE INDEX IF NOT EXISTS idx_captures_sha ON captures(sha256);
+"""
+
+
+def _compress(raw, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return gzip.compress(raw, compresslevel=6)
+
+
+def _decompress(blob, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+class PageArchive:
+    """content-addressed 압축 HTML 아카이브"""
+
+    def __init__(self, root=ARCHIVE_DIR, codec=None):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.pack_path = root / "pages.pack"
+        self.codec = codec or ('zstd' if zstandard is not None else 'gzip')
+        self.index = sqlite3.connect(root / "index.db")
+        self.index.executescript(INDEX_SCHEMA)
+        self._pack = None
+
+    def close(self):
+        if self._pack is not None:
+            self._pack.close()
+            self._pack = None
+        self.index.commit()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def put(self, url, html, fetched_at=None, status=200, source='http'):
+        """페이지 저장 (같은 내용이 이미 있으면 캡처 기록만 추가)
+
+        Returns:
+            콘텐츠 sha256
+        """
+        raw = html.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        fetched_at = fetched_at or datetime.now().isoformat()
+
+        exists = self.index.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (digest,)).fetchone()
+        if not exists:
+            if self._pack is None:
+                self._pack = open(self.pack_path, 'ab')
+            blob = _compress(raw, self.codec)
+            offset = self._pack.seek(0, 2)
+            self._pack.write(blob)
+            self._pack.flush()
+            self.index.execute(
+                "INSERT INTO blobs (sha256, offset, length, raw_size, codec) VALUES (?, ?, ?, ?, ?)",
+                (digest, offset, len(blob), len(raw), self.codec)
+            )
+
+        self.index.execute(
+            "INSERT OR REPLACE INTO captures (url, fetched_at, sha256, status, source) VALUES (?, ?, ?, ?, ?)",
+            (url, fetched_at, digest, status, source)
+        )
+        self.index.commit()
+        return digest
+
+    def get_blob(self, digest):
+        """해시로 HTML 읽기 (해당 레코드만 읽고 압축 해제)"""
+        row = self.index.execute(
+            "SELECT offset, length, codec FROM blobs WHERE sha256 = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return None
+        offset, length, codec = row
+        if self._pack is not None:
+            self._pack.flush()
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            blob = f.read(length)
+        return _decompress(blob, codec).decode('utf-8')
+
+    def get(self, url, at=None):
+        """URL의 HTML 읽기 (at이 주어지면 그 시각 이전의 가장 최근 캡처)"""
+        if at:
+            row = self.index.execute(
+                "SELECT sha256 FROM captures WHERE url = ? AND fetched_at <= ? ORDER BY fetched_at DESC LIMIT 1",
+                (url, at)
+            ).fetchone()
+        else:
+            row = self.index.execute(
+                "SELECT sha256 FROM captures WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)
+            ).fetchone()
+        return self.get_blob(row[0]) if row else None
+
+    def latest_captures(self):
+        """URL별 최신 캡처 목록
+
+        Returns:
+            [(url, fetched_at, sha256), ...] - URL 순
+        """
+        return self.index.execute("""
+            SELECT url, MAX(fetched_at) AS fetched_at, sha256
+            FROM captures
+            GROUP BY url
+            ORDER BY url
+        """).fetchall()
+
+    def stats(self):
+        """아카이브 통계 (캡처 수, 고유 페이지 수, 원본/압축 크기)"""
+        captures = self.index.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+        blobs, raw_size, packed = self.index.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(length), 0) FROM blobs"
+        ).fetchone()
+        return {'captures': captures, 'blobs': blobs, 'raw_bytes': raw_size, 'packed_bytes': packed}
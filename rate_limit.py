@@ -0,0 +1,244 @@
+"""
+크롤링 속도 제한 - 모든 워커가 공유하는 전역 politeness 제한
+- 초당 요청 수 (requests/sec)
+- 동시 요청 수 (max in-flight)
+- 에러/지연 피드백 기반 적응형 제어 (AIMD)
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import config
+
+RATE_STATE_PATH = config.DATA_DIR / "rate_state.json"
+
+
+def classify_error(error):
+    """에러 메시지 분류
+
+    Returns:
+        'http2', 'throttle'(429/503), 'timeout', 'other' 또는 None(에러 없음)
+    """
+    if not error:
+        return None
+    e = error.lower()
+    if 'http2' in e or 'err_connection_reset' in e or 'remoteprotocolerror' in e:
+        return 'http2'
+    if 'http 429' in e or 'http 503' in e:
+        return 'throttle'
+    if 'timeout' in e or 'timed out' in e:
+        return 'timeout'
+    return 'other'
+
+
+RETRY_AFTER_RE = re.compile(r'retry-after:\s*([^)]+)', re.IGNORECASE)
+
+
+def retry_after_seconds(error):
+    """에러 문자열에 기록된 Retry-After(초 또는 HTTP 날짜) → 대기 초, 없으면 None"""
+    match = RETRY_AFTER_RE.search(error or '')
+    if not match:
+        return None
+    value = match.group(1).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """전역 요청 속도 제한기
+
+    `async with limiter:` 블록 하나가 요청 하나에 해당합니다.
+    진입 시 동시 요청 슬롯을 확보하고, 직전 요청과 최소 간격(1/rps)을 둡니다.
+    rps와 max_in_flight는 실행 중에 바꿀 수 있습니다 (AdaptiveRateController).
+    """
+
+    def __init__(self, rps: float, max_in_flight: int):
+        self.rps = rps
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+
+    @property
+    def min_interval(self):
+        return 1.0 / self.rps if self.rps and self.rps > 0 else 0.0
+
+    async def acquire(self):
+        """요청 슬롯 확보 (동시 요청 수 + 요청 간 최소 간격)"""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.max_in_flight)
+            self._in_flight += 1
+        try:
+            async with self._lock:
+                now = time.monotonic()
+                slot = max(now, self._next_slot, self._paused_until)
+                self._next_slot = slot + self.min_interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+        except BaseException:
+            await self.release()
+            raise
+
+    async def release(self):
+        """요청 슬롯 반환"""
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    async def resize(self, max_in_flight: int):
+        """동시 요청 수 변경 (늘어나면 대기 중인 워커를 깨움)"""
+        async with self._cond:
+            self.max_in_flight = max(1, int(max_in_flight))
+            self._cond.notify_all()
+
+    def rate_label(self):
+        """로그용 rps 표시"""
+        return f"{self.rps:.2f}요청/초" if self.rps and self.rps > 0 else "제한 없음"
+
+    def pause(self, seconds: float):
+        """모든 워커의 새 요청을 일정 시간 멈춤 (휴식, 연속 실패 대기)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.release()
+
+
+class AdaptiveRateController:
+    """AIMD 속도 제어기
+
+    - 성공: rps를 조금씩 올리고(additive increase), 연속 성공이 쌓이면 동시 요청 +1
+    - HTTP/2 에러, 429/503: rps를 절반으로(multiplicative decrease)
+    - 타임아웃, 느린 응답: rps를 완만하게 낮춤
+    - 감속 한 번은 요청 한 바퀴(최근 응답 시간) 동안 유효 - 그 사이 들어온 에러는
+      같은 혼잡의 여파로 보고 다시 줄이지 않음 (동시에 실패한 N개 요청이 rps를 2^N분의 1로 만들지 않도록)
+    - 전체 워커 정지는 서버가 명시적으로 요청했을 때만: 429 또는 Retry-After 헤더
+      (나머지 에러는 감속만 하고 다른 워커는 계속 진행)
+    - max_rps가 0/None이면 rps 상한 없음: 에러가 나기 전까지는 제한 없이 돌고,
+      첫 감속은 최근 처리 속도를 기준으로 함
+    학습된 안전 속도는 RATE_STATE_PATH에 저장되어 다음 실행의 시작점이 됩니다.
+    """
+
+    RPS_STEP = 0.05            # 성공 1회당 rps 증가량
+    CONCURRENCY_STREAK = 20    # 동시 요청 +1에 필요한 연속 성공 수
+    DECREASE = {'http2': 0.5, 'throttle': 0.5, 'timeout': 0.7}
+    SLOW_DECREASE = 0.9
+    THROTTLE_PAUSE = 30        # Retry-After 없는 429의 전체 정지 시간 (초)
+    MAX_PAUSE = 300            # Retry-After 상한 (초)
+    RATE_WINDOW = 50           # 상한이 없을 때 처리 속도를 잴 최근 성공 수
+
+    def __init__(self, limiter, max_rps, max_concurrency, min_rps=0.05,
+                 target_latency=8.0, state_path=RATE_STATE_PATH):
+        self.limiter = limiter
+        self.max_rps = max_rps if max_rps and max_rps > 0 else None
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.min_rps = min(min_rps, self.max_rps) if self.max_rps else min_rps
+        self.target_latency = target_latency
+        self.state_path = state_path
+        self.streak = 0
+        self.events = {}
+        self._decreased_until = 0.0
+        self._rtt = 1.0            # 최근 응답 시간 (지수 이동 평균, 초)
+        self._completed = deque(maxlen=self.RATE_WINDOW)
+        if self.max_rps and (not limiter.rps or limiter.rps <= 0):
+            limiter.rps = self.max_rps
+
+    def _cap(self, rps):
+        return min(self.max_rps, rps) if self.max_rps else rps
+
+    def observed_rps(self):
+        """최근 성공들의 처리 속도 (요청/초, 표본이 부족하면 동시 요청 수 / 최근 응답 시간)"""
+        if len(self._completed) >= 2 and self._completed[-1] > self._completed[0]:
+            return (len(self._completed) - 1) / (self._completed[-1] - self._completed[0])
+        return self.limiter.max_in_flight / self._rtt
+
+    def load(self):
+        """이전 실행에서 학습한 속도로 시작 (상한 이내로 제한)"""
+        if not self.state_path.exists():
+            return False
+        try:
+            saved = json.loads(self.state_path.read_text(encoding='utf-8'))
+        except (json.JSONDecodeError, OSError):
+            return False
+        rps = float(saved.get('rps') or 0)
+        # 저장된 0 = 상한 없이 감속한 적 없음
+        self.limiter.rps = self._cap(max(self.min_rps, rps)) if rps > 0 else (self.max_rps or 0)
+        self.limiter.max_in_flight = min(self.max_concurrency, max(1, int(saved.get('concurrency', 1))))
+        return True
+
+    def save(self):
+        """학습된 속도 저장 (원자적)"""
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'rps': round(self.limiter.rps, 4),
+                'concurrency': self.limiter.max_in_flight,
+                'events': self.events,
+                'updated_at': datetime.now().isoformat(),
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def _decrease(self, factor):
+        current = self.limiter.rps if self.limiter.rps > 0 else self.observed_rps()
+        self.limiter.rps = max(self.min_rps, current * factor)
+
+    async def on_success(self, latency):
+        """성공 피드백 (latency: 요청 처리 시간, 초)"""
+        self._completed.append(time.monotonic())
+        self._rtt = 0.8 * self._rtt + 0.2 * latency
+        if latency > self.target_latency:
+            self.events['slow'] = self.events.get('slow', 0) + 1
+            self.streak = 0
+            self._decrease(self.SLOW_DECREASE)
+            return
+
+        self.streak += 1
+        if self.limiter.rps > 0:
+            self.limiter.rps = self._cap(self.limiter.rps + self.RPS_STEP)
+        if self.streak >= self.CONCURRENCY_STREAK and self.limiter.max_in_flight < self.max_concurrency:
+            self.streak = 0
+            await self.limiter.resize(self.limiter.max_in_flight + 1)
+
+    def pause_for(self, error):
+        """서버가 명시적으로 요청한 전체 정지 시간 (429 또는 Retry-After, 없으면 None)"""
+        seconds = retry_after_seconds(error)
+        if seconds is None and 'http 429' in (error or '').lower():
+            seconds = self.THROTTLE_PAUSE
+        return min(seconds, self.MAX_PAUSE) if seconds is not None else None
+
+    async def on_error(self, error):
+        """에러 피드백 - 에러 하나에 감속 한 번, 전체 정지는 429/Retry-After일 때만
+
+        Returns:
+            에러 분류 ('http2', 'throttle', 'timeout', 'other')
+        """
+        kind = classify_error(error) or 'other'
+        self.events[kind] = self.events.get(kind, 0) + 1
+        if kind in self.DECREASE:
+            self.streak = 0
+            now = time.monotonic()
+            if now >= self._decreased_until:
+                self._decrease(self.DECREASE[kind])
+                # 이미 보낸 요청들이 돌아올 때까지는 같은 혼잡으로 봄
+                self._decreased_until = now + self._rtt
+        pause = self.pause_for(error)
+        if pause:
+            self.limiter.pause(pause)
+        return kind
@@ -0,0 +1,48 @@
+"""
+페이지 준비 대기 - 고정 sleep 대신 실제 DOM 신호를 기다림
+- og 메타태그 존재
+- h1 렌더링
+- 과목 링크 또는 category-box-list 부착
+신호가 모두 나타나면 바로 반환하고, 최대 READY_TIMEOUT까지만 기다립니다.
+"""
+import time
+
+READY_TIMEOUT = 10000  # milliseconds
+
+READY_JS = """() => {
+    const hasMeta = !!document.querySelector(
+        'meta[property="og:image"], meta[property="og:description"]'
+    );
+    const h1 = document.querySelector('h1');
+    const hasTitle = !!(h1 && h1.textContent.trim());
+    const hasBody = !!document.querySelector(
+        'a[href*="subjects="], ul.category-box-list'
+    );
+    return hasMeta && hasTitle && hasBody;
+}"""
+
+
+def wait_until_ready(page, timeout=READY_TIMEOUT):
+    """동기 Playwright 페이지 준비 대기
+
+    Returns:
+        (elapsed_sec, ready) - ready가 False면 타임아웃 (추출은 그대로 진행)
+    """
+    start = time.monotonic()
+    try:
+        page.wait_for_function(READY_JS, timeout=timeout)
+        ready = True
+    except Exception:
+        ready = False
+    return time.monotonic() - start, ready
+
+
+async def wait_until_ready_async(page, timeout=READY_TIMEOUT):
+    """비동기 Playwright 페이지 준비 대기 (wait_until_ready와 동일)"""
+    start = time.monotonic()
+    try:
+        await page.wait_for_function(READY_JS, timeout=timeout)
+        ready = True
+    except Exception:
+        ready = False
+    return time.monotonic() - start, ready
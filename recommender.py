@@ -15,7 +15,8 @@ if sys.platform == 'win32':
 
 class ResourceRecommender:
     def __init__(self):
-        self.db = MinecraftEducationDB()
+        # 읽기 전용 풀 연결 - 크롤러/동기화가 DB에 쓰는 중에도 조회 가능
+        self.db = MinecraftEducationDB(read_only=True)
         self.db.connect()
 
     def close(self):
@@ -0,0 +1,158 @@
+"""
+오프라인 재추출 - 아카이브된 HTML에서 12개 필드를 다시 추출 (네트워크 사용 안 함)
+선택자를 바꾸거나 필드를 추가한 뒤 전체 리소스를 몇 분 안에 다시 만들 수 있습니다.
+usage:
+    python reextract.py                # 재추출 → resources_enhanced.json 갱신
+    python reextract.py --diff         # 바뀔 리소스/필드만 출력 (저장 안 함)
+    python reextract.py --benchmark    # 코어당 처리량 측정 (저장 안 함)
+    python reextract.py --workers 4    # 프로세스 수 지정
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from crawl import load_resources, save_resources, apply_data, log
+from canonical_url import canonical_url
+from page_archive import PageArchive, ARCHIVE_DIR
+
+# apply_data가 채우는 필드 (diff 비교 대상)
+TRACKED_FIELDS = (
+    'thumbnail_url', 'tags', 'subjects', 'ages', 'skills', 'estimated_time', 'languages',
+    'submitted_by', 'updated', 'full_description', 'download_url', 'supporting_files',
+)
+# 네트워크 크롤링 기록 - apply_data가 바꾸지만 재추출은 페이지를 다시 가져온 것이 아니므로 유지
+# (스케줄러는 _crawl_at으로 재방문 시점을 정함)
+CRAWL_STATE_FIELDS = ('_crawl_status', '_crawl_at', '_crawl_failed', '_crawl_error')
+
+
+def _extract_chunk(archive_root, items):
+    """워커 프로세스: (url, sha256) 묶음을 아카이브에서 읽어 추출"""
+    from extractor import extract_from_html
+
+    results = []
+    with PageArchive(archive_root) as archive:
+        for url, digest in items:
+            html = archive.get_blob(digest)
+            if html is not None:
+                results.append((url, extract_from_html(html, url)))
+    return results
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def reextract_all(captures, workers, archive_root=ARCHIVE_DIR, chunk_size=25):
+    """아카이브 캡처 전체를 프로세스 풀로 재추출
+
+    Returns:
+        {url: data}
+    """
+    items = [(url, digest) for url, _, digest in captures]
+    results = {}
+    if workers <= 1:
+        for url, data in _extract_chunk(archive_root, items):
+            results[url] = data
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_chunk, archive_root, chunk) for chunk in _chunks(items, chunk_size)]
+        for future in futures:
+            for url, data in future.result():
+                results[url] = data
+    return results
+
+
+def diff_resource(resource, data):
+    """apply_data 적용 시 바뀌는 필드 목록 [(field, before, after)]"""
+    updated = copy.deepcopy(resource)
+    apply_data(updated, data)
+    return [
+        (field, resource.get(field), updated.get(field))
+        for field in TRACKED_FIELDS
+        if (resource.get(field) or None) != (updated.get(field) or None)
+    ]
+
+
+def run_benchmark(captures, max_workers, archive_root=ARCHIVE_DIR):
+    """프로세스 수별 처리량 측정"""
+    log(f"⏱️  벤치마크: {len(captures)}개 페이지")
+    counts = sorted({1, *(w for w in (2, 4, 8) if w < max_workers), max_workers})
+    for workers in counts:
+        start = time.perf_counter()
+        results = reextract_all(captures, workers, archive_root)
+        elapsed = time.perf_counter() - start
+        rate = len(results) / elapsed if elapsed > 0 else 0
+        log(f"   워커 {workers}개: {rate:.1f} 페이지/초 (코어당 {rate / workers:.1f}), {elapsed:.2f}초")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🗄️ 아카이브 HTML 오프라인 재추출")
+    parser.add_argument('--diff', action='store_true',
+                        help='바뀔 리소스와 필드만 출력 (저장 안 함)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='프로세스 수별 처리량(페이지/초/코어) 측정')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='프로세스 수 (기본: CPU 코어 수)')
+    args = parser.parse_args()
+
+    if not (ARCHIVE_DIR / "index.db").exists():
+        log(f"❌ 아카이브가 없습니다: {ARCHIVE_DIR} (crawl.py --archive로 먼저 수집하세요)")
+        sys.exit(1)
+
+    with PageArchive() as archive:
+        captures = archive.latest_captures()
+    log(f"🗄️  아카이브: {len(captures)}개 URL")
+
+    if args.benchmark:
+        run_benchmark(captures, args.workers)
+        return
+
+    resources = load_resources()
+    if resources is None:
+        log("❌ resources_enhanced.json을 불러올 수 없습니다.")
+        sys.exit(1)
+    by_url = {canonical_url(r['url']): r for r in resources}
+
+    start = time.perf_counter()
+    results = reextract_all(captures, args.workers)
+    elapsed = time.perf_counter() - start
+    log(f"   추출: {len(results)}개, {elapsed:.1f}초 ({len(results) / max(elapsed, 1e-9):.1f} 페이지/초)")
+
+    changed = 0
+    unmatched = 0
+    reextracted_at = datetime.now().isoformat()
+    for url, data in sorted(results.items()):
+        resource = by_url.get(canonical_url(url))
+        if resource is None:
+            unmatched += 1
+            continue
+        changes = diff_resource(resource, data)
+        if not changes:
+            continue
+        changed += 1
+        if args.diff:
+            log(f"  📄 {resource.get('id')}")
+            for field, before, after in changes:
+                log(f"     {field}: {str(before)[:60]!r} → {str(after)[:60]!r}")
+        else:
+            crawl_state = {field: resource[field] for field in CRAWL_STATE_FIELDS if field in resource}
+            apply_data(resource, data)
+            for field in CRAWL_STATE_FIELDS:
+                resource.pop(field, None)
+            resource.update(crawl_state)
+            resource['_reextract_at'] = reextracted_at
+
+    log(f"   변경: {changed}개, 리소스와 매칭 안 됨: {unmatched}개")
+    if not args.diff and changed:
+        save_resources(resources)
+        log("   💾 resources_enhanced.json 저장")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+리플레이 벤치마크 - 녹화된 페이지를 로컬 HTTP 서버로 재생하고 crawl.py 엔진을 돌려 처리량 측정
+- 페이지: data/archive/의 최신 캡처 (없으면 resources_enhanced.json으로 합성한 페이지)
+- 장애 주입: 응답 지연(평균 ± 지터), 연결 끊김(HTTP/2 reset과 같은 분류), 5xx 응답
+- 동시성 단계별로 리소스/초, p50/p95 지연, 성공률 출력 (네트워크 불필요, CI에서 실행 가능)
+속도 조절이나 추출 로직을 바꾼 뒤 실제 사이트를 건드리지 않고 비교할 수 있습니다.
+usage:
+    python replay_bench.py                          # 동시 1,2,4,8 / 200페이지
+    python replay_bench.py --levels 2,4 --pages 500
+    python replay_bench.py --latency 0.3 --reset-rate 0.05 --error-rate 0.05
+    python replay_bench.py --adaptive               # AIMD 속도 제어 포함 (쿨다운 포함 측정)
+    python replay_bench.py --no-http --levels 1,2,4 # 브라우저 경로 (playwright install chromium 필요)
+    python replay_bench.py --json bench.json        # 결과를 JSON으로도 저장
+"""
+import argparse
+import asyncio
+import contextlib
+import copy
+import html
+import io
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+from urllib.parse import urlparse
+
+import crawl
+from crawl import load_resources, new_run_state, crawl_async, log
+from canonical_url import resource_key
+from database import split_names
+from retry_queue import RetryQueue
+from scheduler import CrawlScheduler
+
+# 합성 페이지에 붙이는 내비게이션/푸터 분량 (실제 페이지 크기에 가깝게)
+FILLER_KB = 60
+FILLER_BLOCK = '<div class="nav-item"><a href="/en-us/resources">Resources</a><span>Minecraft Education</span></div>\n'
+
+
+def synthesize_page(resource):
+    """리소스 데이터로 extractor/EXTRACT_JS가 읽는 구조의 HTML 만들기"""
+    e = html.escape
+    languages = split_names(resource.get('languages'))
+    # 저장된 ages에는 languages= 링크도 섞여 있음 (a[href*="ages="]가 languages=도 잡음)
+    ages = [a for a in split_names(resource.get('ages')) if a not in languages]
+    parts = [
+        f"<html><head><title>{e(resource.get('title', ''))}</title>",
+        f'<meta property="og:image" content="{e(resource.get("thumbnail_url") or "")}">',
+        f'<meta property="og:description" content="{e(resource.get("full_description") or resource.get("description") or "")}">',
+        "</head><body>",
+        f"<h1>{e(resource.get('title', ''))}</h1>",
+        '<ul class="category-box-list">',
+        *(f'<li class="item">{e(t)}</li>' for t in split_names(resource.get('tags'))),
+        "</ul>",
+        *(f'<a href="/en-us/resources?subjects={e(s)}">{e(s)}</a>' for s in split_names(resource.get('subjects'))),
+        *(f'<a href="/en-us/resources?ages={e(a)}">{e(a)}</a>' for a in ages),
+        *(f'<a href="/en-us/resources?languages={e(l)}">{e(l)}</a>' for l in languages),
+        "<div><h2>Skills</h2><ul>",
+        *(f"<li>{e(s)}</li>" for s in split_names(resource.get('skills'))),
+        "</ul></div>",
+    ]
+    if resource.get('estimated_time'):
+        parts.append(f"<div><h3>Estimated time</h3><p>{e(resource['estimated_time'])}</p></div>")
+    if resource.get('download_url'):
+        parts.append(f'<a href="{e(resource["download_url"])}">Download</a>')
+    for f in resource.get('supporting_files') or []:
+        parts.append(f'<a href="{e(f.get("url", ""))}">{e(f.get("name", ""))}</a>')
+    if resource.get('submitted_by'):
+        parts.append(f"<p>Submitted by: {e(resource['submitted_by'])}</p>")
+    if resource.get('updated'):
+        parts.append(f"<p>Updated: {e(resource['updated'])}</p>")
+    parts.append(FILLER_BLOCK * (FILLER_KB * 1024 // len(FILLER_BLOCK)))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def load_pages(resources, limit):
+    """(section, slug) → HTML (아카이브 우선, 없으면 합성)
+
+    Returns:
+        (pages, source)
+    """
+    pages = {}
+    source = 'synthetic'
+    from page_archive import ARCHIVE_DIR
+    if (ARCHIVE_DIR / "index.db").exists():
+        from page_archive import PageArchive
+        with PageArchive() as archive:
+            for url, _, digest in archive.latest_captures():
+                key = resource_key(url)
+                if key and key not in pages:
+                    pages[key] = archive.get_blob(digest)
+                if len(pages) >= limit:
+                    break
+        source = 'archive'
+    if not pages:
+        for r in resources:
+            key = resource_key(r.get('url', ''))
+            if key and key not in pages:
+                pages[key] = synthesize_page(r)
+            if len(pages) >= limit:
+                break
+    return pages, source
+
+
+class ReplayServer:
+    """녹화 페이지를 돌려주는 HTTP/1.1 서버 (keep-alive, 장애 주입)"""
+
+    def __init__(self, pages, latency=0.2, jitter=0.1, reset_rate=0.0, error_rate=0.0, seed=0):
+        self.pages = {f"/en-us/{section}/{slug}": body.encode('utf-8') for (section, slug), body in pages.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.reset_rate = reset_rate
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.stats = {'requests': 0, 'resets': 0, 'errors': 0, 'not_found': 0}
+        self._server = None
+        self.port = None
+
+    async def start(self, host='127.0.0.1'):
+        self._server = await asyncio.start_server(self._handle, host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def url(self, section, slug):
+        return f"http://127.0.0.1:{self.port}/en-us/{section}/{slug}"
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = urlparse(head.split(b" ", 2)[1].decode('latin-1')).path
+                self.stats['requests'] += 1
+
+                roll = self.rng.random()
+                if roll < self.reset_rate:
+                    # 응답 없이 연결 끊기 (클라이언트에서는 프로토콜 에러/연결 리셋)
+                    self.stats['resets'] += 1
+                    writer.transport.abort()
+                    return
+
+                delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+                await asyncio.sleep(delay)
+
+                if roll < self.reset_rate + self.error_rate:
+                    self.stats['errors'] += 1
+                    status, body = "503 Service Unavailable", b"unavailable"
+                elif path in self.pages:
+                    status, body = "200 OK", self.pages[path]
+                else:
+                    self.stats['not_found'] += 1
+                    status, body = "404 Not Found", b"not found"
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: text/html; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_level(resources, concurrency, args, workdir):
+    """동시성 한 단계 실행 → 결과 dict"""
+    resources = copy.deepcopy(resources)
+    targets = list(range(len(resources)))
+    state = new_run_state(len(targets))
+    scheduler = CrawlScheduler(resources, state_path=workdir / f"scheduler-{concurrency}.json")
+    retry_queue = RetryQueue(workdir / f"retry-{concurrency}.json")
+
+    # 워커 로그는 임시 파일로 (진행 막대 수천 줄이 결과를 가리지 않게)
+    crawl.LOG_PATH = workdir / "bench.log"
+    with contextlib.redirect_stdout(io.StringIO()):
+        await crawl_async(
+            resources, targets, state,
+            delay=0, rest_interval=10 ** 9, rest_duration=0,
+            headless=True, concurrency=concurrency, rps=args.rps,
+            use_http=not args.no_http, cache=None, block=True, adaptive=args.adaptive,
+            scheduler=scheduler, retry_queue=retry_queue,
+            use_browser=args.browser or args.no_http, rate_state_path=workdir / f"rate-{concurrency}.json",
+        )
+
+    metrics = state['metrics']
+    report = metrics.report()
+    processed = state['success'] + state['failed']
+    return {
+        'concurrency': concurrency,
+        'processed': processed,
+        'elapsed_sec': report['elapsed_sec'],
+        'resources_per_sec': report['throughput_per_sec'],
+        'p50_sec': metrics.percentile('resource', 50),
+        'p95_sec': metrics.percentile('resource', 95),
+        'success_rate': state['success'] / processed if processed else 0.0,
+        'errors': metrics.counters.get('errors', {}),
+        'paths': metrics.counters.get('paths', {}),
+    }
+
+
+async def run_benchmark(args):
+    resources = load_resources()
+    if resources is None:
+        log("❌ resources_enhanced.json을 불러올 수 없습니다.")
+        sys.exit(1)
+
+    pages, source = load_pages(resources, args.pages)
+    server = await ReplayServer(pages, args.latency, args.jitter, args.reset_rate, args.error_rate,
+                                args.seed).start()
+    # 재생할 페이지가 있는 리소스만, 로컬 서버 URL로 바꿔서 사용
+    targets = []
+    for r in resources:
+        key = resource_key(r.get('url', ''))
+        if key in pages:
+            r = dict(r, url=server.url(*key))
+            r.pop('_crawl_status', None)
+            targets.append(r)
+            pages.pop(key)
+
+    log(f"🧪 리플레이 벤치마크: {len(targets)}개 페이지 ({source}), 포트 {server.port}")
+    log(f"   지연 {args.latency}±{args.jitter}초, 연결 끊김 {args.reset_rate:.0%}, 5xx {args.error_rate:.0%}, "
+        f"rps {args.rps or '제한 없음'}, "
+        f"브라우저 {'전용' if args.no_http else '폴백' if args.browser else '안 함'}")
+
+    results = []
+    log_path = crawl.LOG_PATH
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for level in args.levels:
+                result = await run_level(targets, level, args, Path(tmp))
+                results.append(result)
+                crawl.LOG_PATH = log_path
+                p50 = result['p50_sec'] or 0
+                p95 = result['p95_sec'] or 0
+                log(f"   동시 {level:2d}: {result['resources_per_sec']:6.2f}개/초, "
+                    f"p50 {p50:.2f}초, p95 {p95:.2f}초, 성공률 {result['success_rate']:.1%} "
+                    f"(경로: {result['paths'] or '없음'}, 에러: {result['errors'] or '없음'})")
+    finally:
+        crawl.LOG_PATH = log_path
+        await server.stop()
+
+    log(f"   서버: 요청 {server.stats['requests']}개, 끊김 {server.stats['resets']}개, "
+        f"5xx {server.stats['errors']}개")
+    return {'source': source, 'pages': len(targets), 'server': server.stats, 'levels': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🧪 로컬 리플레이 서버 크롤러 벤치마크")
+    parser.add_argument('--levels', type=lambda v: [int(x) for x in v.split(',')], default=[1, 2, 4, 8],
+                        help='동시성 단계 (쉼표 구분, 기본: 1,2,4,8)')
+    parser.add_argument('--pages', type=int, default=200, help='재생할 페이지 수 (기본: 200)')
+    parser.add_argument('--latency', type=float, default=0.2, help='평균 응답 지연 초 (기본: 0.2)')
+    parser.add_argument('--jitter', type=float, default=0.1, help='지연 ± 범위 초 (기본: 0.1)')
+    parser.add_argument('--reset-rate', type=float, default=0.02, help='연결 끊김 비율 (기본: 0.02)')
+    parser.add_argument('--error-rate', type=float, default=0.03, help='503 응답 비율 (기본: 0.03)')
+    parser.add_argument('--rps', type=float, default=0, help='전역 초당 요청 수 제한 (기본: 0=제한 없음)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='적응형 속도 제어 켜기 (장애마다 쿨다운이 들어가 실행이 길어짐)')
+    parser.add_argument('--browser', action='store_true',
+                        help='HTTP 추출이 부족하면 브라우저로 폴백 (Chromium 필요)')
+    parser.add_argument('--no-http', action='store_true',
+                        help='HTTP 추출 없이 모든 페이지를 브라우저로 (브라우저 경로 측정, Chromium 필요)')
+    parser.add_argument('--seed', type=int, default=0, help='장애 주입 난수 시드')
+    parser.add_argument('--json', type=Path, default=None, help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_benchmark(args))
+    if args.json:
+        args.json.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding='utf-8')
+        log(f"   💾 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+영속 재시도 큐 - 실패한 리소스를 에러 종류별 백오프로 나눠서 재시도
+- 에러 분류: network, http2, timeout, throttle(429/503), gone(404/410), empty(추출 결과 없음), other
+- 다음 시도 = 마지막 실패 + min(상한, 기본 간격 × 2^(시도-1)), 지터로 절반~전체 사이에서 분산
+- 종류별 최대 시도 횟수를 넘으면 보류(parked) - 직접 풀어주기 전까지 크롤링하지 않음
+- 기존 실패 목록(_crawl_error, data/crawl_failed.json, failed_resources.json)을 가져올 수 있음
+usage:
+    python retry_queue.py              # 큐 현황
+    python retry_queue.py --import     # 기존 실패 목록 가져오기
+    python retry_queue.py --unpark     # 보류된 항목 다시 대기열로
+"""
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import config
+from canonical_url import resource_key
+from rate_limit import classify_error
+
+RETRY_QUEUE_PATH = config.DATA_DIR / "retry_queue.json"
+CRAWL_FAILED_PATH = config.DATA_DIR / "crawl_failed.json"
+LEGACY_FAILED_PATH = Path(__file__).parent / "failed_resources.json"
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# 에러 종류 → (기본 간격 초, 최대 간격 초, 최대 시도 횟수)
+RETRY_POLICY = {
+    'http2': (10 * 60, 6 * HOUR, 8),
+    'network': (15 * 60, 12 * HOUR, 8),
+    'timeout': (30 * 60, DAY, 6),
+    'throttle': (HOUR, DAY, 8),
+    'empty': (6 * HOUR, 7 * DAY, 3),
+    'gone': (DAY, 7 * DAY, 2),
+    'other': (HOUR, DAY, 5),
+}
+
+EMPTY_EXTRACTION_ERROR = "Extraction empty"
+NETWORK_MARKERS = ('net::err_', 'connecterror', 'connecttimeout', 'readerror', 'networkerror',
+                   'connection refused', 'name_not_resolved', 'name or service not known')
+
+
+def classify_failure(error):
+    """재시도 정책용 에러 분류 (rate_limit.classify_error를 세분화)
+
+    Returns:
+        RETRY_POLICY의 키 중 하나
+    """
+    e = (error or '').lower()
+    if 'http 404' in e or 'http 410' in e:
+        return 'gone'
+    if EMPTY_EXTRACTION_ERROR.lower() in e:
+        return 'empty'
+    kind = classify_error(error)
+    if kind in ('http2', 'throttle', 'timeout'):
+        return kind
+    if any(marker in e for marker in NETWORK_MARKERS):
+        return 'network'
+    return 'other'
+
+
+class RetryQueue:
+    """리소스 id → 재시도 항목 영속 저장소
+
+    항목: {url, title, kind, error, attempts, first_failed, last_failed, next_attempt, parked}
+    """
+
+    def __init__(self, path=RETRY_QUEUE_PATH, rng=None):
+        self.path = path
+        self.rng = rng or random.Random()
+        self.entries = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding='utf-8') or '{}')
+            except json.JSONDecodeError:
+                self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, rid):
+        return rid in self.entries
+
+    def backoff(self, kind, attempts):
+        """attempts번째 실패 뒤 기다릴 시간 (초, equal jitter)"""
+        base, cap, _ = RETRY_POLICY[kind]
+        delay = min(cap, base * 2 ** max(0, attempts - 1))
+        return delay / 2 + self.rng.uniform(0, delay / 2)
+
+    def record_failure(self, resource, url, error, now=None):
+        """실패 기록 → 다음 시도 시각 계산 (최대 시도 횟수를 넘으면 보류)
+
+        Returns:
+            갱신된 항목
+        """
+        now = now or datetime.now()
+        kind = classify_failure(error)
+        entry = self.entries.get(resource.get('id'))
+        if entry is None or entry.get('kind') != kind:
+            # 에러 종류가 바뀌면 그 종류의 정책으로 다시 셈
+            first_failed = entry.get('first_failed') if entry else now.isoformat()
+            entry = {'attempts': 0, 'first_failed': first_failed}
+            self.entries[resource.get('id')] = entry
+
+        entry['attempts'] += 1
+        entry.update({
+            'url': url,
+            'title': resource.get('title', ''),
+            'kind': kind,
+            'error': error,
+            'last_failed': now.isoformat(),
+            'next_attempt': (now + timedelta(seconds=self.backoff(kind, entry['attempts']))).isoformat(),
+            'parked': entry['attempts'] >= RETRY_POLICY[kind][2],
+        })
+        return entry
+
+    def resolve(self, rid):
+        """성공한 리소스를 큐에서 제거"""
+        return self.entries.pop(rid, None) is not None
+
+    def is_due(self, rid, now=None):
+        entry = self.entries.get(rid)
+        if entry is None or entry.get('parked'):
+            return False
+        now = now or datetime.now()
+        return entry.get('next_attempt', '') <= now.isoformat()
+
+    def due_ids(self, now=None):
+        """지금 재시도할 차례인 리소스 id"""
+        now = now or datetime.now()
+        return {rid for rid in self.entries if self.is_due(rid, now)}
+
+    def parked_ids(self):
+        return {rid for rid, e in self.entries.items() if e.get('parked')}
+
+    def waiting_ids(self, now=None):
+        """아직 크롤링하면 안 되는 리소스 id (보류 또는 백오프 대기 중)"""
+        return set(self.entries) - self.due_ids(now)
+
+    def unpark(self, kind=None, now=None):
+        """보류된 항목을 시도 횟수 0으로 되돌려 바로 재시도 대상으로
+
+        Returns:
+            풀어준 항목 수
+        """
+        now = now or datetime.now()
+        count = 0
+        for entry in self.entries.values():
+            if entry.get('parked') and (kind is None or entry.get('kind') == kind):
+                entry.update({'parked': False, 'attempts': 0, 'next_attempt': now.isoformat()})
+                count += 1
+        return count
+
+    def import_failures(self, resources, crawl_failed_path=CRAWL_FAILED_PATH,
+                        legacy_path=LEGACY_FAILED_PATH, now=None):
+        """기존 실패 기록을 큐로 가져오기 (이미 큐에 있거나 그 뒤 성공한 리소스는 제외)
+
+        - resources의 _crawl_failed / _crawl_error
+        - data/crawl_failed.json: [{index, url, title, error}]
+        - failed_resources.json: 에러 메시지 없는 리소스 목록 (종류 'other')
+        각 항목은 첫 번째 실패로 기록되어 record_failure와 같은 지터 백오프를 받습니다.
+        수백 개가 한 시각에 재시도 차례가 되지 않도록 첫 백오프 구간에 흩어짐.
+
+        Returns:
+            {출처: 가져온 개수}
+        """
+        now = now or datetime.now()
+        by_key = {}
+        for r in resources:
+            key = resource_key(r.get('url', ''))
+            if key:
+                by_key[key] = r
+
+        def still_failing(resource):
+            return resource.get('_crawl_failed') or resource.get('_crawl_status') != 'done'
+
+        def add(resource, url, error):
+            if resource is None or resource.get('id') in self.entries or not still_failing(resource):
+                return False
+            if resource.get('is_active', 1) == 0:
+                return False
+            self.record_failure(resource, url or resource.get('url'), error, now)
+            return True
+
+        counts = {'resources': 0, 'crawl_failed': 0, 'legacy': 0}
+        for r in resources:
+            if r.get('_crawl_failed') or r.get('_crawl_error'):
+                counts['resources'] += add(r, r.get('url'), r.get('_crawl_error') or '')
+
+        for path, source in ((crawl_failed_path, 'crawl_failed'), (legacy_path, 'legacy')):
+            if not path.exists():
+                continue
+            try:
+                items = json.loads(path.read_text(encoding='utf-8') or '[]')
+            except json.JSONDecodeError:
+                continue
+            for item in items:
+                resource = by_key.get(resource_key(item.get('url', '')))
+                error = item.get('error') or f"unknown ({path.name})"
+                counts[source] += add(resource, item.get('url'), error)
+        return counts
+
+    def stats(self, now=None):
+        """종류별 {대기, 재시도 차례, 보류} 개수"""
+        now = now or datetime.now()
+        result = {}
+        for rid, entry in self.entries.items():
+            row = result.setdefault(entry.get('kind', 'other'), {'waiting': 0, 'due': 0, 'parked': 0})
+            if entry.get('parked'):
+                row['parked'] += 1
+            elif self.is_due(rid, now):
+                row['due'] += 1
+            else:
+                row['waiting'] += 1
+        return result
+
+    def save(self):
+        """큐 저장 (원자적)"""
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🔁 크롤링 재시도 큐")
+    parser.add_argument('--import', dest='import_failures', action='store_true',
+                        help='_crawl_error, crawl_failed.json, failed_resources.json을 큐로 가져오기')
+    parser.add_argument('--unpark', nargs='?', const='all', default=None, metavar='KIND',
+                        help='보류된 항목을 다시 대기열로 (KIND를 주면 그 종류만)')
+    args = parser.parse_args()
+
+    from crawl import load_resources, log
+
+    queue = RetryQueue()
+    changed = False
+
+    if args.import_failures:
+        resources = load_resources()
+        if resources is None:
+            log("❌ resources_enhanced.json을 불러올 수 없습니다.")
+            return
+        counts = queue.import_failures(resources)
+        log(f"📥 가져옴: 리소스 표시 {counts['resources']}개, crawl_failed.json {counts['crawl_failed']}개, "
+            f"failed_resources.json {counts['legacy']}개")
+        changed = any(counts.values())
+
+    if args.unpark:
+        count = queue.unpark(None if args.unpark == 'all' else args.unpark)
+        log(f"🔓 보류 해제: {count}개")
+        changed = changed or count > 0
+
+    if changed:
+        queue.save()
+
+    log(f"🔁 재시도 큐: {len(queue)}개 ({queue.path})")
+    for kind, row in sorted(queue.stats().items()):
+        log(f"   {kind:9s} 대기 {row['waiting']}개, 재시도 차례 {row['due']}개, 보류 {row['parked']}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+우선순위 크롤링 스케줄러 - 가장 가치 있는 리소스부터 크롤링
+점수 = 타입 가중치 × (오래됨 + 누락 필드 + 사이트맵 lastmod 갱신 + 미크롤링) / (1 + 과거 실패 횟수)
+- 여러 워커가 next()로 우선순위 순서대로 작업을 받아감
+- 시간 예산(time budget) - 끝까지 정리(저장)할 시간을 남기고, 최근 작업 소요 시간만큼 일찍 새 작업을 멈춤
+- 시도/실패 이력은 STATE_PATH에 저장되어 다음 실행의 점수에 반영
+"""
+import heapq
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+import config
+from extractor import REQUIRED_FIELDS, DEFAULT_REQUIRED_FIELDS
+
+STATE_PATH = config.DATA_DIR / "scheduler_state.json"
+
+# 기본 모드에서 이 기간이 지나면 다시 크롤링
+STALE_DAYS = 30
+MAX_STALE_DAYS = 365
+
+TYPE_WEIGHTS = {'World': 1.2, 'Challenge': 1.1, 'Lesson': 1.0}
+
+NEVER_CRAWLED_BONUS = 200
+MISSING_FIELD_WEIGHT = 20
+LASTMOD_BONUS = 100
+
+# 시간 예산 끝에 저장용으로 남겨 두는 시간 (초)
+FLUSH_MARGIN = 120
+TASK_WINDOW = 50
+
+# 추출 결과 필드명 → 리소스에 저장되는 필드명
+RESOURCE_FIELD_NAMES = {'subjects_list': 'subjects'}
+
+
+def _parse_time(value):
+    """ISO 날짜/시각 문자열 → naive datetime (실패 시 None)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=None)
+
+
+def missing_resource_fields(resource):
+    """타입별 필수 필드 중 리소스에 비어있는 필드 목록"""
+    required = REQUIRED_FIELDS.get(resource.get('type'), DEFAULT_REQUIRED_FIELDS)
+    return [f for f in required if not resource.get(RESOURCE_FIELD_NAMES.get(f, f))]
+
+
+class CrawlScheduler:
+    """점수 기반 작업 분배기"""
+
+    def __init__(self, resources, state_path=STATE_PATH, now=None):
+        self.resources = resources
+        self.state_path = state_path
+        self.now = now or datetime.now()
+        self.history = {}
+        if state_path.exists():
+            try:
+                self.history = json.loads(state_path.read_text(encoding='utf-8') or '{}')
+            except json.JSONDecodeError:
+                self.history = {}
+        self._heap = []
+        self._deadline = None
+        self.flush_margin = 0
+        self._task_times = deque(maxlen=TASK_WINDOW)
+
+    # ─── 점수 ────────────────────────────────────────────────
+    def staleness_days(self, resource):
+        crawled_at = _parse_time(resource.get('_crawl_at'))
+        if crawled_at is None:
+            return MAX_STALE_DAYS
+        return min(MAX_STALE_DAYS, max(0.0, (self.now - crawled_at).total_seconds() / 86400))
+
+    def lastmod_changed(self, resource):
+        """사이트맵 lastmod가 마지막 크롤링 이후인지"""
+        lastmod = _parse_time(resource.get('_lastmod'))
+        crawled_at = _parse_time(resource.get('_crawl_at'))
+        return lastmod is not None and (crawled_at is None or lastmod > crawled_at)
+
+    def failures(self, resource):
+        return self.history.get(resource.get('id'), {}).get('failures', 0)
+
+    def score(self, resource):
+        value = self.staleness_days(resource)
+        value += MISSING_FIELD_WEIGHT * len(missing_resource_fields(resource))
+        if self.lastmod_changed(resource):
+            value += LASTMOD_BONUS
+        if resource.get('_crawl_status') is None:
+            value += NEVER_CRAWLED_BONUS
+        weight = TYPE_WEIGHTS.get(resource.get('type'), 1.0)
+        return weight * value / (1 + self.failures(resource))
+
+    def needs_crawl(self, resource):
+        """기본 모드 대상: 미크롤링, 썸네일 없음, lastmod 갱신, 오래됨"""
+        return (
+            resource.get('_crawl_status') is None
+            or not resource.get('thumbnail_url')
+            or self.lastmod_changed(resource)
+            or self.staleness_days(resource) >= STALE_DAYS
+        )
+
+    def plan(self, mode='default', retry_ids=None, skip_ids=()):
+        """크롤링 대상 인덱스 (점수 높은 순, 동점이면 파일 순서)
+
+        Args:
+            retry_ids: retry 모드 대상 id (None이면 _crawl_failed 표시된 리소스)
+            skip_ids: 제외할 id (재시도 큐에서 백오프 대기 중이거나 보류된 리소스)
+        """
+        candidates = []
+        for i, r in enumerate(self.resources):
+            if r.get('is_active', 1) == 0:
+                # 사이트에서 사라진 리소스 (discovery.py)
+                continue
+            if r.get('id') in skip_ids:
+                continue
+            if mode == 'full':
+                candidates.append(i)
+            elif mode == 'retry':
+                if (r.get('id') in retry_ids) if retry_ids is not None else r.get('_crawl_failed'):
+                    candidates.append(i)
+            elif self.needs_crawl(r):
+                candidates.append(i)
+        return sorted(candidates, key=lambda i: (-self.score(self.resources[i]), i))
+
+    # ─── 작업 분배 ───────────────────────────────────────────
+    def start(self, indices, time_budget=None, flush_margin=FLUSH_MARGIN, ordered=False):
+        """분배 시작
+
+        Args:
+            time_budget: 초 - 저장까지 포함한 전체 예산 (None이면 무제한)
+            flush_margin: 예산 끝에 저장용으로 남겨 둘 시간 (초)
+            ordered: True면 점수 대신 주어진 순서대로 (커서에서 이어받은 계획)
+        """
+        self._heap = [(n if ordered else -self.score(self.resources[i]), n, i) for n, i in enumerate(indices)]
+        heapq.heapify(self._heap)
+        self._deadline = time.monotonic() + time_budget if time_budget else None
+        self.flush_margin = min(flush_margin, time_budget / 2) if time_budget else 0
+        self._task_times.clear()
+
+    def next(self):
+        """다음 작업 인덱스 (없거나 시간 예산이 끝났으면 None)"""
+        if not self._heap or self.out_of_time():
+            return None
+        return heapq.heappop(self._heap)[-1]
+
+    def observe(self, seconds):
+        """작업 하나의 소요 시간 (새 작업을 멈출 시점 계산용)"""
+        self._task_times.append(seconds)
+
+    def expected_task_time(self):
+        """최근 작업 소요 시간의 p95 (표본이 없으면 0)"""
+        if not self._task_times:
+            return 0.0
+        ordered = sorted(self._task_times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def time_left(self):
+        """저장용 여유를 뺀 남은 시간 (초, 무제한이면 None)"""
+        if self._deadline is None:
+            return None
+        return self._deadline - self.flush_margin - time.monotonic()
+
+    def out_of_time(self):
+        """지금 시작한 작업이 저장 여유 전에 끝나지 못할 것 같으면 True"""
+        left = self.time_left()
+        return left is not None and left <= self.expected_task_time()
+
+    def remaining(self):
+        return len(self._heap)
+
+    # ─── 이력 ────────────────────────────────────────────────
+    def record(self, resource, ok):
+        """시도 결과 기록 (성공하면 실패 횟수 초기화)"""
+        entry = self.history.setdefault(resource.get('id'), {'attempts': 0, 'failures': 0})
+        entry['attempts'] += 1
+        entry['failures'] = 0 if ok else entry['failures'] + 1
+        entry['last_attempt'] = datetime.now().isoformat()
+
+    def save(self):
+        """이력 저장 (원자적)"""
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.history, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.state_path)
@@ -7,11 +7,14 @@ CREATE TABLE IF NOT EXISTS resources (
     type TEXT NOT NULL CHECK(type IN ('World', 'Challenge', 'Lesson')),
     description TEXT,
     short_description TEXT,
+    full_description TEXT,
     url TEXT UNIQUE NOT NULL,
     thumbnail_url TEXT,
     crawled_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
-    is_active BOOLEAN DEFAULT 1
+    is_active BOOLEAN DEFAULT 1,
+    content_hash TEXT, -- 동기화용 내용 해시 (database.content_hash)
+    doc_id INTEGER -- 고정 정수 키 = 검색 색인 행 번호 (암묵적 rowid는 VACUUM 때 바뀔 수 있음, 고유 인덱스는 _migrate가 만듦)
 );
 
 -- 과목 테이블
@@ -75,6 +78,21 @@ CREATE TABLE IF NOT EXISTS resource_tags (
     FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
 );
 
+-- 언어 테이블
+CREATE TABLE IF NOT EXISTS languages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL
+);
+
+-- 리소스-언어 연결 테이블
+CREATE TABLE IF NOT EXISTS resource_languages (
+    resource_id TEXT,
+    language_id INTEGER,
+    PRIMARY KEY (resource_id, language_id),
+    FOREIGN KEY (resource_id) REFERENCES resources(id) ON DELETE CASCADE,
+    FOREIGN KEY (language_id) REFERENCES languages(id) ON DELETE CASCADE
+);
+
 -- 상세 콘텐츠 테이블
 CREATE TABLE IF NOT EXISTS resource_details (
     resource_id TEXT PRIMARY KEY,
@@ -88,36 +106,55 @@ CREATE TABLE IF NOT EXISTS resource_details (
     FOREIGN KEY (resource_id) REFERENCES resources(id) ON DELETE CASCADE
 );
 
+-- URL 별칭 테이블 (같은 리소스를 가리키던 다른 URL - 로케일/대소문자/이전 주소)
+CREATE TABLE IF NOT EXISTS resource_aliases (
+    alias_url TEXT PRIMARY KEY,
+    resource_id TEXT NOT NULL,
+    FOREIGN KEY (resource_id) REFERENCES resources(id) ON DELETE CASCADE
+);
+
+-- 패싯 집계 (활성 리소스의 타입/과목/태그/연령/스킬/언어별 개수)
+-- 트리거로 증분 갱신 (database.MinecraftEducationDB._install_facet_triggers)
+CREATE TABLE IF NOT EXISTS facet_counts (
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (facet, value)
+) WITHOUT ROWID;
+
+-- 패싯 변경 세대 (패싯이 바뀔 때마다 증가 - facets.py의 메모리 색인 무효화용)
+CREATE TABLE IF NOT EXISTS facet_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO facet_state (id, version) VALUES (1, 0);
+
+-- 패싯이 바뀐 리소스와 마지막으로 바뀐 세대 (facets.py 색인이 바뀐 리소스만 다시 읽도록)
+CREATE TABLE IF NOT EXISTS facet_changes (
+    resource_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_facet_changes_version ON facet_changes(version);
+
 -- 검색 최적화를 위한 인덱스
 CREATE INDEX IF NOT EXISTS idx_resources_type ON resources(type);
 CREATE INDEX IF NOT EXISTS idx_resources_title ON resources(title);
 CREATE INDEX IF NOT EXISTS idx_resources_crawled_at ON resources(crawled_at);
 CREATE INDEX IF NOT EXISTS idx_resource_subjects_subject ON resource_subjects(subject_id);
 CREATE INDEX IF NOT EXISTS idx_resource_tags_tag ON resource_tags(tag_id);
+CREATE INDEX IF NOT EXISTS idx_resource_languages_language ON resource_languages(language_id);
+CREATE INDEX IF NOT EXISTS idx_resource_aliases_resource ON resource_aliases(resource_id);
 
--- 전체 텍스트 검색을 위한 FTS5 테이블
-CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
-    title,
-    description,
-    full_content,
-    content=resources
-);
-
--- FTS 트리거 (자동 업데이트)
-CREATE TRIGGER IF NOT EXISTS resources_ai AFTER INSERT ON resources BEGIN
-    INSERT INTO resources_fts(rowid, title, description, full_content)
-    VALUES (new.rowid, new.title, new.description,
-            (SELECT full_content FROM resource_details WHERE resource_id = new.id));
+-- 리소스 삭제 시 상세/별칭 정리 (PRAGMA foreign_keys를 켜지 않으므로 ON DELETE CASCADE는 동작하지 않음)
+-- 연결 테이블(과목/태그/...)은 패싯 트리거 facet_resources_d가 지움
+CREATE TRIGGER IF NOT EXISTS resources_cleanup_ad AFTER DELETE ON resources BEGIN
+    DELETE FROM resource_details WHERE resource_id = old.id;
+    DELETE FROM resource_aliases WHERE resource_id = old.id;
 END;
 
-CREATE TRIGGER IF NOT EXISTS resources_ad AFTER DELETE ON resources BEGIN
-    DELETE FROM resources_fts WHERE rowid = old.rowid;
-END;
-
-CREATE TRIGGER IF NOT EXISTS resources_au AFTER UPDATE ON resources BEGIN
-    UPDATE resources_fts
-    SET title = new.title,
-        description = new.description,
-        full_content = (SELECT full_content FROM resource_details WHERE resource_id = new.id)
-    WHERE rowid = new.rowid;
-END;
+-- 전체 텍스트 검색 색인(resource_search)은 토크나이저를 고를 수 있어 search_index.py가 만듦
+-- 예전 DB의 외부 콘텐츠 FTS 테이블과 트리거 제거 (resources에 없는 full_content를 색인하던 것)
+DROP TRIGGER IF EXISTS resources_ai;
+DROP TRIGGER IF EXISTS resources_ad;
+DROP TRIGGER IF EXISTS resources_au;
+DROP TABLE IF EXISTS resources_fts;
@@ -0,0 +1,266 @@
+"""
+전체 텍스트 검색 색인 - resource_search (FTS5, 색인이 자체 콘텐츠를 보관)
+- 리소스 한 행 = 색인 한 행 (rowid = resources.doc_id, resource_id/content_hash는 색인하지 않는 컬럼)
+  resources의 암묵적 rowid는 VACUUM 때 바뀔 수 있어 고정된 doc_id를 씀
+- 색인 컬럼: 제목, 설명, 본문(full_description + 상세 full_content), 과목, 태그, 스킬
+- 순위: 컬럼별 가중치를 준 bm25 (제목 > 설명 > 과목/태그 > 스킬 > 본문)
+- 토크나이저: trigram(부분 문자열 - 한국어) 또는 unicode61(단어 + 접두사) - config.SEARCH_TOKENIZER
+  trigram은 3글자 미만 검색어를 색인으로 찾을 수 없어 해당 검색어만 LIKE로 거름
+- insert_resources가 배치마다 바뀐 리소스를 다시 색인 (INDEX_CHUNK개씩 INSERT … SELECT 한 번), 삭제는 트리거가 처리
+- rebuild(): content_hash/doc_id가 어긋난 행만 다시 색인 (토크나이저를 바꾸면 전체)
+"""
+import re
+import sqlite3
+
+import config
+
+TABLE = 'resource_search'
+META_COLUMNS = ('resource_id', 'content_hash')
+INDEXED_COLUMNS = ('title', 'description', 'full_description', 'subjects', 'tags', 'skills')
+COLUMN_WEIGHTS = {
+    'title': 10.0,
+    'description': 4.0,
+    'full_description': 1.0,
+    'subjects': 3.0,
+    'tags': 3.0,
+    'skills': 2.0,
+}
+TOKENIZERS = {
+    'trigram': "trigram",
+    'unicode61': "unicode61 remove_diacritics 2",
+}
+TRIGRAM_MIN_LENGTH = 3
+# snippet() 길이는 토큰 수 - trigram은 글자마다 토큰이라 더 길게
+SNIPPET_TOKENS = {'trigram': 64, 'unicode61': 16}
+SNIPPET_COLUMNS = ('description', 'full_description')
+MARKERS = ('<mark>', '</mark>')
+# 한 번의 INSERT … SELECT로 색인할 리소스 수 (SQLite 바인딩 변수 한도 999 이내)
+INDEX_CHUNK = 500
+
+# 리소스의 색인 문서 (insert_resources와 rebuild가 같은 규칙으로 만듦 - 뒤에 WHERE를 붙여 씀)
+DOCUMENT_SQL = """
+    SELECT r.doc_id, r.id, r.content_hash, r.title, COALESCE(r.description, ''),
+           TRIM(COALESCE(r.full_description, '') || ' ' || COALESCE(d.full_content, '')),
+           COALESCE((SELECT GROUP_CONCAT(s.name, ', ') FROM resource_subjects rs
+                     JOIN subjects s ON s.id = rs.subject_id WHERE rs.resource_id = r.id), ''),
+           COALESCE((SELECT GROUP_CONCAT(t.name, ', ') FROM resource_tags rt
+                     JOIN tags t ON t.id = rt.tag_id WHERE rt.resource_id = r.id), ''),
+           COALESCE((SELECT GROUP_CONCAT(k.name, ', ') FROM resource_skills rk
+                     JOIN skills k ON k.id = rk.skill_id WHERE rk.resource_id = r.id), '')
+    FROM resources r
+    LEFT JOIN resource_details d ON d.resource_id = r.id
+"""
+_COLUMNS = ', '.join(('rowid',) + META_COLUMNS + INDEXED_COLUMNS)
+
+
+def tokenizer_supported(conn, name):
+    """SQLite 빌드가 토크나이저를 지원하는지 (trigram은 3.34+)"""
+    try:
+        conn.execute(f"CREATE VIRTUAL TABLE temp._tokenizer_check USING fts5(x, tokenize='{TOKENIZERS[name]}')")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp._tokenizer_check")
+    return True
+
+
+def current_tokenizer(conn):
+    """지금 색인의 토크나이저 이름 (색인이 없으면 None)"""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (TABLE,)).fetchone()
+    if row is None:
+        return None
+    for name, spec in TOKENIZERS.items():
+        if f"tokenize='{spec}'" in row[0]:
+            return name
+    return 'unicode61'
+
+
+def _install_trigger(conn):
+    # 예전 트리거는 암묵적 rowid로 지웠으므로 항상 다시 만듦
+    conn.execute("DROP TRIGGER IF EXISTS resources_search_ad")
+    conn.execute(f"""
+        CREATE TRIGGER resources_search_ad AFTER DELETE ON resources BEGIN
+            DELETE FROM {TABLE} WHERE rowid = old.doc_id;
+        END
+    """)
+
+
+def _create(conn, tokenizer):
+    if not tokenizer_supported(conn, tokenizer):
+        print(f"⚠️ SQLite {sqlite3.sqlite_version}에서 {tokenizer} 토크나이저를 쓸 수 없어 unicode61 사용")
+        tokenizer = 'unicode61'
+    columns = ', '.join([f"{c} UNINDEXED" for c in META_COLUMNS] + list(INDEXED_COLUMNS))
+    conn.execute(f"CREATE VIRTUAL TABLE {TABLE} USING fts5({columns}, tokenize='{TOKENIZERS[tokenizer]}')")
+    _install_trigger(conn)
+    return tokenizer
+
+
+def ensure_index(conn, tokenizer=None):
+    """색인 테이블이 없으면 생성
+
+    Returns:
+        새로 만들었으면 True (기존 리소스는 rebuild()로 채워야 함)
+    """
+    if current_tokenizer(conn) is not None:
+        _install_trigger(conn)
+        return False
+    _create(conn, tokenizer or config.SEARCH_TOKENIZER)
+    return True
+
+
+def _index_where(cursor, column, keys):
+    keys = list(keys)
+    for start in range(0, len(keys), INDEX_CHUNK):
+        chunk = keys[start:start + INDEX_CHUNK]
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {TABLE} ({_COLUMNS}) {DOCUMENT_SQL} "
+            f"WHERE r.{column} IN ({', '.join('?' * len(chunk))})",
+            chunk
+        )
+
+
+def index_resources(cursor, resource_ids):
+    """리소스들을 다시 색인 (같은 doc_id의 이전 문서는 교체)"""
+    _index_where(cursor, 'id', dict.fromkeys(resource_ids))
+
+
+def rebuild(conn, tokenizer=None, full=False):
+    """색인을 resources와 맞춤 - 빠지거나 내용이 바뀐 행만 다시 색인, 없어진 행은 삭제
+
+    tokenizer가 지금과 다르거나 full=True면 색인을 새로 만들어 전체를 색인합니다.
+
+    Returns:
+        {'tokenizer', 'indexed', 'removed', 'unchanged'}
+    """
+    with conn:
+        current = current_tokenizer(conn)
+        if current is None or full or (tokenizer and tokenizer != current):
+            conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            current = _create(conn, tokenizer or current or config.SEARCH_TOKENIZER)
+
+        indexed = {
+            rowid: (resource_id, digest)
+            for rowid, resource_id, digest in conn.execute(f"SELECT rowid, resource_id, content_hash FROM {TABLE}")
+        }
+        stale, alive = [], set()
+        for doc_id, resource_id, digest in conn.execute("SELECT doc_id, id, content_hash FROM resources"):
+            alive.add(doc_id)
+            if indexed.get(doc_id) != (resource_id, digest):
+                stale.append(doc_id)
+        orphans = [(rowid,) for rowid in indexed.keys() - alive]
+
+        conn.executemany(f"DELETE FROM {TABLE} WHERE rowid = ?", orphans)
+        _index_where(conn, 'doc_id', stale)
+    return {'tokenizer': current, 'indexed': len(stale), 'removed': len(orphans),
+            'unchanged': len(alive) - len(stale)}
+
+
+def optimize(conn):
+    """FTS 세그먼트를 하나로 병합 (대량 적재/재색인 후 검색 속도 회복)"""
+    with conn:
+        conn.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+
+
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_query(text, tokenizer):
+    """검색어 → (FTS MATCH 식 또는 None, LIKE로 거를 짧은 검색어 리스트)
+
+    검색어는 공백으로 나눈 단어를 모두 포함해야 하며(AND), FTS 연산자로 해석하지 않습니다.
+    """
+    terms = [t for t in re.split(r'\s+', text.strip()) if t]
+    if tokenizer == 'trigram':
+        matched = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+        short = [t for t in terms if len(t) < TRIGRAM_MIN_LENGTH]
+        expr = ' AND '.join(_quote(t) for t in matched)
+    else:
+        short = []
+        expr = ' AND '.join(_quote(t) + '*' for t in terms)
+    return expr or None, short
+
+
+def _like_pattern(term):
+    return '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def _mark(text, terms, markers):
+    """LIKE로만 찾은 결과의 하이라이트 (FTS highlight()를 쓸 수 없는 경우)"""
+    if not text or not terms:
+        return text
+    pattern = re.compile('|'.join(re.escape(t) for t in terms), re.IGNORECASE)
+    return pattern.sub(lambda m: f"{markers[0]}{m.group(0)}{markers[1]}", text)
+
+
+def _like_snippet(row, terms, markers, width=60):
+    for column in INDEXED_COLUMNS[1:]:
+        text = row[column] or ''
+        lowered = text.lower()
+        positions = [lowered.find(t.lower()) for t in terms if t.lower() in lowered]
+        if positions:
+            start = max(min(positions) - width // 2, 0)
+            piece = text[start:start + width]
+            return ('…' if start else '') + _mark(piece, terms, markers) + ('…' if start + width < len(text) else '')
+    return _mark((row['description'] or '')[:width], terms, markers)
+
+
+def search(conn, text, limit=20, markers=MARKERS):
+    """활성 리소스 검색 (bm25 가중치 순)
+
+    Returns:
+        resources 행 + subjects, tags, skills, title_highlight, snippet, score(클수록 관련)
+        - title_highlight/snippet의 일치 부분은 markers로 감쌈 (HTML에 넣을 때는 먼저 이스케이프)
+    """
+    tokenizer = current_tokenizer(conn)
+    expr, short = build_query(text, tokenizer)
+    if expr is None and not short:
+        return []
+
+    where, params = ["r.is_active = 1"], []
+    if expr:
+        weights = ', '.join(['0'] * len(META_COLUMNS) + [str(COLUMN_WEIGHTS[c]) for c in INDEXED_COLUMNS])
+        title_column = len(META_COLUMNS) + INDEXED_COLUMNS.index('title')
+        snippets = ', '.join(
+            f"snippet({TABLE}, {len(META_COLUMNS) + INDEXED_COLUMNS.index(c)}, ?, ?, '…', {SNIPPET_TOKENS[tokenizer]}) AS {c}_snippet"
+            for c in SNIPPET_COLUMNS
+        )
+        select = (f"bm25({TABLE}, {weights}) AS rank, "
+                  f"highlight({TABLE}, {title_column}, ?, ?) AS title_highlight, {snippets}")
+        params += list(markers) * (1 + len(SNIPPET_COLUMNS))
+        where.append(f"{TABLE} MATCH ?")
+        params.append(expr)
+    else:
+        # bm25를 쓸 수 없음 - 검색어가 들어 있는 컬럼의 가중치 합으로 정렬
+        score = ' + '.join(
+            f"(s.{c} LIKE ? ESCAPE '\\') * {COLUMN_WEIGHTS[c]}" for _ in short for c in INDEXED_COLUMNS
+        )
+        select = f"-({score}) AS rank, s.title AS title_highlight"
+        params += [_like_pattern(term) for term in short for _ in INDEXED_COLUMNS]
+    for term in short:
+        where.append('(' + ' OR '.join(f"s.{c} LIKE ? ESCAPE '\\'" for c in INDEXED_COLUMNS) + ')')
+        params += [_like_pattern(term)] * len(INDEXED_COLUMNS)
+    params.append(limit)
+
+    rows = conn.execute(f"""
+        SELECT r.*, s.subjects, s.tags, s.skills, s.full_description AS indexed_body, {select}
+        FROM {TABLE} s
+        JOIN resources r ON r.doc_id = s.rowid
+        WHERE {' AND '.join(where)}
+        ORDER BY rank, r.crawled_at DESC
+        LIMIT ?
+    """, params).fetchall()
+
+    results = []
+    for row in rows:
+        result = dict(row)
+        body = result.pop('indexed_body')
+        result['score'] = -result.pop('rank')
+        if expr is None:
+            result['title_highlight'] = _mark(result['title'], short, markers)
+            result['snippet'] = _like_snippet({**result, 'full_description': body}, short, markers)
+        else:
+            # 일치 부분이 있는 쪽 (제목에만 있으면 설명 앞부분)
+            snippets = [result.pop(f"{c}_snippet") for c in SNIPPET_COLUMNS]
+            result['snippet'] = next((text for text in snippets if text and markers[0] in text), snippets[0])
+        results.append(result)
+    return results
@@ -0,0 +1,124 @@
+"""
+샤드 크롤링 - 리소스 id 해시로 카탈로그를 N개의 겹치지 않는 조각으로 나눔
+- 각 샤드 프로세스(또는 matrix job)는 자기 조각만 크롤링하고 별도 결과 파일에 저장
+- merge_shards()가 샤드 결과를 resources_enhanced.json으로 결정적으로 병합
+"""
+import hashlib
+import json
+import os
+
+import config
+
+SHARD_DIR = config.DATA_DIR / "shards"
+
+
+def parse_shard_spec(spec):
+    """'i/N' 문자열 파싱 (i는 1부터 N까지)
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 범위를 벗어난 경우
+    """
+    try:
+        index, count = (int(x) for x in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"샤드 형식은 i/N 이어야 합니다: {spec!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"샤드 번호는 1..{count} 범위여야 합니다: {spec!r}")
+    return index, count
+
+
+def shard_of(resource_id, count):
+    """리소스 id가 속한 샤드 번호 (1..count, 실행/머신과 무관하게 동일)"""
+    digest = hashlib.sha1(str(resource_id).encode('utf-8')).hexdigest()
+    return int(digest[:8], 16) % count + 1
+
+
+def shard_name(index, count):
+    return f"shard-{index}-of-{count}"
+
+
+def shard_result_path(index, count):
+    return SHARD_DIR / f"resources.{shard_name(index, count)}.json"
+
+
+def shard_failed_path(index, count):
+    return SHARD_DIR / f"crawl_failed.{shard_name(index, count)}.json"
+
+
+def shard_journal_path(index, count):
+    return SHARD_DIR / f"crawl_journal.{shard_name(index, count)}.jsonl"
+
+
+def shard_retry_queue_path(index, count):
+    return SHARD_DIR / f"retry_queue.{shard_name(index, count)}.json"
+
+
+def shard_cursor_path(index, count):
+    return SHARD_DIR / f"crawl_cursor.{shard_name(index, count)}.json"
+
+
+def in_shard(resource, index, count):
+    return shard_of(resource.get('id'), count) == index
+
+
+def save_shard(resources, index, count):
+    """샤드에 속한 리소스만 샤드 결과 파일에 저장 (원자적)"""
+    SHARD_DIR.mkdir(parents=True, exist_ok=True)
+    path = shard_result_path(index, count)
+    shard = [r for r in resources if in_shard(r, index, count)]
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'shard': index, 'of': count, 'resources': shard}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def merge_shards(base_resources, count):
+    """샤드 결과를 기준 리소스 리스트에 병합
+
+    - 같은 id는 `_crawl_at`이 더 최근인 쪽을 사용 (같으면 기준 데이터 유지)
+    - 출력 순서는 기준 리스트 순서, 기준에 없던 id는 id 순으로 뒤에 추가
+    - 모든 샤드 파일이 있고, 각 샤드가 자기 조각을 빠짐없이 담고 있는지 검증
+
+    Returns:
+        (merged, report) - report: {'missing_shards', 'uncovered', 'misplaced', 'updated', 'added'}
+    """
+    report = {'missing_shards': [], 'uncovered': [], 'misplaced': [], 'updated': 0, 'added': 0}
+    incoming = {}
+
+    for index in range(1, count + 1):
+        path = shard_result_path(index, count)
+        if not path.exists():
+            report['missing_shards'].append(index)
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        for resource in payload.get('resources', []):
+            resource_id = resource.get('id')
+            if shard_of(resource_id, count) != index:
+                report['misplaced'].append(resource_id)
+            current = incoming.get(resource_id)
+            if current is None or (resource.get('_crawl_at') or '') > (current.get('_crawl_at') or ''):
+                incoming[resource_id] = resource
+
+    merged = []
+    seen = set()
+    for resource in base_resources:
+        resource_id = resource.get('id')
+        seen.add(resource_id)
+        candidate = incoming.get(resource_id)
+        if candidate is None:
+            if shard_of(resource_id, count) not in report['missing_shards']:
+                report['uncovered'].append(resource_id)
+            merged.append(resource)
+        elif (candidate.get('_crawl_at') or '') > (resource.get('_crawl_at') or ''):
+            merged.append(candidate)
+            report['updated'] += 1
+        else:
+            merged.append(resource)
+
+    for resource_id in sorted(set(incoming) - seen, key=str):
+        merged.append(incoming[resource_id])
+        report['added'] += 1
+
+    return merged, report
@@ -0,0 +1,72 @@
+"""canonical_url - 같은 리소스의 여러 URL 형태가 하나의 정규 URL/키/id로 모이는지"""
+import pytest
+
+from canonical_url import (add_alias, canonical_url, canonicalize_resources, dedupe, fetch_url,
+                           resource_id, resource_key, resource_url)
+from journal import CrawlJournal
+
+CANONICAL = "https://education.minecraft.net/lessons/redstone-basics"
+
+
+@pytest.mark.parametrize('url', [
+    CANONICAL,
+    "http://education.minecraft.net/lessons/redstone-basics",
+    "https://www.education.minecraft.net/lessons/redstone-basics",
+    "https://EDUCATION.minecraft.net/ko-kr/lessons/redstone-basics/",
+    "https://education.minecraft.net/en-us/Lessons/Redstone-Basics",
+    "https://education.minecraft.net:443/en-us/lessons/redstone-basics?utm_source=x#top",
+    "/ko-kr/lessons/redstone-basics",
+])
+def test_variants_share_one_canonical_url(url):
+    assert canonical_url(url) == CANONICAL
+    assert resource_key(url) == ('lessons', 'redstone-basics')
+    assert resource_id(url) == 'redstone-basics'
+
+
+def test_non_detail_urls_keep_case_and_pages():
+    # 상세 페이지가 아닌 경로와 다른 호스트는 대소문자를 구분할 수 있어 그대로
+    assert canonical_url("https://education.minecraft.net/content/dam/Image.PNG") == \
+        "https://education.minecraft.net/content/dam/Image.PNG"
+    assert canonical_url("https://cdn.example.com/Files/A.zip?v=2") == "https://cdn.example.com/Files/A.zip"
+    assert canonical_url("https://education.minecraft.net/en-us/resources?page=2&utm_medium=x") == \
+        "https://education.minecraft.net/resources?page=2"
+    assert canonical_url("mailto:someone@example.com") == "mailto:someone@example.com"
+    assert resource_key("https://education.minecraft.net/en-us/resources") is None
+    assert resource_key("https://example.com/lessons/redstone-basics") is None
+
+
+def test_fetch_url_and_resource_url():
+    assert fetch_url(CANONICAL) == "https://education.minecraft.net/en-us/lessons/redstone-basics"
+    assert fetch_url("https://education.minecraft.net/") == "https://education.minecraft.net/en-us"
+    assert fetch_url("https://cdn.example.com/a.png") == "https://cdn.example.com/a.png"
+    assert resource_url('lessons', 'redstone-basics') == CANONICAL
+
+
+def test_canonicalize_and_dedupe_keep_aliases():
+    old = "https://education.minecraft.net/ko-kr/lessons/redstone-basics"
+    resources = [
+        {'id': 'redstone-basics', 'url': old},
+        {'id': 'redstone-basics-copy', 'url': CANONICAL + '/', 'url_aliases': ['https://x/old']},
+        {'id': 'other', 'url': "https://education.minecraft.net/worlds/other"},
+    ]
+    kept, dropped = dedupe(resources, [0, 1, 2])
+    assert (kept, dropped) == ([0, 2], 1)
+    assert resources[0]['url_aliases'] == [CANONICAL + '/', 'https://x/old']
+
+    assert canonicalize_resources(resources) == 2
+    assert resources[0]['url'] == CANONICAL
+    assert old in resources[0]['url_aliases']
+    assert not add_alias(resources[0], CANONICAL)
+
+
+def test_journal_replays_by_canonical_url_when_the_id_changed(tmp_path):
+    journal = CrawlJournal(tmp_path / "crawl_journal.jsonl")
+    journal.record({'id': 'old-id', 'url': "https://education.minecraft.net/ko-kr/lessons/redstone-basics/",
+                    'thumbnail_url': 'https://img/x.png'})
+    journal.close()
+    resources = [{'id': 'redstone-basics', 'url': CANONICAL}]
+    assert journal.replay(resources) == {'redstone-basics'}
+    assert resources[0]['thumbnail_url'] == 'https://img/x.png'
+    # id/URL은 지금 것 그대로, 기록된 옛 URL은 별칭으로
+    assert (resources[0]['id'], resources[0]['url']) == ('redstone-basics', CANONICAL)
+    assert resources[0]['url_aliases'] == ["https://education.minecraft.net/ko-kr/lessons/redstone-basics/"]
@@ -0,0 +1,105 @@
+"""ContextPool - 크기 한도, 건강 지표 기반 교체 (새 컨텍스트를 먼저 띄운 뒤 바꿔 끼움)"""
+import asyncio
+
+import context_pool
+from context_pool import ContextPool
+
+
+class FakePage:
+    async def goto(self, url):
+        pass
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        pass
+
+    def on(self, event, handler):
+        pass
+
+    async def new_page(self):
+        return FakePage()
+
+    async def new_cdp_session(self, page):
+        raise RuntimeError("CDP 없음")
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **kwargs):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+def make_pool(size, **kwargs):
+    browser = FakeBrowser()
+
+    async def launch():
+        return browser
+
+    return browser, ContextPool(launch, size, **kwargs)
+
+
+def test_pool_creates_up_to_size_and_reuses():
+    browser, pool = make_pool(2)
+
+    async def run():
+        a = await pool.acquire()
+        b = await pool.acquire()
+        assert a is not b
+        waiter = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()            # 한도 - 반납을 기다림
+        await pool.release(a, ok=True, latency=0.5)
+        assert await waiter is a
+        await pool.close()
+
+    asyncio.run(run())
+    assert len(browser.contexts) == 2
+    assert all(context.closed for context in browser.contexts)
+
+
+def test_recycles_after_max_pages_without_stalling():
+    browser, pool = make_pool(1, max_pages=3)
+
+    async def run():
+        reasons = []
+        for _ in range(3):
+            lease = await pool.acquire()
+            reasons.append(await pool.release(lease, ok=True, latency=0.5))
+        assert reasons == [None, None, 'pages']
+        old = lease
+        await asyncio.sleep(0)              # 백그라운드 교체
+        lease = await pool.acquire()
+        assert lease is not old and old.context.closed
+        await pool.release(lease, ok=True)
+        await pool.close()
+        return pool.recycled
+
+    assert asyncio.run(run()) == {'pages': 1}
+    assert len(browser.contexts) == 2
+
+
+def test_recycles_on_error_rate(monkeypatch):
+    monkeypatch.setattr(context_pool, 'MIN_SAMPLES', 2)
+    _, pool = make_pool(1)
+
+    async def run():
+        lease = await pool.acquire()
+        assert await pool.release(lease, ok=True) is None
+        lease = await pool.acquire()
+        reason = await pool.release(lease, ok=False)
+        await pool.close()
+        return reason
+
+    assert asyncio.run(run()) == 'errors'
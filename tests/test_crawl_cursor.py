@@ -0,0 +1,62 @@
+"""CrawlCursor / 시간 예산 - 끊긴 실행의 남은 작업을 계획 순서대로 이어받음"""
+import json
+
+from crawl_cursor import CrawlCursor
+from scheduler import CrawlScheduler
+
+
+def make_resources(count):
+    return [{'id': f"r{i}", 'type': 'Lesson'} for i in range(count)]
+
+
+def test_resume_in_planned_order(tmp_path):
+    path = tmp_path / "crawl_cursor.json"
+    resources = make_resources(6)
+    cursor = CrawlCursor(path)
+    assert not cursor.can_resume('full')
+    cursor.start('full', resources, [4, 2, 0, 5])
+    cursor.begin_run()
+    cursor.mark_done('r4')
+    cursor.save()
+
+    cursor = CrawlCursor(path)
+    assert cursor.can_resume('full') and not cursor.can_resume('default')
+    assert cursor.remaining() == 3
+    # 그 사이 사라진(비활성) 리소스는 커서에서도 빠짐
+    resources[0]['is_active'] = 0
+    assert cursor.resume(resources) == [2, 5]
+    cursor.extend(resources, [1, 2])
+    cursor.save()
+    assert json.loads(path.read_text())['pending'] == ['r2', 'r5', 'r1']
+
+
+def test_completed_cursor_stays_on_disk(tmp_path):
+    path = tmp_path / "crawl_cursor.json"
+    cursor = CrawlCursor(path)
+    cursor.start('full', make_resources(2), [0, 1])
+    for rid in ('r0', 'r1'):
+        cursor.mark_done(rid)
+    cursor.save()
+    state = json.loads(path.read_text())
+    assert state['pending'] == [] and 'completed_at' in state
+    assert not CrawlCursor(path).can_resume('full')
+
+    cursor.reset()
+    assert not path.exists()
+
+
+def test_time_budget_stops_before_the_flush_margin(tmp_path):
+    resources = make_resources(5)
+    scheduler = CrawlScheduler(resources, state_path=tmp_path / "scheduler_state.json")
+    scheduler.start(range(5), time_budget=100, flush_margin=20, ordered=True)
+    assert scheduler.next() == 0
+    assert 79 < scheduler.time_left() <= 80
+    # 최근 작업이 남은 시간보다 오래 걸렸으면 새 작업을 시작하지 않음
+    scheduler.observe(90)
+    assert scheduler.out_of_time()
+    assert scheduler.next() is None
+    assert scheduler.remaining() == 4
+
+    # 예산이 짧으면 저장 여유는 예산의 절반까지만
+    scheduler.start(range(5), time_budget=10, flush_margin=120)
+    assert scheduler.flush_margin == 5
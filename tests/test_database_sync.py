@@ -0,0 +1,40 @@
+"""sync_resources - JSON 스냅샷 ↔ DB 동기화"""
+from database import MinecraftEducationDB
+from db_pool import get_manager
+
+
+def make_resources(count):
+    return [{
+        'id': f"lesson-{i}",
+        'title': f"Lesson {i}",
+        'type': 'Lesson',
+        'url': f"https://education.minecraft.net/lessons/lesson-{i}",
+        'subjects': 'Math, Science',
+    } for i in range(count)]
+
+
+def active_ids(db):
+    return {row[0] for row in db.connection.execute("SELECT id FROM resources WHERE is_active")}
+
+
+def test_vanished_resource_is_reactivated_when_it_reappears(tmp_path):
+    path = tmp_path / "sync.db"
+    resources = make_resources(20)
+    try:
+        with MinecraftEducationDB(path) as db:
+            db.initialize_schema()
+            assert db.sync_resources(resources)['inserted'] == 20
+
+            stats = db.sync_resources(resources[5:])
+            assert stats['deactivated'] == 5 and stats['unchanged'] == 15
+            assert len(active_ids(db)) == 15
+
+            stats = db.sync_resources(resources)
+            assert stats == {'inserted': 0, 'updated': 5, 'unchanged': 15, 'deactivated': 0}
+            assert active_ids(db) == {r['id'] for r in resources}
+            assert db.facet_totals()['type'] == {'Lesson': 20}
+
+            # 다시 돌리면 바뀐 것 없음
+            assert db.sync_resources(resources)['unchanged'] == 20
+    finally:
+        get_manager(path).close()
@@ -0,0 +1,90 @@
+"""db_pool - 쓰기 락은 트랜잭션 동안만, 읽기 연결은 스레드와 함께 닫힘"""
+import threading
+
+import pytest
+
+from database import MinecraftEducationDB
+from db_pool import ConnectionManager, get_manager
+
+
+def resource(i):
+    return {'id': f"lesson-{i}", 'title': f"Lesson {i}", 'type': 'Lesson',
+            'url': f"https://education.minecraft.net/en-us/lessons/lesson-{i}", 'subjects': 'Math'}
+
+
+def in_thread(target):
+    errors = []
+
+    def run():
+        try:
+            target()
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "쓰기가 막힘"
+    if errors:
+        raise errors[0]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "pool.db"
+    yield path
+    get_manager(path).close()
+
+
+def test_open_writer_does_not_block_other_threads(db_path):
+    db = MinecraftEducationDB(db_path)
+    db.connect()            # close()를 잊은 객체
+    db.initialize_schema()
+    db.insert_resources([resource(1)])
+
+    def write():
+        with MinecraftEducationDB(db_path) as other:
+            other.insert_resources([resource(2)])
+
+    in_thread(write)
+    # 다른 스레드에서 닫아도 RuntimeError 없음
+    in_thread(db.close)
+    with MinecraftEducationDB(db_path, read_only=True) as reader:
+        assert reader.connection.execute("SELECT COUNT(*) FROM resources").fetchone()[0] == 2
+
+
+def test_nested_writer_commits_at_outermost_block(db_path):
+    manager = ConnectionManager(db_path)
+    with manager.writer() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    with pytest.raises(ValueError):
+        with manager.writer() as conn:
+            with manager.writer() as inner:
+                inner.execute("INSERT INTO t VALUES (1)")
+            assert conn.in_transaction
+            raise ValueError
+    with manager.writer() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    manager.close()
+
+
+def test_failed_insert_rolls_back_and_releases_lock(db_path):
+    with MinecraftEducationDB(db_path) as db:
+        db.initialize_schema()
+        with pytest.raises(KeyError):
+            db.insert_resources([resource(1), {'id': 'broken'}])
+        assert db.connection.execute("SELECT COUNT(*) FROM resources").fetchone()[0] == 0
+
+    def write():
+        with get_manager(db_path).writer() as conn:
+            conn.execute("DELETE FROM resources")
+
+    in_thread(write)
+
+
+def test_reader_closes_with_its_thread(db_path):
+    manager = get_manager(db_path)
+    with manager.writer():
+        pass
+    in_thread(lambda: manager.reader().execute("SELECT 1").fetchone())
+    assert manager.reader_count() == 0
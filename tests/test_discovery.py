@@ -0,0 +1,84 @@
+"""discovery - 사이트맵 기준 새/삭제/이동/복구 판단, 대량 삭제 보류"""
+import asyncio
+
+import pytest
+
+import discovery
+
+BASE = "https://education.minecraft.net/en-us"
+
+
+def sitemap(urls):
+    entries = ''.join(f"<url><loc>{url}</loc><lastmod>2026-01-01</lastmod></url>" for url in urls)
+    return f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</urlset>'
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """사이트맵 하나만 있는 가짜 사이트 (pages: URL → 본문)"""
+    pages = {}
+
+    class FakeFetcher:
+        def __init__(self, **kwargs):
+            pass
+
+        async def fetch(self, url, headers=None):
+            body = pages.get(url)
+            return (200, body, {}, None) if body else (404, None, {}, "HTTP 404")
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            pass
+
+    monkeypatch.setattr(discovery, 'HttpFetcher', FakeFetcher)
+    return pages
+
+
+def lessons(count, section='lessons'):
+    return [{'id': f"{section}-{i}", 'title': f"{section} {i}", 'type': 'Lesson',
+             'url': f"{BASE}/{section}/{section}-{i}", 'is_active': 1} for i in range(count)]
+
+
+def test_changes_from_sitemap(site):
+    resources = lessons(40) + lessons(5, section='worlds')
+    resources[3]['is_active'] = 0
+    resources[5]['url'] = f"{BASE}/challenges/lessons-5"       # 섹션이 옮겨짐
+    urls = [r['url'] for r in lessons(40) if r['id'] != 'lessons-7'] + [f"{BASE}/lessons/brand-new"]
+    site[discovery.SITEMAP_URL] = sitemap(urls)
+
+    changes = asyncio.run(discovery.discover(resources))
+    assert changes['source'] == 'sitemap'
+    assert changes['new'] == [('lessons', 'brand-new')]
+    # 사이트맵에 없는 섹션(worlds)은 삭제로 보지 않음
+    assert changes['removed'] == ['lessons-7']
+    assert changes['held_removals'] == []
+    assert changes['restored'] == ['lessons-3']
+    [(moved_id, old_url, new_url)] = changes['moved']
+    assert (moved_id, old_url) == ('lessons-5', f"{BASE}/challenges/lessons-5")
+    assert new_url.endswith('/lessons/lessons-5')
+
+    counts = discovery.apply_discovery(resources, changes)
+    assert counts == {'new': 1, 'removed': 1, 'moved': 1, 'restored': 1}
+    by_id = {r['id']: r for r in resources}
+    assert by_id['lessons-7']['is_active'] == 0
+    assert by_id['lessons-3']['is_active'] == 1
+    assert by_id['brand-new']['type'] == 'Lesson'
+    assert by_id['worlds-0']['is_active'] == 1
+
+
+def test_mass_removal_is_held(site):
+    resources = lessons(40)
+    # 잘린 사이트맵 - 절반만 담김
+    site[discovery.SITEMAP_URL] = sitemap(r['url'] for r in resources[:20])
+
+    changes = asyncio.run(discovery.discover(resources))
+    assert changes['removed'] == []
+    assert len(changes['held_removals']) == 20
+    discovery.apply_discovery(resources, changes)
+    assert all(r['is_active'] == 1 for r in resources)
+
+    changes = asyncio.run(discovery.discover(resources, allow_mass_removal=True))
+    assert len(changes['removed']) == 20
+    assert changes['held_removals'] == []
@@ -0,0 +1,126 @@
+"""facets - 필터 조합별 개수 (세는 경로마다 같은 결과), 쓰기 뒤 증분 갱신한 색인이 새로 만든 색인과 같은지"""
+import pytest
+
+import facets
+from database import FACETS, MinecraftEducationDB, split_names
+from db_pool import get_manager
+from facets import FacetIndex, facet_counts, facet_index
+
+FILTERS = (
+    {'type': 'Lesson'},
+    {'subject': 'Math'},
+    {'subject': ['Math', 'Art'], 'age': '8-10'},
+    {'tag': 'redstone'},
+)
+
+
+def make_resources(count, start=0, subject='Math'):
+    return [{
+        'id': f"lesson-{i}",
+        'title': f"Lesson {i}",
+        'type': ('Lesson', 'World')[i % 2],
+        'url': f"https://education.minecraft.net/lessons/lesson-{i}",
+        'subjects': f"{subject}, Science" if i % 3 else subject,
+        'ages': '8-10' if i % 4 else '11-13',
+        'tags': 'redstone' if i % 5 == 0 else '',
+    } for i in range(start, start + count)]
+
+
+def test_index_is_updated_in_place_after_writes(tmp_path, monkeypatch):
+    # 작은 DB에서도 비트셋 경로를 타도록
+    monkeypatch.setattr(facets, 'SPARSE_LIMIT', 2)
+    path = tmp_path / "facets.db"
+    try:
+        with MinecraftEducationDB(path) as db:
+            db.initialize_schema()
+            db.insert_resources(make_resources(200))
+            index = facet_index(db)
+            # 쓰기 전에 센 결과는 캐시에 남아 쓰기 뒤에 바뀐 리소스만큼 고쳐짐
+            before = [facet_counts(db, filters) for filters in FILTERS]
+
+            db.insert_resources(make_resources(10, start=200))                 # 새 리소스
+            db.insert_resources(make_resources(10, start=0, subject='Art'))    # 과목 변경
+            db.connection.execute("DELETE FROM resources WHERE id = 'lesson-50'")
+            db.connection.execute("UPDATE resources SET is_active = 0 WHERE id IN ('lesson-60', 'lesson-61')")
+            db.connection.commit()
+
+            assert facet_index(db) is index
+            fresh = FacetIndex.from_db(db)
+            for filters in FILTERS:
+                assert facet_counts(db, filters) == fresh.counts(filters)
+                assert sorted(index.select(filters)) == sorted(fresh.select(filters))
+            assert [facet_counts(db, filters) for filters in FILTERS] != before
+            # 캐시 없이 다시 세도 같음
+            index._cache.clear()
+            for filters in FILTERS:
+                assert facet_counts(db, filters) == fresh.counts(filters)
+    finally:
+        get_manager(path).close()
+
+
+def expected_counts(resources, filters):
+    """리소스마다 값을 직접 비교한 기준값 (패싯 안에서는 OR, 패싯끼리는 AND, 값은 정확히 일치)"""
+    filters = facets.normalize_filters(filters)
+    matched = [r for r in resources
+               if all(set(values) & set(split_names(r.get(FACETS[facet]))) for facet, values in filters.items())]
+    result = {'total': len(matched), **{facet: {} for facet in FACETS}}
+    for r in matched:
+        for facet, field in FACETS.items():
+            for value in split_names(r.get(field)):
+                result[facet][value] = result[facet].get(value, 0) + 1
+    return result
+
+
+COMBINATIONS = (
+    None,
+    {},
+    {'subject': [], 'tag': ''},                     # 빈 필터는 없는 것과 같음
+    {'type': 'Lesson'},
+    {'subject': ['Math', 'Art']},                   # 같은 패싯 안에서는 OR
+    {'subject': ['Math', 'Art'], 'age': '8-10'},    # 패싯끼리는 AND
+    {'age': ['8-10', '11-13']},                     # 거의 전부
+    {'tag': 'redstone', 'type': 'World'},
+    {'subject': 'Mathematics'},                     # 없는 값 - 부분 문자열로 맞추지 않음
+)
+
+
+@pytest.mark.parametrize('path', ['sparse', 'complement', 'numpy', 'python'])
+def test_counts_match_per_resource_reference(monkeypatch, path):
+    resources = make_resources(300) + make_resources(30, start=300, subject='Art')
+    if path == 'sparse':
+        monkeypatch.setattr(facets, 'SPARSE_LIMIT', len(resources))
+    else:
+        # 0이면 빈/전체 결과만 리소스별로 세고 나머지는 비트셋
+        monkeypatch.setattr(facets, 'SPARSE_LIMIT', 10 if path == 'complement' else 0)
+        if path == 'python':
+            monkeypatch.setattr(facets, 'np', None)
+        elif facets.np is None:
+            pytest.skip("numpy 없음")
+    index = FacetIndex.from_resources(resources)
+
+    for filters in COMBINATIONS:
+        expected = expected_counts(resources, filters)
+        assert index.counts(filters) == expected, filters
+        assert len(index.select(filters)) == expected['total']
+        # 캐시에서 꺼내도 같음
+        assert index.counts(filters) == expected
+
+
+def test_counts_order_and_exact_values():
+    resources = make_resources(12) + [{'id': 'x', 'type': 'Lesson', 'subjects': 'Mathematics'}]
+    index = FacetIndex.from_resources(resources)
+    counts = index.counts({'subject': 'Math'})
+    # 대시보드 필터도 정확히 같은 값만 ('Math'가 'Mathematics'를 고르지 않음)
+    assert 'x' not in index.select({'subject': 'Math'})
+    assert index.select({'subject': 'Mathematics'}) == ['x']
+    assert list(counts['subject']) == ['Math', 'Science']
+    assert list(index.counts()['type'].items()) == [('Lesson', 7), ('World', 6)]
+
+
+def test_empty_and_unknown_filters():
+    index = FacetIndex.from_resources(make_resources(10))
+    assert index.positions({}) == list(range(10))
+    assert index.positions({'subject': ['Nope']}) == []
+    assert index.counts({'subject': 'Nope'}) == {'total': 0, **{facet: {} for facet in FACETS}}
+    with pytest.raises(ValueError):
+        index.counts({'grade': '8-10'})
@@ -0,0 +1,55 @@
+"""CrawlJournal - 추가 기록, 크래시 뒤 복구(replay), 결과 저장 뒤 삭제"""
+import copy
+import json
+
+from journal import CrawlJournal
+
+
+def make_resources():
+    return [{'id': f"lesson-{i}", 'title': f"Lesson {i}",
+             'url': f"https://education.minecraft.net/en-us/lessons/lesson-{i}"} for i in range(5)]
+
+
+def test_replay_applies_recorded_results(tmp_path):
+    journal = CrawlJournal(tmp_path / "crawl_journal.jsonl")
+    crawled = make_resources()
+    for i in (1, 3):
+        crawled[i].update({'thumbnail_url': f"https://img/{i}.png", '_crawl_status': 'done'})
+        journal.record(crawled[i])
+    crawled[3]['tags'] = 'redstone'
+    journal.record(crawled[3])      # 같은 리소스는 마지막 기록이 이김
+    journal.record({'id': 'removed', 'url': 'https://education.minecraft.net/en-us/lessons/removed'})
+    journal.close()
+
+    # 크래시로 잘린 마지막 줄
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'id': 'lesson-4', 'resource': {}})[:20])
+
+    resources = make_resources()
+    journaled = CrawlJournal(journal.path).replay(resources)
+    assert journaled == {'lesson-1', 'lesson-3'}
+    assert resources[1] == crawled[1]
+    assert resources[3] == crawled[3]
+    assert resources[3]['tags'] == 'redstone'
+    assert resources[4] == make_resources()[4]
+
+
+def test_discard_after_save(tmp_path):
+    journal = CrawlJournal(tmp_path / "crawl_journal.jsonl")
+    assert not journal.exists()
+    assert journal.replay(make_resources()) == set()
+
+    journal.record(make_resources()[0])
+    assert journal.exists()
+    # 결과 파일 저장에 성공하면 삭제 - 다음 실행은 복구할 것이 없음
+    journal.discard()
+    assert not journal.path.exists()
+    resources = make_resources()
+    before = copy.deepcopy(resources)
+    assert CrawlJournal(journal.path).replay(resources) == set()
+    assert resources == before
+
+    # 삭제 뒤에도 다시 기록 가능 (체크포인트 다음 구간)
+    journal.record(make_resources()[2])
+    assert CrawlJournal(journal.path).replay(make_resources()) == {'lesson-2'}
+    journal.discard()
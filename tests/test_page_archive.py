@@ -0,0 +1,44 @@
+"""PageArchive - 같은 내용은 한 번만 저장, URL·시각별 캡처 조회, 다시 열어도 그대로"""
+import pytest
+
+from page_archive import PageArchive, zstandard
+
+URL = "https://education.minecraft.net/en-us/lessons/redstone"
+CODECS = ['gzip'] + (['zstd'] if zstandard is not None else [])
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_put_get_and_dedup(tmp_path, codec):
+    v1 = "<html><body>첫 번째 " + "x" * 5000 + "</body></html>"
+    v2 = "<html><body>두 번째</body></html>"
+    with PageArchive(tmp_path / "archive", codec=codec) as archive:
+        digest = archive.put(URL, v1, fetched_at='2026-01-01T00:00:00')
+        assert archive.put(URL, v1, fetched_at='2026-01-02T00:00:00') == digest
+        archive.put(URL, v2, fetched_at='2026-01-03T00:00:00')
+        archive.put(URL + "-copy", v1, fetched_at='2026-01-03T00:00:00')
+
+        assert archive.get(URL) == v2
+        assert archive.get(URL, at='2026-01-02T12:00:00') == v1
+        assert archive.get(URL, at='2025-12-31T00:00:00') is None
+        assert archive.get("https://education.minecraft.net/missing") is None
+        assert archive.get_blob(digest) == v1
+
+        stats = archive.stats()
+        assert (stats['captures'], stats['blobs']) == (4, 2)
+        assert stats['packed_bytes'] < stats['raw_bytes']
+
+    # 다시 열어도 같은 내용 (팩 파일 오프셋 + 색인)
+    with PageArchive(tmp_path / "archive", codec=codec) as archive:
+        assert archive.get(URL) == v2
+        assert [(url, at) for url, at, _ in archive.latest_captures()] == [
+            (URL, '2026-01-03T00:00:00'), (URL + "-copy", '2026-01-03T00:00:00')]
+
+
+def test_mixed_codecs_in_one_pack(tmp_path):
+    with PageArchive(tmp_path / "archive", codec='gzip') as archive:
+        archive.put(URL, "<p>gzip</p>", fetched_at='2026-01-01T00:00:00')
+    codec = 'zstd' if zstandard is not None else 'gzip'
+    with PageArchive(tmp_path / "archive", codec=codec) as archive:
+        archive.put(URL, "<p>second</p>", fetched_at='2026-01-02T00:00:00')
+        assert archive.get(URL, at='2026-01-01T00:00:00') == "<p>gzip</p>"
+        assert archive.get(URL) == "<p>second</p>"
@@ -0,0 +1,56 @@
+"""AdaptiveRateController - 에러 하나에 감속 한 번, 전체 정지는 429/Retry-After일 때만"""
+import asyncio
+import time
+
+from rate_limit import AdaptiveRateController, RateLimiter, retry_after_seconds
+
+
+def make_controller(tmp_path, rps=4.0, concurrency=4):
+    limiter = RateLimiter(rps, concurrency)
+    return limiter, AdaptiveRateController(limiter, max_rps=rps, max_concurrency=concurrency,
+                                           state_path=tmp_path / "rate_state.json")
+
+
+def test_error_burst_costs_one_decrease_without_pause(tmp_path):
+    limiter, controller = make_controller(tmp_path)
+
+    async def burst():
+        for _ in range(4):
+            await controller.on_error("HTTP 503")
+
+    asyncio.run(burst())
+    assert limiter.rps == 2.0
+    assert limiter.max_in_flight == 4
+    assert limiter._paused_until <= time.monotonic()
+    assert controller.events == {'throttle': 4}
+
+
+def test_decrease_again_after_round_trip(tmp_path):
+    limiter, controller = make_controller(tmp_path)
+
+    async def run():
+        await controller.on_error("RemoteProtocolError: http2 stream reset")
+        controller._decreased_until = 0.0    # 응답 한 바퀴가 지난 뒤
+        await controller.on_error("RemoteProtocolError: http2 stream reset")
+
+    asyncio.run(run())
+    assert limiter.rps == 1.0
+
+
+def test_explicit_throttle_pauses_all_workers(tmp_path):
+    limiter, controller = make_controller(tmp_path)
+    asyncio.run(controller.on_error("HTTP 429"))
+    assert limiter._paused_until >= time.monotonic() + controller.THROTTLE_PAUSE - 1
+
+    limiter, controller = make_controller(tmp_path)
+    asyncio.run(controller.on_error("HTTP 503 (Retry-After: 7)"))
+    remaining = limiter._paused_until - time.monotonic()
+    assert 6 < remaining <= 7
+
+
+def test_retry_after_formats():
+    assert retry_after_seconds("HTTP 503 (Retry-After: 120)") == 120
+    assert retry_after_seconds("HTTP 503 (Retry-After: Wed, 21 Oct 2015 07:28:00 GMT)") == 0
+    assert retry_after_seconds("HTTP 503 (Retry-After: soon)") is None
+    assert retry_after_seconds("HTTP 503") is None
+    assert AdaptiveRateController.MAX_PAUSE < retry_after_seconds("Retry-After: 86400")
@@ -0,0 +1,54 @@
+"""replay_bench.synthesize_page - 합성 페이지를 extractor로 다시 읽으면 원래 필드 값이 나오는지"""
+from crawl import load_resources
+from database import split_names
+from extractor import extract_from_html
+from replay_bench import synthesize_page
+
+# 리소스 필드 → extract_from_html 결과 키
+FIELDS = {
+    'tags': 'tags',
+    'subjects': 'subjects_list',
+    'ages': 'ages',
+    'languages': 'languages',
+    'skills': 'skills',
+}
+
+
+def test_synthesized_page_round_trips_through_extractor():
+    resource = {
+        'id': 'lesson-1',
+        'title': 'Redstone Basics',
+        'full_description': 'Build a circuit.',
+        'thumbnail_url': 'https://education.minecraft.net/img/redstone.png',
+        'tags': 'Template, Creative',
+        'subjects': 'Computer Science,Arts & Design',
+        'ages': '8-10, 11-13, English',
+        'languages': 'English',
+        'skills': 'Collaboration, Critical Thinking',
+        'estimated_time': '60 minutes',
+        'submitted_by': 'Minecraft Education',
+        'updated': '2월 2, 2026',
+    }
+    extracted = extract_from_html(synthesize_page(resource))
+
+    for field, key in FIELDS.items():
+        assert extracted[key] == split_names(resource[field])
+    assert extracted['full_description'] == resource['full_description']
+    assert extracted['thumbnail_url'] == resource['thumbnail_url']
+    assert extracted['estimated_time'] == resource['estimated_time']
+    assert extracted['submitted_by'] == resource['submitted_by']
+    assert extracted['updated'] == resource['updated']
+
+
+def test_archived_resources_round_trip():
+    resources = [r for r in load_resources() if r.get('ages') or r.get('tags') or r.get('skills')][:100]
+    for resource in resources:
+        extracted = extract_from_html(synthesize_page(resource))
+        for field, key in FIELDS.items():
+            assert extracted[key] == split_names(resource.get(field)), (resource['id'], field)
+
+
+def test_empty_fields_synthesize_no_links():
+    extracted = extract_from_html(synthesize_page({'id': 'world-1', 'title': 'Empty', 'subjects': '', 'tags': None}))
+    for key in FIELDS.values():
+        assert extracted[key] == []
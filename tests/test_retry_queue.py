@@ -0,0 +1,84 @@
+"""RetryQueue - 종류별 지터 백오프, 보류, 기존 실패 가져오기"""
+import json
+import random
+from datetime import datetime, timedelta
+
+from retry_queue import RETRY_POLICY, RetryQueue, classify_failure
+
+NOW = datetime(2026, 1, 5, 12, 0, 0)
+
+
+def make_queue(tmp_path, seed=0):
+    return RetryQueue(tmp_path / "retry_queue.json", rng=random.Random(seed))
+
+
+def resource(i, **fields):
+    return {'id': f"lesson-{i}", 'title': f"Lesson {i}",
+            'url': f"https://education.minecraft.net/en-us/lessons/lesson-{i}", **fields}
+
+
+def test_classify_failure():
+    assert classify_failure("HTTP 404") == 'gone'
+    assert classify_failure("HTTP 503 (Retry-After: 30)") == 'throttle'
+    assert classify_failure("net::ERR_HTTP2_PROTOCOL_ERROR") == 'http2'
+    assert classify_failure("ConnectError: connection refused") == 'network'
+    assert classify_failure("Extraction empty") == 'empty'
+    assert classify_failure("") == 'other'
+
+
+def test_backoff_doubles_within_equal_jitter_and_cap(tmp_path):
+    queue = make_queue(tmp_path)
+    base, cap, _ = RETRY_POLICY['http2']
+    for attempts in range(1, 10):
+        delay = min(cap, base * 2 ** (attempts - 1))
+        for _ in range(20):
+            assert delay / 2 <= queue.backoff('http2', attempts) <= delay
+
+
+def test_record_failure_schedules_and_parks(tmp_path):
+    queue = make_queue(tmp_path)
+    r = resource(1)
+    max_attempts = RETRY_POLICY['gone'][2]
+    for attempt in range(1, max_attempts + 1):
+        entry = queue.record_failure(r, r['url'], "HTTP 404", now=NOW)
+        assert entry['attempts'] == attempt
+    assert entry['parked']
+    assert not queue.is_due(r['id'], NOW + timedelta(days=30))
+
+    # 에러 종류가 바뀌면 그 종류의 정책으로 다시 셈
+    entry = queue.record_failure(r, r['url'], "HTTP 503", now=NOW)
+    assert (entry['attempts'], entry['kind'], entry['parked']) == (1, 'throttle', False)
+    assert not queue.is_due(r['id'], NOW)
+    assert queue.is_due(r['id'], NOW + timedelta(seconds=RETRY_POLICY['throttle'][0]))
+
+    assert queue.resolve(r['id'])
+    assert r['id'] not in queue
+
+
+def test_imported_failures_spread_over_first_backoff_window(tmp_path):
+    queue = make_queue(tmp_path)
+    resources = [resource(i, _crawl_failed=True, _crawl_error="net::ERR_HTTP2_PROTOCOL_ERROR")
+                 for i in range(200)]
+    resources.append(resource(999, _crawl_status='done'))
+    legacy = tmp_path / "failed_resources.json"
+    legacy.write_text(json.dumps([{'url': resources[-1]['url']}, {'url': resources[0]['url']}]))
+
+    counts = queue.import_failures(resources, crawl_failed_path=tmp_path / "missing.json",
+                                   legacy_path=legacy, now=NOW)
+    # 이미 큐에 있거나 성공한 리소스는 제외
+    assert counts == {'resources': 200, 'crawl_failed': 0, 'legacy': 0}
+
+    base = RETRY_POLICY['http2'][0]
+    due = sorted(datetime.fromisoformat(e['next_attempt']) for e in queue.entries.values())
+    assert NOW + timedelta(seconds=base / 2) <= due[0] and due[-1] <= NOW + timedelta(seconds=base)
+    # 한 시각에 몰리지 않음
+    assert len(set(due)) == len(due)
+    assert not queue.due_ids(NOW)
+    assert len(queue.due_ids(NOW + timedelta(seconds=base))) == 200
+
+
+def test_queue_persists(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.record_failure(resource(1), resource(1)['url'], "HTTP 429", now=NOW)
+    queue.save()
+    assert RetryQueue(tmp_path / "retry_queue.json").entries == queue.entries
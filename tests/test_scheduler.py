@@ -0,0 +1,68 @@
+"""CrawlScheduler - 점수 순서, 모드별 대상, 실패 이력"""
+from datetime import datetime, timedelta
+
+from scheduler import CrawlScheduler, STALE_DAYS
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+COMPLETE = {'thumbnail_url': 'https://img/x.png', 'full_description': 'd', 'subjects': 'Math',
+            'submitted_by': 'Minecraft Education', 'updated': '2026', 'ages': '8-10', 'languages': 'English',
+            'tags': 'redstone'}
+
+
+def crawled(rid, days_ago, rtype='Lesson', **fields):
+    return {'id': rid, 'type': rtype, **COMPLETE, '_crawl_status': 'done',
+            '_crawl_at': (NOW - timedelta(days=days_ago)).isoformat(), **fields}
+
+
+def make_scheduler(tmp_path, resources):
+    return CrawlScheduler(resources, state_path=tmp_path / "scheduler_state.json", now=NOW)
+
+
+def test_plan_orders_by_value(tmp_path):
+    resources = [
+        crawled('fresh', 1),                                      # 최근 크롤링 - 기본 모드 대상 아님
+        crawled('stale', STALE_DAYS + 10),
+        crawled('stale-world', STALE_DAYS + 10, rtype='World'),   # 같은 조건이면 World 가중치가 큼
+        crawled('no-thumb', 1, thumbnail_url=None),
+        crawled('lastmod', 2, _lastmod=(NOW - timedelta(days=1)).isoformat()),
+        {'id': 'never', 'type': 'Lesson'},
+        crawled('removed', 400, is_active=0),                     # 사이트에서 사라짐 - 제외
+    ]
+    scheduler = make_scheduler(tmp_path, resources)
+    order = [resources[i]['id'] for i in scheduler.plan()]
+    assert order == ['never', 'lastmod', 'stale-world', 'stale', 'no-thumb']
+
+    assert [resources[i]['id'] for i in scheduler.plan('full')][-1] == 'fresh'
+    assert 'removed' not in {resources[i]['id'] for i in scheduler.plan('full')}
+
+
+def test_failures_lower_priority_until_success(tmp_path):
+    resources = [crawled('a', 100), crawled('b', 90)]
+    scheduler = make_scheduler(tmp_path, resources)
+    assert scheduler.plan() == [0, 1]
+    scheduler.record(resources[0], ok=False)
+    assert scheduler.plan() == [1, 0]
+    scheduler.save()
+
+    # 이력은 다음 실행으로 이어짐
+    scheduler = make_scheduler(tmp_path, resources)
+    assert scheduler.failures(resources[0]) == 1
+    scheduler.record(resources[0], ok=True)
+    assert scheduler.plan() == [0, 1]
+
+
+def test_workers_take_tasks_in_score_order(tmp_path):
+    resources = [crawled(f"r{i}", 40 + i) for i in range(10)]
+    scheduler = make_scheduler(tmp_path, resources)
+    scheduler.start(range(10))
+    taken = []
+    while (i := scheduler.next()) is not None:
+        taken.append(i)
+    assert taken == list(range(9, -1, -1))
+    assert scheduler.remaining() == 0
+
+
+def test_retry_mode_takes_failed_resources(tmp_path):
+    resources = [crawled('ok', 100), crawled('failed', 1, _crawl_failed=True)]
+    scheduler = make_scheduler(tmp_path, resources)
+    assert scheduler.plan('retry') == [1]
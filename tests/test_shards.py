@@ -0,0 +1,57 @@
+"""shards - id 해시로 겹치지 않게 나누고, 샤드 결과를 결정적으로 병합"""
+import pytest
+
+import shards
+
+
+@pytest.fixture(autouse=True)
+def shard_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(shards, 'SHARD_DIR', tmp_path / "shards")
+
+
+def make_resources(count):
+    return [{'id': f"lesson-{i}", 'title': f"Lesson {i}"} for i in range(count)]
+
+
+def test_parse_shard_spec():
+    assert shards.parse_shard_spec('2/4') == (2, 4)
+    for spec in ('0/4', '5/4', '1/0', '1-4', 'a/b'):
+        with pytest.raises(ValueError):
+            shards.parse_shard_spec(spec)
+
+
+def test_assignment_is_stable_and_covers_every_resource():
+    resources = make_resources(400)
+    for count in (1, 3, 4):
+        parts = [[r['id'] for r in resources if shards.in_shard(r, i, count)] for i in range(1, count + 1)]
+        assert sorted(sum(parts, [])) == sorted(r['id'] for r in resources)
+        assert all(parts), "빈 샤드"
+    # 해시 기준이라 실행/머신과 무관하게 같은 번호
+    assert shards.shard_of('lesson-1', 4) == shards.shard_of('lesson-1', 4)
+    assert shards.shard_of('lesson-1', 1) == 1
+
+
+def test_merge_takes_newer_results_in_base_order():
+    base = make_resources(40)
+    count = 3
+    crawled = [dict(r, _crawl_at='2026-01-02T00:00:00', thumbnail_url='new') for r in base]
+    crawled[0]['_crawl_at'] = ''        # 기준보다 오래됨 - 기준 유지
+    base[0]['_crawl_at'] = '2026-01-01T00:00:00'
+    extra = {'id': 'lesson-new', 'title': 'New', '_crawl_at': '2026-01-02T00:00:00'}
+    for index in range(1, count + 1):
+        shards.save_shard(crawled + [extra], index, count)
+
+    merged, report = shards.merge_shards(base, count)
+    assert [r['id'] for r in merged] == [r['id'] for r in base] + ['lesson-new']
+    assert merged[0] is base[0]
+    assert all(r['thumbnail_url'] == 'new' for r in merged[1:len(base)])
+    assert (report['updated'], report['added']) == (len(base) - 1, 1)
+    assert report['missing_shards'] == report['uncovered'] == report['misplaced'] == []
+
+
+def test_merge_reports_missing_shards():
+    base = make_resources(40)
+    shards.save_shard(base, 1, 2)
+    merged, report = shards.merge_shards(base, 2)
+    assert report['missing_shards'] == [2]
+    assert merged == base
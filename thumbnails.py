@@ -0,0 +1,180 @@
+"""
+썸네일 미러 - 원본 이미지를 한 번만 받아 작은 WebP/JPEG 변형으로 저장
+- 동시에 여러 개 다운로드 (httpx 연결 풀 하나 공유)
+- 변형 파일 이름은 원본 콘텐츠 해시 기준 (같은 이미지는 URL이 달라도 한 번만 변환)
+- 다시 실행하면 ETag/Last-Modified 조건부 요청으로 바뀐 이미지만 받음
+- 결과는 static/thumbnails/에 저장되어 대시보드가 원본 대신 로컬 변형을 사용
+  (.streamlit/config.toml의 enableStaticServing → app/static/thumbnails/...)
+usage:
+    python thumbnails.py                 # 모든 리소스 썸네일 미러링
+    python thumbnails.py --force         # 캐시 무시하고 모두 다시 받기
+    python thumbnails.py --concurrency 8
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import config
+from http_fetcher import HttpFetcher
+from validator_cache import ValidatorCache
+
+THUMBNAIL_DIR = Path(__file__).parent / "static" / "thumbnails"
+THUMBNAIL_INDEX_PATH = config.DATA_DIR / "thumbnails.json"
+STATIC_URL_PREFIX = "app/static/thumbnails"
+
+# 카드 폭 기준 1x/2x
+VARIANT_WIDTHS = (320, 640)
+VARIANT_FORMATS = {'webp': ('WEBP', 78), 'jpg': ('JPEG', 82)}
+
+
+def variant_name(digest, width, ext):
+    return f"{digest[:20]}-{width}.{ext}"
+
+
+def make_variants(raw, digest, out_dir=THUMBNAIL_DIR):
+    """원본 바이트 → 폭별 WebP/JPEG 변형 파일 (이미 있으면 건너뜀)
+
+    Returns:
+        {'webp': {width: name}, 'jpg': {width: name}}
+    """
+    from PIL import Image
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    variants = {ext: {} for ext in VARIANT_FORMATS}
+    image = None
+    for width in VARIANT_WIDTHS:
+        for ext, (fmt, quality) in VARIANT_FORMATS.items():
+            name = variant_name(digest, width, ext)
+            variants[ext][str(width)] = name
+            if (out_dir / name).exists():
+                continue
+            if image is None:
+                image = Image.open(io.BytesIO(raw))
+                image.load()
+                # 투명 배경은 흰색으로 (JPEG는 알파 채널이 없음)
+                if image.mode in ('RGBA', 'LA', 'P'):
+                    rgba = image.convert('RGBA')
+                    image = Image.new('RGB', rgba.size, (255, 255, 255))
+                    image.paste(rgba, mask=rgba.split()[-1])
+                elif image.mode != 'RGB':
+                    image = image.convert('RGB')
+            resized = image
+            if image.width > width:
+                resized = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            tmp = out_dir / (name + '.tmp')
+            resized.save(tmp, fmt, quality=quality, optimize=True)
+            tmp.replace(out_dir / name)
+    return variants
+
+
+def has_variants(entry, out_dir=THUMBNAIL_DIR):
+    names = [n for group in (entry or {}).get('variants', {}).values() for n in group.values()]
+    return bool(names) and all((out_dir / n).exists() for n in names)
+
+
+async def mirror_one(fetcher, url, index, stats, force=False):
+    """썸네일 하나 미러링 (304이거나 내용이 같으면 변환 건너뜀)"""
+    entry = index.entries.get(url)
+    headers = None if force or not has_variants(entry) else index.conditional_headers(url)
+    status, raw, resp_headers, error = await fetcher.fetch_bytes(url, headers)
+
+    if status == 304:
+        index.update(url, resp_headers)
+        stats['unchanged'] += 1
+        return
+    if raw is None:
+        stats['failed'] += 1
+        index.entries.setdefault(url, {})['error'] = error
+        return
+
+    digest = hashlib.sha256(raw).hexdigest()
+    stats['bytes_in'] += len(raw)
+    if not force and index.is_unchanged(url, digest) and has_variants(entry):
+        index.update(url, resp_headers, digest)
+        stats['unchanged'] += 1
+        return
+
+    try:
+        # 이미지 변환은 CPU 작업이라 스레드에서
+        variants = await asyncio.to_thread(make_variants, raw, digest)
+    except Exception as e:
+        stats['failed'] += 1
+        index.entries.setdefault(url, {})['error'] = f"{type(e).__name__}: {e}"[:120]
+        return
+
+    index.update(url, resp_headers, digest)
+    entry = index.entries[url]
+    entry['variants'] = variants
+    entry['original_bytes'] = len(raw)
+    entry.pop('error', None)
+    stats['converted'] += 1
+
+
+async def mirror_all(urls, concurrency=8, force=False, index=None):
+    """썸네일 URL 목록 미러링
+
+    Returns:
+        {'converted', 'unchanged', 'failed', 'bytes_in'}
+    """
+    index = index or ValidatorCache(THUMBNAIL_INDEX_PATH)
+    stats = {'converted': 0, 'unchanged': 0, 'failed': 0, 'bytes_in': 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with HttpFetcher(max_connections=concurrency) as fetcher:
+        async def run(url):
+            async with semaphore:
+                await mirror_one(fetcher, url, index, stats, force)
+
+        await asyncio.gather(*(run(url) for url in urls))
+    index.save()
+    return stats
+
+
+def local_thumbnail(entry, width=VARIANT_WIDTHS[0], prefix=STATIC_URL_PREFIX):
+    """인덱스 항목 → {'webp': url, 'jpg': url} (변형이 없으면 None)"""
+    if not entry or not entry.get('variants'):
+        return None
+    return {ext: f"{prefix}/{names[str(width)]}"
+            for ext, names in entry['variants'].items() if str(width) in names}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🖼️ 썸네일 로컬 미러 (WebP/JPEG 변형)")
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 다운로드 수 (기본: 8)')
+    parser.add_argument('--force', action='store_true', help='조건부 요청 없이 모두 다시 받기')
+    args = parser.parse_args()
+
+    from crawl import load_resources, log
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        log("❌ Pillow가 필요합니다: pip install Pillow")
+        sys.exit(1)
+
+    resources = load_resources()
+    if resources is None:
+        log("❌ resources_enhanced.json을 불러올 수 없습니다.")
+        sys.exit(1)
+
+    urls = sorted({r['thumbnail_url'] for r in resources
+                   if r.get('thumbnail_url') and r.get('is_active', 1) != 0})
+    log(f"🖼️  썸네일 {len(urls)}개 미러링 (동시 {args.concurrency}개)")
+
+    start = time.perf_counter()
+    stats = asyncio.run(mirror_all(urls, args.concurrency, args.force))
+    elapsed = time.perf_counter() - start
+
+    out_bytes = sum(f.stat().st_size for f in THUMBNAIL_DIR.glob(f"*-{VARIANT_WIDTHS[0]}.webp"))
+    log(f"   변환 {stats['converted']}개, 변경 없음 {stats['unchanged']}개, 실패 {stats['failed']}개 "
+        f"({elapsed:.1f}초)")
+    log(f"   받은 원본 {stats['bytes_in'] / 1048576:.1f}MB, {VARIANT_WIDTHS[0]}px WebP 합계 {out_bytes / 1048576:.1f}MB")
+    log(f"   💾 {THUMBNAIL_DIR}, {THUMBNAIL_INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """
 데이터 자동 업데이트 스크립트
-- 새로운 리소스 감지 (HTML 재파싱)
+- 새로운 리소스 감지 (사이트맵/목록 페이지 증분 탐색)
 - 누락된 썸네일/태그 보완 (배치 크롤링)
 """
 import json
@@ -8,7 +8,11 @@ import time
 import sys
 import io
 import os
+import asyncio
 from playwright.sync_api import sync_playwright
+from crawl import save_resources
+from discovery import discover, apply_discovery
+from readiness import wait_until_ready
 
 # Windows 콘솔 인코딩 설정
 if sys.platform == 'win32':
@@ -19,19 +23,23 @@ if sys.platform == 'win32':
 BATCH_SIZE = int(os.getenv('BATCH_SIZE', '50'))  # 기본 50개
 
 
-def fetch_latest_resources():
-    """최신 리소스 목록 가져오기 (HTML 재파싱)"""
-    print("📥 Fetching latest resource list from website...")
+def fetch_latest_resources(enhanced):
+    """최신 리소스 목록 반영 (사이트맵/목록 페이지 증분 탐색)
 
-    # 기존 HTML 파일이 있으면 사용, 없으면 다운로드 필요
-    # 여기서는 간단히 기존 data/resources.json 사용
-    # TODO: 실제로는 HTML을 다시 다운로드하고 파싱해야 함
+    새 리소스는 추가하고, 사라진 리소스는 is_active = 0, 옮겨진 리소스는 URL을 갱신합니다.
+    """
+    print("📥 Discovering resources from sitemap / listing pages...")
 
-    with open('data/resources.json', 'r', encoding='utf-8') as f:
-        resources = json.load(f)
+    changes = asyncio.run(discover(enhanced))
+    summary = apply_discovery(enhanced, changes)
 
-    print(f"   Found {len(resources)} resources in base data")
-    return resources
+    print(f"   Source: {changes['source']}")
+    print(f"   New: {summary['new']}, removed: {summary['removed']}, "
+          f"moved: {summary['moved']}, restored: {summary['restored']}")
+    if changes['held_removals']:
+        print(f"   ⚠️  Removal held: {len(changes['held_removals'])} resources missing from the sitemap "
+              f"(looks truncated - run discovery.py --apply --allow-mass-removal after checking)")
+    return summary
 
 
 def crawl_resource(page, url, retries=3):
@@ -39,7 +47,8 @@ def crawl_resource(page, url, retries=3):
     for attempt in range(retries):
         try:
             page.goto(url, timeout=30000, wait_until='domcontentloaded')
-            time.sleep(2)
+            ready_sec, ready = wait_until_ready(page)
+            print(f"   ⏱️  Ready in {ready_sec:.2f}s{'' if ready else ' (timeout)'}", flush=True)
             break
         except Exception as e:
             if attempt < retries - 1:
@@ -120,21 +129,20 @@ def main():
             enhanced = json.load(f)
         print(f"⚠️  No enhanced data found, starting from base: {len(enhanced)} resources")
 
-    # 최신 리소스 목록 가져오기
-    latest_resources = fetch_latest_resources()
+    # 최신 리소스 목록 반영 (새 리소스 / 삭제 / 이동)
+    summary = fetch_latest_resources(enhanced)
 
-    # 새로운 리소스 감지
-    existing_urls = {r['url'] for r in enhanced}
-    new_resources = [r for r in latest_resources if r['url'] not in existing_urls]
-
-    if new_resources:
-        print(f"🆕 Found {len(new_resources)} new resources!")
-        enhanced.extend(new_resources)
+    if summary['new']:
+        print(f"🆕 Found {summary['new']} new resources!")
     else:
         print("✓ No new resources found")
 
+    if any(summary.values()):
+        save_resources(enhanced)
+
     # 누락된 데이터가 있는 리소스 찾기
-    missing_data = [(i, r) for i, r in enumerate(enhanced) if not r.get('thumbnail_url')]
+    missing_data = [(i, r) for i, r in enumerate(enhanced)
+                    if not r.get('thumbnail_url') and r.get('is_active', 1) != 0]
 
     print()
     print(f"📊 Current status:")
@@ -188,8 +196,7 @@ def main():
 
                 # 10개마다 중간 저장
                 if success % 10 == 0:
-                    with open('data/resources_enhanced.json', 'w', encoding='utf-8') as f:
-                        json.dump(enhanced, f, ensure_ascii=False, indent=2)
+                    save_resources(enhanced)
                     print(f"  💾 Progress saved: {success}/{len(batch)}")
             else:
                 failed += 1
@@ -210,8 +217,7 @@ def main():
         browser.close()
 
     # 최종 저장
-    with open('data/resources_enhanced.json', 'w', encoding='utf-8') as f:
-        json.dump(enhanced, f, ensure_ascii=False, indent=2)
+    save_resources(enhanced)
 
     # 결과 요약
     print()
@@ -0,0 +1,70 @@
+"""
+조건부 재검증 캐시 - URL별 ETag / Last-Modified / 콘텐츠 해시 저장
+다음 크롤링 때 조건부 요청(If-None-Match, If-Modified-Since)을 보내
+변경되지 않은 페이지는 추출/적용을 건너뜁니다.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import config
+
+VALIDATORS_PATH = config.DATA_DIR / "validators.json"
+
+
+def content_hash(data):
+    """추출 결과의 해시 (마크업의 nonce 등 무관한 변경에 영향받지 않음)"""
+    raw = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ValidatorCache:
+    """URL → {etag, last_modified, content_hash, fetched_at} 영속 저장소"""
+
+    def __init__(self, path=VALIDATORS_PATH):
+        self.path = path
+        self.entries = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding='utf-8') or '{}')
+            except json.JSONDecodeError:
+                self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def conditional_headers(self, url):
+        """조건부 요청 헤더"""
+        entry = self.entries.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url, digest):
+        """이전과 같은 콘텐츠인지"""
+        entry = self.entries.get(url)
+        return bool(entry) and entry.get('content_hash') == digest
+
+    def update(self, url, headers=None, digest=None):
+        """검증자 갱신 (헤더가 없으면 기존 값 유지)"""
+        entry = self.entries.setdefault(url, {})
+        if headers:
+            if headers.get('etag'):
+                entry['etag'] = headers['etag']
+            if headers.get('last-modified'):
+                entry['last_modified'] = headers['last-modified']
+        if digest:
+            entry['content_hash'] = digest
+        entry['fetched_at'] = datetime.now().isoformat()
+
+    def save(self):
+        """원자적 저장 (임시 파일 → rename)"""
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)